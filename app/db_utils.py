@@ -129,6 +129,7 @@ def save_agent(agent):
         'allow_delegation': agent.allow_delegation,
         'verbose': agent.verbose,
         'cache': agent.cache,
+        'prompt_caching': agent.prompt_caching,
         'llm_provider_model': agent.llm_provider_model,
         'temperature': agent.temperature,
         'max_iter': agent.max_iter,
@@ -191,6 +192,7 @@ def save_crew(crew):
         'task_ids': [task.id for task in crew.tasks],
         'memory': crew.memory,
         'cache': crew.cache,
+        'response_cache': crew.response_cache,
         'planning': crew.planning,
         'planning_llm': crew.planning_llm,
         'max_rpm': crew.max_rpm,
@@ -217,6 +219,7 @@ def load_crews():
             created_at=data['created_at'], 
             memory=data.get('memory'),
             cache=data.get('cache'),
+            response_cache=data.get('response_cache'),
             planning=data.get('planning'),
             planning_llm=data.get('planning_llm'),
             max_rpm=data.get('max_rpm'), 
@@ -307,7 +310,8 @@ def save_result(result):
         'crew_name': result.crew_name,
         'inputs': result.inputs,
         'result': result.result,
-        'created_at': result.created_at
+        'created_at': result.created_at,
+        'usage': result.usage
     }
     save_entity('result', result.id, data)
 
@@ -324,7 +328,8 @@ def load_results():
             crew_name=data['crew_name'],
             inputs=data['inputs'],
             result=data['result'],
-            created_at=data['created_at']
+            created_at=data['created_at'],
+            usage=data.get('usage')
         )
         results.append(result)
     return sorted(results, key=lambda x: x.created_at, reverse=True)
@@ -0,0 +1,665 @@
+"""
+Materialization cache for knowledge sources.
+
+Parsing/chunking a knowledge source and embedding its chunks is the slow part of
+building an agent. Chunks are cached on disk (JSON Lines, written as they are
+produced) keyed by the source content hash and the chunking parameters, embeddings are cached in a local Chroma store keyed by the
+embedder and the chunk hash, so unchanged sources are reused across kickoffs and
+across processes.
+
+Every source also keeps a manifest (file mtime/size/hash, chunk hashes and the chunks
+indexed into each agent collection), so replacing or re-saving a source only embeds
+the added or changed chunks and removes the stale vectors.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from crewai.knowledge.source.base_knowledge_source import BaseKnowledgeSource
+from pydantic import Field
+
+import knowledge_chunker
+
+KNOWLEDGE_CACHE_DIR = os.getenv('KNOWLEDGE_CACHE_DIR', 'knowledge_cache')
+EMBED_BATCH_SIZE = 64
+# Rough average for the embedding tokenizers, good enough to spot expensive sources
+CHARS_PER_TOKEN = 4
+
+_lock = threading.Lock()
+_chunk_ids_memo = {}
+_vector_client = None
+_stats_memo = {}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id(chunk):
+    # Same id crewAI assigns to a document without metadata, so chunks saved by
+    # either path deduplicate against each other in the agent collection.
+    return hashlib.sha256(chunk.encode()).hexdigest()
+
+
+def _manifest_path(source_id):
+    return Path(KNOWLEDGE_CACHE_DIR, "manifests", f"{source_id}.json")
+
+
+def load_manifest(source_id):
+    path = _manifest_path(source_id)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading knowledge manifest {path}: {str(e)}")
+        return {}
+
+
+@contextmanager
+def _replaced_atomically(path):
+    """Write to a uniquely named temporary file next to path and move it over path at the end.
+
+    Ingest worker processes and kickoffs can write the same file at once, a shared
+    temporary name would let one of them move the other's half written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent, prefix=path.name + '.', suffix='.tmp', delete=False)
+    try:
+        with f:
+            yield f
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.unlink(f.name)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def _manifest_locked(source_id):
+    """Hold the manifest of source_id for a read-modify-write.
+
+    The ingest workers run in other processes, a threading lock alone would let their
+    stats and chunk ids overwrite the collections indexed by the Streamlit process.
+    """
+    from filelock import FileLock
+
+    path = _manifest_path(source_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(str(path.with_suffix('.lock'))):
+        yield
+
+
+def save_manifest(source_id, manifest):
+    with _replaced_atomically(_manifest_path(source_id)) as f:
+        json.dump(manifest, f)
+
+
+def _file_info(path, manifest):
+    """Stat the file and reuse the manifest hash when mtime and size are unchanged."""
+    stat = path.stat()
+    previous = manifest.get('file') or {}
+    if previous.get('path') == str(path) and previous.get('mtime') == stat.st_mtime and previous.get('size') == stat.st_size:
+        return previous
+    return {'path': str(path), 'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': file_sha256(path)}
+
+
+def content_fingerprint(knowledge_source, manifest=None):
+    """Hash of the raw source content (text, local file or docling location)."""
+    if knowledge_source.source_type == "string":
+        return hashlib.sha256(knowledge_source.content.encode()).hexdigest()
+    path = Path("knowledge", knowledge_source.source_path)
+    if path.is_file():
+        return _file_info(path, manifest or {})['sha256']
+    # docling URLs can't be hashed without downloading them, key on the location
+    return hashlib.sha256(knowledge_source.source_path.encode()).hexdigest()
+
+
+def source_cache_key(knowledge_source, manifest=None):
+    key_data = {
+        'source_type': knowledge_source.source_type,
+        'content': content_fingerprint(knowledge_source, manifest),
+        'chunk_size': knowledge_source.chunk_size,
+        'chunk_overlap': knowledge_source.chunk_overlap,
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+
+def _chunks_path(key):
+    return Path(KNOWLEDGE_CACHE_DIR, "chunks", f"{key}.jsonl")
+
+
+def load_chunks(key):
+    path = _chunks_path(key)
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def iter_chunk_batches(key, batch_size=EMBED_BATCH_SIZE):
+    """Read the cached chunks back as (ids, chunks) batches without duplicates."""
+    seen = set()
+    ids = []
+    chunks = []
+    with open(_chunks_path(key), 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            chunk = json.loads(line)
+            cid = chunk_id(chunk)
+            if cid in seen:
+                continue
+            seen.add(cid)
+            ids.append(cid)
+            chunks.append(chunk)
+            if len(ids) >= batch_size:
+                yield ids, chunks
+                ids = []
+                chunks = []
+    if ids:
+        yield ids, chunks
+
+
+def save_chunks(key, chunks):
+    """Write the chunks as they are produced and return their ids."""
+    ids = []
+    with _replaced_atomically(_chunks_path(key)) as f:
+        for chunk in chunks:
+            f.write(json.dumps(chunk) + "\n")
+            ids.append(chunk_id(chunk))
+    return ids
+
+
+def find_knowledge_file(file_path):
+    """Return the path relative to the knowledge folder if the file exists there."""
+    if file_path and Path("knowledge", file_path).exists():
+        return file_path
+    return None
+
+
+class SourceSpec:
+    """Plain, picklable copy of the fields needed to build a knowledge source."""
+    def __init__(self, id, source_type, source_path, content, metadata, chunk_size, chunk_overlap):
+        self.id = id
+        self.source_type = source_type
+        self.source_path = source_path
+        self.content = content
+        self.metadata = metadata
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    @classmethod
+    def from_source(cls, knowledge_source):
+        return cls(
+            id=knowledge_source.id,
+            source_type=knowledge_source.source_type,
+            source_path=knowledge_source.source_path,
+            content=knowledge_source.content,
+            metadata=dict(knowledge_source.metadata),
+            chunk_size=knowledge_source.chunk_size,
+            chunk_overlap=knowledge_source.chunk_overlap,
+        )
+
+
+def build_crewai_source(source):
+    """Create the crewAI knowledge source matching the source type."""
+    # Import knowledge source classes based on type
+    if source.source_type == "string":
+        from crewai.knowledge.source.string_knowledge_source import StringKnowledgeSource
+        return StringKnowledgeSource(
+            content=source.content,
+            metadata=source.metadata,
+            chunk_size=source.chunk_size,
+            chunk_overlap=source.chunk_overlap
+        )
+    elif source.source_type == "docling":
+        from crewai.knowledge.source.crew_docling_source import CrewDoclingSource
+        return CrewDoclingSource(
+            file_paths=[source.source_path],
+            metadata=source.metadata,
+            chunk_size=source.chunk_size,
+            chunk_overlap=source.chunk_overlap
+        )
+    else:
+        # For file-based sources, find the actual file path
+        actual_path = find_knowledge_file(source.source_path)
+        if not actual_path:
+            raise FileNotFoundError(f"File not found: {source.source_path}")
+            
+        # Import the appropriate class based on source type
+        if source.source_type == "text_file":
+            from crewai.knowledge.source.text_file_knowledge_source import TextFileKnowledgeSource
+            return TextFileKnowledgeSource(
+                file_paths=[actual_path],
+                metadata=source.metadata,
+                chunk_size=source.chunk_size,
+                chunk_overlap=source.chunk_overlap
+            )
+        elif source.source_type == "pdf":
+            from crewai.knowledge.source.pdf_knowledge_source import PDFKnowledgeSource               
+            return PDFKnowledgeSource(
+                file_paths=[actual_path],
+                metadata=source.metadata,
+                chunk_size=source.chunk_size,
+                chunk_overlap=source.chunk_overlap
+            )
+        elif source.source_type == "csv":
+            from crewai.knowledge.source.csv_knowledge_source import CSVKnowledgeSource
+            return CSVKnowledgeSource(
+                file_paths=[actual_path],
+                metadata=source.metadata,
+                chunk_size=source.chunk_size,
+                chunk_overlap=source.chunk_overlap
+            )
+        elif source.source_type == "excel":
+            from crewai.knowledge.source.excel_knowledge_source import ExcelKnowledgeSource
+            return ExcelKnowledgeSource(
+                file_paths=[actual_path],
+                metadata=source.metadata,
+                chunk_size=source.chunk_size,
+                chunk_overlap=source.chunk_overlap
+            )
+        elif source.source_type == "json":
+            from crewai.knowledge.source.json_knowledge_source import JSONKnowledgeSource
+            return JSONKnowledgeSource(
+                file_paths=[actual_path],
+                metadata=source.metadata,
+                chunk_size=source.chunk_size,
+                chunk_overlap=source.chunk_overlap
+            )
+        else:
+            raise ValueError(f"Unsupported knowledge source type: {source.source_type}")
+
+
+class _ChunkCollector:
+    """Stands in for crewAI knowledge storage and keeps the chunks instead of embedding them."""
+    def __init__(self):
+        self.documents = []
+
+    def save(self, documents):
+        self.documents.extend(documents)
+
+
+def materialize_chunks(knowledge_source):
+    """Parse and chunk the source, streaming local files and using crewAI for the rest."""
+    if knowledge_source.source_type in knowledge_chunker.STREAMED_SOURCE_TYPES:
+        actual_path = find_knowledge_file(knowledge_source.source_path)
+        if not actual_path:
+            raise FileNotFoundError(f"File not found: {knowledge_source.source_path}")
+        return knowledge_chunker.iter_file_chunks(
+            knowledge_source.source_type,
+            Path("knowledge", actual_path),
+            knowledge_source.chunk_size,
+            knowledge_source.chunk_overlap,
+        )
+    crewai_source = build_crewai_source(knowledge_source)
+    collector = _ChunkCollector()
+    crewai_source.storage = collector
+    crewai_source.add()
+    return collector.documents
+
+
+def get_chunks(knowledge_source):
+    """Return (cache key, chunk ids), parsing the source only when it is not cached yet.
+
+    The chunks themselves stay on disk, read them with iter_chunk_batches.
+    """
+    manifest = load_manifest(knowledge_source.id)
+    key = source_cache_key(knowledge_source, manifest)
+    with _lock:
+        ids = _chunk_ids_memo.get(key)
+    if ids is None:
+        if manifest.get('source_key') == key and _chunks_path(key).exists():
+            ids = manifest.get('chunk_ids', [])
+        elif _chunks_path(key).exists():
+            # Same content already materialized for another source
+            ids = [cid for batch_ids, _ in iter_chunk_batches(key) for cid in batch_ids]
+        else:
+            ids = save_chunks(key, materialize_chunks(knowledge_source))
+        with _lock:
+            _chunk_ids_memo[key] = ids
+    if manifest.get('source_key') != key:
+        update_manifest(knowledge_source, key, ids)
+    return key, ids
+
+
+def update_manifest(knowledge_source, key, ids):
+    """Record the current file state and chunk hashes, dropping the chunks of the previous version."""
+    with _manifest_locked(knowledge_source.id):
+        manifest = load_manifest(knowledge_source.id)
+        previous_key = manifest.get('source_key')
+        manifest['source_key'] = key
+        manifest['chunk_ids'] = list(ids)
+        path = Path("knowledge", knowledge_source.source_path)
+        if knowledge_source.source_type != "string" and path.is_file():
+            manifest['file'] = _file_info(path, manifest)
+        else:
+            manifest.pop('file', None)
+        manifest.setdefault('indexed', {})
+        save_manifest(knowledge_source.id, manifest)
+        if previous_key and previous_key != key:
+            with _lock:
+                _chunk_ids_memo.pop(previous_key, None)
+            _chunks_path(previous_key).unlink(missing_ok=True)
+
+
+def _ids_indexed_by_others(source_id, collection_name):
+    manifests_dir = Path(KNOWLEDGE_CACHE_DIR, "manifests")
+    ids = set()
+    if not manifests_dir.exists():
+        return ids
+    for path in manifests_dir.glob("*.json"):
+        if path.stem == source_id:
+            continue
+        ids.update(load_manifest(path.stem).get('indexed', {}).get(collection_name, []))
+    return ids
+
+
+def _record_indexed(source_id, collection_name, ids):
+    """Store what the source now holds in the collection and return the stale ids to delete."""
+    with _manifest_locked(source_id):
+        manifest = load_manifest(source_id)
+        indexed = manifest.setdefault('indexed', {})
+        previous = set(indexed.get(collection_name, []))
+        indexed[collection_name] = list(ids)
+        manifest['last_indexed'] = datetime.now().isoformat()
+        save_manifest(source_id, manifest)
+        stale = previous - set(ids)
+        if stale:
+            # a chunk with the same text may still be used by another source
+            stale -= _ids_indexed_by_others(source_id, collection_name)
+    return stale
+
+
+def _count_units(knowledge_source):
+    """Return (unit name, count) for the raw source: pages, rows, records or lines."""
+    source_type = knowledge_source.source_type
+    if source_type == "string":
+        return "lines", knowledge_source.content.count("\n") + 1
+    actual_path = find_knowledge_file(knowledge_source.source_path)
+    if not actual_path:
+        return None, None
+    path = Path("knowledge", actual_path)
+    if source_type == "pdf":
+        import pdfplumber
+        with pdfplumber.open(path) as pdf:
+            return "pages", len(pdf.pages)
+    if source_type == "csv":
+        import csv
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return "rows", sum(1 for _ in csv.reader(f))
+    if source_type == "excel":
+        if path.suffix.lower() == ".xls":
+            import pandas as pd
+            with pd.ExcelFile(path) as xl:
+                return "rows", sum(len(pd.read_excel(xl, sheet_name)) + 1 for sheet_name in xl.sheet_names)
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True)
+        try:
+            return "rows", sum(sheet.max_row or 0 for sheet in workbook.worksheets)
+        finally:
+            workbook.close()
+    if source_type == "json" and path.suffix.lower() in (".jsonl", ".ndjson"):
+        with open(path, 'r', encoding='utf-8') as f:
+            return "records", sum(1 for line in f if line.strip())
+    if source_type in ("text_file", "json"):
+        lines = 0
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                lines += block.count(b"\n")
+        return "lines", lines
+    return None, None
+
+
+def _size_bytes(knowledge_source):
+    if knowledge_source.source_type == "string":
+        return len(knowledge_source.content.encode())
+    path = Path("knowledge", knowledge_source.source_path)
+    return path.stat().st_size if path.is_file() else None
+
+
+def update_stats(knowledge_source, key):
+    """Compute the size/chunk/token stats of a materialized source and store them in its manifest."""
+    chunk_count = 0
+    chars = 0
+    for _, chunks in iter_chunk_batches(key):
+        chunk_count += len(chunks)
+        chars += sum(len(chunk) for chunk in chunks)
+    unit, unit_count = _count_units(knowledge_source)
+    stats = {
+        'source_key': key,
+        'size_bytes': _size_bytes(knowledge_source),
+        'unit': unit,
+        'unit_count': unit_count,
+        'chunk_count': chunk_count,
+        'estimated_tokens': chars // CHARS_PER_TOKEN,
+        'computed_at': datetime.now().isoformat(),
+    }
+    with _manifest_locked(knowledge_source.id):
+        manifest = load_manifest(knowledge_source.id)
+        manifest['stats'] = stats
+        save_manifest(knowledge_source.id, manifest)
+    return stats
+
+
+def mark_indexed(source_id):
+    with _manifest_locked(source_id):
+        manifest = load_manifest(source_id)
+        manifest['last_indexed'] = datetime.now().isoformat()
+        save_manifest(source_id, manifest)
+
+
+def get_stats(source_id):
+    """Stats of the source with its last indexing time, re-read only when the manifest changes."""
+    path = _manifest_path(source_id)
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+    with _lock:
+        cached = _stats_memo.get(source_id)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    manifest = load_manifest(source_id)
+    stats = manifest.get('stats')
+    if stats is not None and stats.get('source_key') != manifest.get('source_key'):
+        # computed for a previous version of the file, rematerialized since
+        stats = None
+    if stats is not None:
+        stats = dict(stats, last_indexed=manifest.get('last_indexed'))
+    with _lock:
+        _stats_memo[source_id] = (mtime, stats)
+    return stats
+
+
+def remove_source(source_id):
+    """Delete the vectors a removed source left in agent collections, and its manifest."""
+    manifest = load_manifest(source_id)
+    indexed = manifest.get('indexed', {})
+    if indexed:
+        try:
+            from crewai.rag.config.utils import get_rag_client
+            chroma_client = getattr(get_rag_client(), 'client', None)
+            for collection_name, ids in indexed.items():
+                stale = set(ids) - _ids_indexed_by_others(source_id, collection_name)
+                if chroma_client is not None and stale:
+                    chroma_client.get_collection(name=collection_name).delete(ids=list(stale))
+        except Exception as e:
+            print(f"Error removing vectors of knowledge source {source_id}: {str(e)}")
+    with _manifest_locked(source_id):
+        if manifest.get('source_key'):
+            _chunks_path(manifest['source_key']).unlink(missing_ok=True)
+        _manifest_path(source_id).unlink(missing_ok=True)
+    with _lock:
+        _chunk_ids_memo.pop(manifest.get('source_key'), None)
+        _stats_memo.pop(source_id, None)
+
+
+def embedder_fingerprint(embedding_function):
+    config = None
+    get_config = getattr(embedding_function, 'get_config', None)
+    if callable(get_config):
+        try:
+            config = get_config()
+        except Exception:
+            config = None
+    if config is None:
+        model = getattr(embedding_function, 'model_name', None) or getattr(embedding_function, 'model', None)
+        config = {'model': str(model)} if model else {}
+    data = {'type': type(embedding_function).__name__, 'config': config}
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _vector_collection(fingerprint):
+    global _vector_client
+    import chromadb
+    with _lock:
+        if _vector_client is None:
+            _vector_client = chromadb.PersistentClient(path=str(Path(KNOWLEDGE_CACHE_DIR, "vectors")))
+        client = _vector_client
+    return client.get_or_create_collection(name=f"emb_{fingerprint[:32]}")
+
+
+def get_embeddings(ids, chunks, embedding_function):
+    """Return embeddings for the chunks, computing (in batches) only those not cached yet."""
+    if not ids:
+        return []
+    collection = _vector_collection(embedder_fingerprint(embedding_function))
+    cached = collection.get(ids=ids, include=['embeddings'])
+    vectors = dict(zip(cached['ids'], cached['embeddings']))
+
+    missing = [(chunk_id_, chunk) for chunk_id_, chunk in zip(ids, chunks) if chunk_id_ not in vectors]
+    for start in range(0, len(missing), EMBED_BATCH_SIZE):
+        batch = missing[start:start + EMBED_BATCH_SIZE]
+        batch_ids = [item[0] for item in batch]
+        batch_chunks = [item[1] for item in batch]
+        batch_vectors = embedding_function(batch_chunks)
+        collection.upsert(ids=batch_ids, embeddings=batch_vectors, documents=batch_chunks)
+        vectors.update(zip(batch_ids, batch_vectors))
+
+    return [vectors[chunk_id_] for chunk_id_ in ids]
+
+
+class CachedKnowledgeSource(BaseKnowledgeSource):
+    """crewAI knowledge source backed by chunks cached on disk and cached embeddings.
+
+    The chunks are streamed from the chunk cache in batches, so large sources are never
+    held in memory as a whole.
+    """
+    source_key: str
+    source_id: str
+    chunk_ids: list[str] = Field(default_factory=list)
+
+    def validate_content(self):
+        pass
+
+    def _chroma_storage(self):
+        """(chroma client, embedding function, collection name) of the storage, or None.
+
+        Relies on crewAI internals, a crewAI version without them falls back to crewAI
+        embedding the chunks instead of failing every knowledge source.
+        """
+        try:
+            from crewai.rag.chromadb.utils import _sanitize_collection_name
+            client = self.storage._get_client()
+        except (ImportError, AttributeError) as e:
+            print(f"Error reading the crewAI knowledge storage, embedding without the cache: {str(e)}")
+            return None
+        chroma_client = getattr(client, 'client', None)
+        embedding_function = getattr(client, 'embedding_function', None)
+        if chroma_client is None or embedding_function is None:
+            return None
+        collection_name = f"knowledge_{self.storage.collection_name}" if getattr(self.storage, 'collection_name', None) else "knowledge"
+        return chroma_client, embedding_function, _sanitize_collection_name(collection_name)
+
+    def add(self) -> None:
+        if not self.chunk_ids:
+            return
+        if not self.storage:
+            raise ValueError("No storage found to save documents.")
+
+        chroma = self._chroma_storage()
+        if chroma is None:
+            # Not a Chroma backed storage, let crewAI embed the chunks itself
+            self.chunks = load_chunks(self.source_key) or []
+            self._save_documents()
+            return
+
+        chroma_client, embedding_function, collection_name = chroma
+        collection = chroma_client.get_or_create_collection(
+            name=collection_name,
+            embedding_function=embedding_function,
+        )
+
+        ids = list(dict.fromkeys(self.chunk_ids))
+        stale = _record_indexed(self.source_id, collection_name, ids)
+        if stale:
+            collection.delete(ids=list(stale))
+
+        for batch_ids, batch_chunks in iter_chunk_batches(self.source_key):
+            existing = set(collection.get(ids=batch_ids, include=[])['ids'])
+            missing = [(cid, chunk) for cid, chunk in zip(batch_ids, batch_chunks) if cid not in existing]
+            if not missing:
+                continue
+            missing_ids = [item[0] for item in missing]
+            missing_chunks = [item[1] for item in missing]
+            collection.upsert(
+                ids=missing_ids,
+                documents=missing_chunks,
+                embeddings=get_embeddings(missing_ids, missing_chunks, embedding_function),
+            )
+
+
+def get_cached_source(knowledge_source):
+    key, ids = get_chunks(knowledge_source)
+    return CachedKnowledgeSource(
+        source_key=key,
+        source_id=knowledge_source.id,
+        chunk_ids=ids,
+        metadata=knowledge_source.metadata,
+        chunk_size=knowledge_source.chunk_size,
+        chunk_overlap=knowledge_source.chunk_overlap,
+    )
+
+
+def _clear_vectors():
+    # Chroma keeps one system per path for the whole process, a client opened after the
+    # files were removed would get the old one back, with handles to deleted files. So
+    # the collections are deleted through the client and its files stay.
+    vectors_dir = Path(KNOWLEDGE_CACHE_DIR, "vectors")
+    if not vectors_dir.exists():
+        return
+    import chromadb
+    client = _vector_client or chromadb.PersistentClient(path=str(vectors_dir))
+    for collection in client.list_collections():
+        # names in recent Chroma versions, Collection objects in older ones
+        client.delete_collection(getattr(collection, 'name', collection))
+
+
+def clear_cache():
+    with _lock:
+        _chunk_ids_memo.clear()
+        _stats_memo.clear()
+        _clear_vectors()
+    if Path(KNOWLEDGE_CACHE_DIR).exists():
+        for path in Path(KNOWLEDGE_CACHE_DIR).iterdir():
+            if path.name == "vectors":
+                continue
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
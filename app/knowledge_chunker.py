@@ -0,0 +1,138 @@
+"""
+Streaming chunker for file based knowledge sources.
+
+The crewAI knowledge sources read a whole file into one string before chunking it,
+which does not scale to exports of hundreds of MB. The readers here go through the
+file incrementally (memory-mapped for text, row by row for CSV, Excel and JSON Lines)
+and the chunks are yielded lazily with the same size/overlap windows crewAI uses, so
+peak memory depends on the chunk size rather than the file size.
+"""
+import codecs
+import csv
+import io
+import json
+import mmap
+from pathlib import Path
+
+READ_BLOCK_SIZE = 1024 * 1024
+STREAMED_SOURCE_TYPES = ("text_file", "csv", "excel", "json")
+
+
+def chunk_stream(pieces, chunk_size, chunk_overlap):
+    """Yield overlapping chunks from an iterable of text pieces.
+
+    Produces exactly the windows crewAI's _chunk_text produces for the joined text.
+    """
+    step = chunk_size - chunk_overlap
+    if step <= 0:
+        raise ValueError("Chunk overlap must be smaller than the chunk size")
+    buffer = ""
+    for piece in pieces:
+        if not piece:
+            continue
+        buffer += piece
+        if len(buffer) < chunk_size:
+            continue
+        # Emit every full window and keep only the tail the next window starts in
+        start = 0
+        while len(buffer) - start >= chunk_size:
+            yield buffer[start:start + chunk_size]
+            start += step
+        buffer = buffer[start:]
+    start = 0
+    while start < len(buffer):
+        yield buffer[start:start + chunk_size]
+        start += step
+
+
+def iter_text(path):
+    """Decode a UTF-8 text file block by block through a memory map."""
+    with open(path, 'rb') as f:
+        if Path(path).stat().st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            for offset in range(0, len(mapped), READ_BLOCK_SIZE):
+                yield decoder.decode(mapped[offset:offset + READ_BLOCK_SIZE])
+            yield decoder.decode(b'', final=True)
+
+
+def iter_csv(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            yield " ".join(row) + "\n"
+
+
+def _csv_line(values):
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerow(["" if value is None else value for value in values])
+    return out.getvalue()
+
+
+def iter_excel(path):
+    """Stream every sheet as CSV lines using openpyxl's read-only mode."""
+    if Path(path).suffix.lower() == ".xls":
+        # openpyxl can't read the legacy format, load it sheet by sheet with pandas
+        import pandas as pd
+        with pd.ExcelFile(path) as xl:
+            for sheet_name in xl.sheet_names:
+                yield pd.read_excel(xl, sheet_name).to_csv(index=False)
+                yield "\n"
+        return
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            for values in sheet.iter_rows(values_only=True):
+                yield _csv_line(values)
+            yield "\n"
+    finally:
+        workbook.close()
+
+
+def _json_to_text(data, level=0):
+    """Same flattening as crewAI's JSONKnowledgeSource, produced piece by piece."""
+    indent = "  " * level
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield f"{indent}{key}: "
+            yield from _json_to_text(value, level + 1)
+            yield "\n"
+    elif isinstance(data, list):
+        for item in data:
+            yield f"{indent}- "
+            yield from _json_to_text(item, level + 1)
+            yield "\n"
+    else:
+        yield f"{data!s}"
+
+
+def iter_json(path):
+    """JSON Lines files are read record by record, plain JSON documents are parsed at once."""
+    if Path(path).suffix.lower() in (".jsonl", ".ndjson"):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield "- "
+                    yield from _json_to_text(json.loads(line), 1)
+                    yield "\n"
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    yield from _json_to_text(data)
+
+
+_READERS = {
+    "text_file": iter_text,
+    "csv": iter_csv,
+    "excel": iter_excel,
+    "json": iter_json,
+}
+
+
+def iter_file_chunks(source_type, path, chunk_size, chunk_overlap):
+    """Lazily chunk a knowledge file of one of the STREAMED_SOURCE_TYPES."""
+    reader = _READERS.get(source_type)
+    if reader is None:
+        raise ValueError(f"Streaming is not supported for knowledge source type: {source_type}")
+    return chunk_stream(reader(path), chunk_size, chunk_overlap)
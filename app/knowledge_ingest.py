@@ -0,0 +1,133 @@
+"""
+Background ingestion of knowledge sources.
+
+Saving a source on the Knowledge page schedules its parsing and chunking in a process
+pool, so large documents are processed in parallel and off the Streamlit thread. Once
+the chunks are on disk the source stats are computed and the chunks are embedded in
+batches into the embedding cache, so the next crew kickoff only has to load what is
+already materialized.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import knowledge_cache
+
+KNOWLEDGE_INGEST_WORKERS = int(os.getenv('KNOWLEDGE_INGEST_WORKERS', max(1, (os.cpu_count() or 2) - 1)))
+
+_lock = threading.Lock()
+_process_pool = None
+_thread_pool = None
+# running jobs only, finished ones are dropped and only failures remembered
+_jobs = {}
+_failed = set()
+
+
+def _get_pools():
+    global _process_pool, _thread_pool
+    with _lock:
+        if _process_pool is None:
+            # spawn keeps the workers independent of the Streamlit process state
+            _process_pool = ProcessPoolExecutor(
+                max_workers=KNOWLEDGE_INGEST_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+            _thread_pool = ThreadPoolExecutor(max_workers=KNOWLEDGE_INGEST_WORKERS)
+        return _process_pool, _thread_pool
+
+
+def _chunk_source(spec):
+    """Runs in a worker process: parse and chunk the source into the on-disk chunk cache."""
+    key, ids = knowledge_cache.get_chunks(spec)
+    try:
+        knowledge_cache.update_stats(spec, key)
+    except Exception as e:
+        print(f"Error computing stats of knowledge source {spec.id}: {str(e)}")
+    return key, len(ids)
+
+
+def _embed_chunks(key):
+    """Embed the chunks of a materialized source with the default embedder, batch by batch.
+
+    The agents and crews of the app don't set an embedder, so their knowledge storage
+    embeds with this same client. An agent with a custom embedder gets its vectors
+    cached under its own embedder fingerprint on its first kickoff instead.
+    """
+    from crewai.rag.config.utils import get_rag_client
+    embedding_function = getattr(get_rag_client(), 'embedding_function', None)
+    if embedding_function is None:
+        return 0
+    count = 0
+    for ids, chunks in knowledge_cache.iter_chunk_batches(key):
+        knowledge_cache.get_embeddings(ids, chunks, embedding_function)
+        count += len(ids)
+    return count
+
+
+def _ingest(spec):
+    process_pool, _ = _get_pools()
+    key, _ = process_pool.submit(_chunk_source, spec).result()
+    try:
+        _embed_chunks(key)
+        knowledge_cache.mark_indexed(spec.id)
+    except Exception as e:
+        # Chunks are ready, embeddings will be computed on the next kickoff instead
+        print(f"Error embedding knowledge source {spec.id}: {str(e)}")
+    return key
+
+
+def submit(knowledge_source):
+    """Schedule parsing, chunking and embedding of the source. Returns the job future."""
+    spec = knowledge_cache.SourceSpec.from_source(knowledge_source)
+    _, thread_pool = _get_pools()
+    with _lock:
+        job = _jobs.get(spec.id)
+        if job is not None and not job.done():
+            # Chain the new version after the running job of the same source
+            previous = job
+            job = thread_pool.submit(lambda: (_wait(previous), _ingest(spec))[1])
+        else:
+            job = thread_pool.submit(_ingest, spec)
+        _jobs[spec.id] = job
+        _failed.discard(spec.id)
+    job.add_done_callback(lambda job: _finished(spec.id, job))
+    return job
+
+
+def _finished(source_id, job):
+    with _lock:
+        # a newer version of the source may have been submitted meanwhile
+        if _jobs.get(source_id) is job:
+            del _jobs[source_id]
+            if job.exception() is not None:
+                _failed.add(source_id)
+
+
+def _wait(job):
+    try:
+        job.result()
+    except Exception:
+        pass
+
+
+def status(source_id):
+    """Return 'indexing', 'failed' or None when no job is running and the last one didn't fail."""
+    with _lock:
+        job = _jobs.get(source_id)
+        if job is None:
+            return 'failed' if source_id in _failed else None
+    if not job.done():
+        return 'indexing'
+    return 'failed' if job.exception() is not None else None
+
+
+def wait_for(source_id):
+    """Block until a scheduled ingestion of the source finishes, ignoring its failure."""
+    with _lock:
+        job = _jobs.get(source_id)
+    if job is not None:
+        try:
+            job.result()
+        except Exception as e:
+            print(f"Error ingesting knowledge source {source_id}: {str(e)}")
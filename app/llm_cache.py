@@ -0,0 +1,89 @@
+"""
+Persistent cache of LLM responses.
+
+Opt-in per crew. Responses are stored in a diskcache store keyed by the model, the
+temperature, the messages, the tools schema and the expected response model, so
+re-running a crew with the same inputs does not pay for identical calls again.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from llm_wrappers import DelegatingLLM
+
+LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', 'llm_cache')
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', 7 * 24 * 3600))
+LLM_CACHE_SIZE_MB = int(os.getenv('LLM_CACHE_SIZE_MB', 512))
+
+_lock = threading.Lock()
+_store = None
+
+
+def get_store():
+    global _store
+    with _lock:
+        if _store is None:
+            from diskcache import Cache
+            _store = Cache(LLM_CACHE_DIR, size_limit=LLM_CACHE_SIZE_MB * 1024 * 1024)
+        return _store
+
+
+def clear_cache():
+    get_store().clear()
+
+
+def _tool_schema(tool):
+    if isinstance(tool, dict):
+        return tool
+    # BaseTool instances, key on what the LLM actually sees
+    schema = getattr(tool, 'args_schema', None)
+    return {
+        'name': getattr(tool, 'name', str(tool)),
+        'description': getattr(tool, 'description', ''),
+        'args': schema.model_json_schema() if hasattr(schema, 'model_json_schema') else None,
+    }
+
+
+def cache_key(model, temperature, messages, tools=None, response_model=None, stop=None):
+    key_data = {
+        'model': model,
+        'temperature': temperature,
+        'messages': messages,
+        'tools': [_tool_schema(tool) for tool in tools or []],
+        'response_model': response_model.model_json_schema() if response_model is not None else None,
+        'stop': sorted(stop or []),
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class CachedLLM(DelegatingLLM):
+    """Serves repeated calls from the response cache and counts hits/misses on the run context."""
+    def __init__(self, llm, cache_model, run_context=None):
+        super().__init__(llm)
+        self.cache_model = cache_model
+        self.run_context = run_context
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None, response_model=None):
+        if available_functions:
+            # the wrapped LLM would run the tools itself, their side effects must not be skipped
+            return super().call(messages, tools, callbacks, available_functions, from_task, from_agent, response_model)
+
+        key = cache_key(self.cache_model, self.temperature, messages, tools, response_model, self.stop)
+        store = get_store()
+        response = store.get(key)
+        if response is not None:
+            if self.run_context:
+                self.run_context.record_cache_lookup(True)
+                self.run_context.record_llm_call(self.cache_model, agent=from_agent, task=from_task, cached=True)
+            return response
+
+        if self.run_context:
+            self.run_context.record_cache_lookup(False)
+        response = super().call(messages, tools, callbacks, available_functions, from_task, from_agent, response_model)
+        if response:
+            try:
+                store.set(key, response, expire=LLM_CACHE_TTL)
+            except Exception as e:
+                print(f"Error caching LLM response: {str(e)}")
+        return response
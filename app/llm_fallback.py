@@ -0,0 +1,266 @@
+"""
+Provider fallback and hedged requests.
+
+An agent LLM can be an ordered route like "OpenAI: gpt-4o-mini → Groq: llama3-70b".
+Each call goes to the first model; when it fails or exceeds LLM_CALL_TIMEOUT the next
+one is tried. With LLM_HEDGE_REQUESTS enabled, a second request is sent to the next
+model (or the same one for single model routes) once the first has been running
+longer than its p95 latency, and whichever answers first wins.
+
+Calls with nothing to race against (single model routes without hedging, and calls
+running tools, which must not be sent twice) run on the caller's thread. The others
+get a thread per attempt, so waiting for a free worker never counts against the
+timeout. A thread can't be stopped from outside: the LLMs are created with
+LLM_CALL_TIMEOUT as their request timeout, so an abandoned request ends at the same
+deadline instead of running on.
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from crewai.types.usage_metrics import UsageMetrics
+
+from llm_streaming import current_run
+from llm_wrappers import DelegatingLLM
+
+LLM_CALL_TIMEOUT = float(os.getenv('LLM_CALL_TIMEOUT', 300))
+LLM_HEDGE_REQUESTS = str(os.getenv('LLM_HEDGE_REQUESTS', 'False')).lower() in ['true', '1']
+# Calls that report no usage (e.g. streamed by some providers) are estimated from the text
+CHARS_PER_TOKEN = 4
+# No hedging until a model has enough samples for a meaningful p95
+LLM_HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+# token usage of the attempt running in this context, see _count_attempt_usage
+attempt_usage = contextvars.ContextVar('attempt_usage', default=None)
+
+
+def _count_attempt_usage(llm):
+    """Add the usage tracked by llm to the usage of the attempt running in the context.
+
+    A hedge can run on the same LLM as the attempt it races, so differences of the
+    LLM's shared counters before and after a call would count each other's tokens.
+    """
+    while isinstance(llm, DelegatingLLM):
+        llm = llm.llm
+    if getattr(llm, '_counts_attempt_usage', False):
+        return
+    track = llm._track_token_usage_internal
+    lock = threading.Lock()
+
+    def _track_token_usage_internal(usage_data):
+        with lock:
+            before = dict(llm._token_usage)
+            track(usage_data)
+            delta = {key: value - before.get(key, 0) for key, value in llm._token_usage.items()}
+        usage = attempt_usage.get()
+        if usage is not None:
+            for key, value in delta.items():
+                usage[key] = usage.get(key, 0) + value
+
+    llm._track_token_usage_internal = _track_token_usage_internal
+    llm._counts_attempt_usage = True
+
+
+def _start_thread(function):
+    """Run function on its own thread, in the caller's context, and return its future."""
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(function())
+        except BaseException as e:
+            future.set_exception(e)
+
+    # crewAI keeps the current agent/task in context variables
+    threading.Thread(target=contextvars.copy_context().run, args=(run,), name='llm-call', daemon=True).start()
+    return future
+
+
+class LatencyStats:
+    """Latencies of the recent successful calls per model."""
+    def __init__(self):
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, model, seconds):
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def count(self, model):
+        with self._lock:
+            return len(self._samples.get(model, ()))
+
+    def percentile(self, model, percentile):
+        with self._lock:
+            samples = sorted(self._samples.get(model, []))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percentile / 100))]
+
+    def summary(self):
+        with self._lock:
+            models = list(self._samples)
+        return {
+            model: {
+                'calls': self.count(model),
+                'p50': self.percentile(model, 50),
+                'p95': self.percentile(model, 95),
+            }
+            for model in models
+        }
+
+
+latency_stats = LatencyStats()
+
+
+class AttemptStream:
+    """Streaming target of one attempt of a call.
+
+    All attempts of a call share one live output; only the attempt owning it forwards
+    its chunks, so a hedged or abandoned request doesn't interleave with the one shown.
+    """
+    def __init__(self, run_context, owner):
+        self.run_context = run_context
+        self.owner = owner
+
+    def take_over(self):
+        self.owner[0] = self
+
+    def append_stream(self, chunk):
+        if self.owner[0] is self:
+            self.run_context.append_stream(chunk)
+
+
+class FallbackLLM(DelegatingLLM):
+    """Routes calls over an ordered list of (name, llm) with timeouts and optional hedging."""
+    def __init__(self, routes, timeout=LLM_CALL_TIMEOUT, hedge=LLM_HEDGE_REQUESTS, run_context=None):
+        self.routes = routes
+        self.run_context = run_context
+        self.timeout = timeout
+        self.hedge = hedge
+        for _, llm in routes:
+            _count_attempt_usage(llm)
+        super().__init__(routes[0][1])
+
+    @DelegatingLLM.stop.setter
+    def stop(self, value):
+        for _, llm in self.routes:
+            llm.stop = value
+
+    @property
+    def _token_usage(self):
+        usage = {}
+        for _, llm in self.routes:
+            for key, value in llm._token_usage.items():
+                usage[key] = usage.get(key, 0) + value
+        return usage
+
+    @_token_usage.setter
+    def _token_usage(self, value):
+        pass
+
+    def get_token_usage_summary(self):
+        return UsageMetrics(**self._token_usage)
+
+    def _attempt(self, name, llm, args, stream):
+        def timed_call():
+            usage = {}
+            attempt_usage.set(usage)
+            current_run.set(stream)
+            started = time.monotonic()
+            response = llm.call(*args)
+            latency = time.monotonic() - started
+            latency_stats.record(name, latency)
+            if self.run_context is not None:
+                estimated = not usage.get('prompt_tokens') and not usage.get('completion_tokens')
+                if estimated:
+                    usage['prompt_tokens'] = len(str(args[0])) // CHARS_PER_TOKEN
+                    usage['completion_tokens'] = len(str(response)) // CHARS_PER_TOKEN
+                self.run_context.record_llm_call(
+                    name,
+                    agent=args[5],
+                    task=args[4],
+                    prompt_tokens=usage.get('prompt_tokens', 0),
+                    completion_tokens=usage.get('completion_tokens', 0),
+                    cached_prompt_tokens=usage.get('cached_prompt_tokens', 0),
+                    latency=latency,
+                    estimated=estimated,
+                )
+            return response
+        return timed_call
+
+    def _stream(self, owner, take_over=True):
+        if self.run_context is None:
+            return None
+        stream = AttemptStream(self.run_context, owner)
+        if take_over:
+            stream.take_over()
+        return stream
+
+    def _hedge_delay(self, name):
+        if not self.hedge:
+            return None
+        if latency_stats.count(name) < LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return latency_stats.percentile(name, 95)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None, response_model=None):
+        args = (messages, tools, callbacks, available_functions, from_task, from_agent, response_model)
+        if self.run_context is not None:
+            self.run_context.start_stream(agent=from_agent, task=from_task)
+        owner = [None]
+        last_error = None
+        index = 0
+        while index < len(self.routes):
+            name, llm = self.routes[index]
+            attempt = self._attempt(name, llm, args, self._stream(owner))
+            hedge_delay = self._hedge_delay(name)
+            # tool calls run inside the LLM call, a hedged or timed out request sent
+            # again would run them twice
+            if available_functions or (len(self.routes) == 1 and hedge_delay is None):
+                try:
+                    return attempt()
+                except Exception as e:
+                    last_error = e
+                    print(f"LLM {name} failed: {str(e)}")
+                    index += 1
+                    continue
+            started = time.monotonic()
+            pending = {_start_thread(attempt): index}
+            next_index = index + 1
+            can_hedge = hedge_delay is not None
+            while pending:
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                wait_for = min(remaining, hedge_delay) if can_hedge else remaining
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    route_index = pending.pop(future)
+                    try:
+                        return future.result()
+                    except Exception as e:
+                        last_error = e
+                        print(f"LLM {self.routes[route_index][0]} failed: {str(e)}")
+                if not done and can_hedge:
+                    hedge_index = next_index if next_index < len(self.routes) else index
+                    hedge_name, hedge_llm = self.routes[hedge_index]
+                    print(f"LLM {name} slower than its p95 ({hedge_delay:.1f}s), hedging with {hedge_name}")
+                    hedge = self._attempt(hedge_name, hedge_llm, args, self._stream(owner, take_over=False))
+                    pending[_start_thread(hedge)] = hedge_index
+                    if hedge_index == next_index:
+                        next_index += 1
+                    can_hedge = False
+            if pending:
+                for future in pending:
+                    future.cancel()
+                last_error = TimeoutError(f"LLM {name} did not respond within {self.timeout:g}s")
+                print(str(last_error))
+            index = next_index
+        raise last_error
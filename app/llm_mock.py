@@ -0,0 +1,150 @@
+"""
+Deterministic offline LLM for load testing the run pipeline without API credits.
+
+Models of the "Mock" provider:
+- echo: answers every task right away with a Final Answer
+- tool-use: calls the first tool the agent has (ReAct Action/Action Input format)
+  MOCK_LLM_TOOL_CALLS times before giving the Final Answer
+- scripted: replays the responses from the MOCK_LLM_SCRIPT JSON file in order
+
+Latency and completion length are drawn from distributions configured as
+"fixed:0.5", "uniform:0.2,1.5", "normal:1,0.3", "lognormal:0,0.5" or "exponential:0.8".
+The random generator is seeded by MOCK_LLM_SEED and the prompt, so the same prompt
+always gets the same response, latency and token counts.
+"""
+import ast
+import hashlib
+import json
+import os
+import random
+import re
+import time
+
+from crewai.events.types.llm_events import LLMCallType
+from crewai.llms.base_llm import BaseLLM
+from llm_streaming import LLM_STREAMING
+
+MOCK_LLM_ENABLED = os.getenv("MOCK_LLM_ENABLED", "false").lower() == "true"
+MOCK_LLM_LATENCY = os.getenv("MOCK_LLM_LATENCY", "fixed:0")
+MOCK_LLM_COMPLETION_TOKENS = os.getenv("MOCK_LLM_COMPLETION_TOKENS", "uniform:50,300")
+MOCK_LLM_TOOL_CALLS = int(os.getenv("MOCK_LLM_TOOL_CALLS", "1"))
+MOCK_LLM_SCRIPT = os.getenv("MOCK_LLM_SCRIPT", "")
+MOCK_LLM_SEED = os.getenv("MOCK_LLM_SEED", "0")
+
+MOCK_MODELS = ["echo", "tool-use", "scripted"]
+CHARS_PER_TOKEN = 4
+FILLER_WORDS = ("lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit", "sed", "do")
+
+_DISTRIBUTIONS = {
+    "fixed": lambda rng, value: value,
+    "uniform": lambda rng, low, high: rng.uniform(low, high),
+    "normal": lambda rng, mean, sd: rng.gauss(mean, sd),
+    "lognormal": lambda rng, mu, sigma: rng.lognormvariate(mu, sigma),
+    "exponential": lambda rng, mean: rng.expovariate(1 / mean) if mean > 0 else 0,
+}
+
+
+def parse_distribution(spec):
+    """Turn "uniform:0.2,1.5" into a function drawing a non-negative value from a Random."""
+    name, _, args = spec.partition(":")
+    sample = _DISTRIBUTIONS.get(name.strip())
+    if sample is None:
+        raise ValueError(f"Unknown distribution '{name}', use one of: {', '.join(_DISTRIBUTIONS)}")
+    values = [float(value) for value in args.split(",") if value.strip()]
+    return lambda rng: max(0.0, sample(rng, *values))
+
+
+def _prompt_text(messages):
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(message.get("content") or "") for message in messages)
+
+
+def _parse_tools(prompt):
+    """Names and argument schemas of the tools listed in crewAI's ReAct prompt."""
+    tools = []
+    for name, arguments in re.findall(r"Tool Name: (.+)\nTool Arguments: (\{.*\})", prompt):
+        try:
+            schema = ast.literal_eval(arguments)
+        except (ValueError, SyntaxError):
+            schema = {}
+        tools.append((name.strip(), schema))
+    return tools
+
+
+def _mock_arguments(schema, task):
+    values = {"int": 1, "float": 1.0, "bool": True, "list": [], "dict": {}}
+    return {name: values.get(str(field.get("type")), task[:100]) for name, field in schema.items()}
+
+
+class MockLLM(BaseLLM):
+    def __init__(self, model, temperature=None, latency=None, completion_tokens=None, tool_calls=None, script=None, seed=None):
+        super().__init__(model=model, temperature=temperature, provider="mock")
+        self.latency = parse_distribution(latency or MOCK_LLM_LATENCY)
+        self.completion_tokens = parse_distribution(completion_tokens or MOCK_LLM_COMPLETION_TOKENS)
+        self.tool_calls = MOCK_LLM_TOOL_CALLS if tool_calls is None else tool_calls
+        self.seed = MOCK_LLM_SEED if seed is None else seed
+        self.script = []
+        script = script or MOCK_LLM_SCRIPT
+        if model == "scripted":
+            if not script:
+                raise ValueError("MOCK_LLM_SCRIPT is not set, the scripted mock model needs a JSON list of responses")
+            with open(script, 'r', encoding='utf-8') as f:
+                self.script = json.load(f)
+
+    def _filler(self, rng, tokens):
+        words = []
+        length = 0
+        while length < tokens * CHARS_PER_TOKEN:
+            word = rng.choice(FILLER_WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)
+
+    def _respond(self, prompt, rng):
+        task = (re.findall(r"Current Task: (.*)", prompt) or ["the task"])[-1].strip()
+        observations = prompt.count("Observation:") - prompt.count("Observation: the result of the action")
+        answer = f"Mock answer of {self.model} for: {task}\n\n{self._filler(rng, int(self.completion_tokens(rng)))}"
+        if self.model == "scripted":
+            # every tool round trip adds an observation, so it gives the position in the script
+            template = self.script[min(observations, len(self.script) - 1)]
+            return template.format(task=task, step=observations + 1, model=self.model, answer=answer)
+        tools = _parse_tools(prompt)
+        if self.model == "tool-use" and tools and observations < self.tool_calls:
+            name, schema = tools[0]
+            return (
+                f"Thought: I should use the {name} tool\n"
+                f"Action: {name}\n"
+                f"Action Input: {json.dumps(_mock_arguments(schema, task))}"
+            )
+        return f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None, response_model=None):
+        self._emit_call_started_event(messages, tools, callbacks, available_functions, from_task, from_agent)
+        prompt = _prompt_text(messages)
+        rng = random.Random(hashlib.sha256(f"{self.seed}:{self.model}:{prompt}".encode()).digest())
+        response = self._respond(prompt, rng)
+        delay = self.latency(rng)
+        if LLM_STREAMING:
+            words = response.split(" ")
+            for index, word in enumerate(words):
+                time.sleep(delay / len(words))
+                self._emit_stream_chunk_event(word if index == 0 else " " + word, from_task, from_agent)
+        else:
+            time.sleep(delay)
+        self._track_token_usage_internal({
+            "prompt_tokens": len(prompt) // CHARS_PER_TOKEN,
+            "completion_tokens": len(response) // CHARS_PER_TOKEN,
+        })
+        self._emit_call_completed_event(response, LLMCallType.LLM_CALL, from_task, from_agent, messages)
+        return response
+
+    def supports_function_calling(self):
+        # tools are used through the ReAct text format, like for most local models
+        return False
+
+    def supports_stop_words(self):
+        return True
+
+    def get_context_window_size(self):
+        return 128000
@@ -0,0 +1,93 @@
+"""
+Provider prompt caching for agents with long, stable prompts.
+
+Agents resend the same role/backstory/goal system prompt, tools and task prompt (with
+its knowledge context) on every step. Anthropic caches a prefix only when it is
+marked with cache_control, OpenAI caches identical prefixes automatically, so for
+OpenAI the system messages are kept first and calls are routed with a stable
+prompt_cache_key. Both report cached prompt tokens, which crewAI drops, so the usage
+extraction is extended to pass them on to the token usage counters. For streamed
+OpenAI responses the same extraction reads the final usage chunk (see
+llm_streaming.track_openai_stream_usage).
+"""
+import hashlib
+
+EPHEMERAL = {"type": "ephemeral"}
+
+
+def _with_cache_control(content):
+    if isinstance(content, str):
+        return [{"type": "text", "text": content, "cache_control": EPHEMERAL}]
+    if isinstance(content, list) and content and isinstance(content[-1], dict):
+        return content[:-1] + [dict(content[-1], cache_control=EPHEMERAL)]
+    return content
+
+
+def enable_anthropic_prompt_cache(llm):
+    """Mark tools, system prompt and the first user message as cache breakpoints."""
+    if not hasattr(llm, '_prepare_completion_params'):
+        return llm
+    prepare = llm._prepare_completion_params
+    extract_usage = llm._extract_anthropic_token_usage
+
+    def _prepare_completion_params(messages, system_message=None, tools=None):
+        params = prepare(messages, system_message, tools)
+        if params.get("tools"):
+            params["tools"] = params["tools"][:-1] + [dict(params["tools"][-1], cache_control=EPHEMERAL)]
+        if params.get("system"):
+            params["system"] = _with_cache_control(params["system"])
+        messages = list(params.get("messages") or [])
+        for index, message in enumerate(messages):
+            if message.get("role") == "user":
+                messages[index] = dict(message, content=_with_cache_control(message.get("content")))
+                break
+        params["messages"] = messages
+        return params
+
+    def _extract_anthropic_token_usage(response):
+        usage_data = extract_usage(response)
+        usage = getattr(response, "usage", None)
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        if cache_read or cache_write:
+            # input_tokens only counts the uncached part of the prompt
+            prompt_tokens = usage_data.get("input_tokens", 0) + cache_read + cache_write
+            usage_data.update({
+                "prompt_tokens": prompt_tokens,
+                "cached_prompt_tokens": cache_read,
+                "total_tokens": prompt_tokens + usage_data.get("output_tokens", 0),
+            })
+        return usage_data
+
+    llm._prepare_completion_params = _prepare_completion_params
+    llm._extract_anthropic_token_usage = _extract_anthropic_token_usage
+    return llm
+
+
+def enable_openai_prompt_cache(llm, cache_key=None):
+    """Keep the system prompt first and route calls of one agent with the same cache key."""
+    if not hasattr(llm, '_extract_openai_token_usage'):
+        return llm
+    format_messages = llm._format_messages
+    extract_usage = llm._extract_openai_token_usage
+
+    def _format_messages(messages):
+        formatted = format_messages(messages)
+        # stable sort, only moves system messages in front of the conversation
+        return sorted(formatted, key=lambda message: message.get("role") != "system")
+
+    def _extract_openai_token_usage(response):
+        usage_data = extract_usage(response)
+        details = getattr(getattr(response, "usage", None), "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", 0) or 0
+        if cached:
+            usage_data["cached_prompt_tokens"] = cached
+        return usage_data
+
+    llm._format_messages = _format_messages
+    llm._extract_openai_token_usage = _extract_openai_token_usage
+    base_url = getattr(llm, 'base_url', None) or ""
+    if cache_key and (not base_url or "api.openai.com" in base_url):
+        # prompt_cache_key is specific to the OpenAI API, proxies may reject it
+        llm.additional_params["prompt_cache_key"] = hashlib.sha256(cache_key.encode()).hexdigest()[:32]
+    return llm
@@ -0,0 +1,147 @@
+"""
+Client-side rate limiting of LLM calls.
+
+Every provider/API key pair gets one limiter shared by all crews running in the
+process: a token bucket for requests per minute and one for tokens per minute, both
+configured by the "rpm"/"tpm" entries of LLM_CONFIG. A 429 response blocks the whole
+limiter for the time the provider asks for in its Retry-After header before retrying.
+"""
+import email.utils
+import json
+import os
+import random
+import threading
+import time
+
+from llm_wrappers import DelegatingLLM
+
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 5))
+# Rough average for the chat tokenizers, prompts are debited before the call
+CHARS_PER_TOKEN = 4
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        """Block until the amount is available and take it."""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def debit(self, amount):
+        """Take the amount without waiting, the bucket may go into debt."""
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+
+
+class ProviderLimiter:
+    def __init__(self, rpm=None, tpm=None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def block_for(self, seconds):
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def wait(self, prompt_tokens):
+        while True:
+            with self._lock:
+                delay = self.blocked_until - time.monotonic()
+            if delay <= 0:
+                break
+            time.sleep(delay)
+        if self.requests:
+            self.requests.acquire()
+        if self.tokens:
+            self.tokens.acquire(prompt_tokens)
+
+    def record_completion(self, completion_tokens):
+        if self.tokens and completion_tokens:
+            self.tokens.debit(completion_tokens)
+
+
+def get_limiter(key, rpm=None, tpm=None):
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = ProviderLimiter(rpm, tpm)
+            _limiters[key] = limiter
+        return limiter
+
+
+def _is_rate_limit_error(error):
+    while error is not None:
+        status = getattr(error, 'status_code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+        if status == 429 or 'RateLimit' in type(error).__name__:
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def retry_after_seconds(error):
+    """Seconds from the Retry-After(-ms) header of the error response, None if absent."""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time()) if retry_at else None
+
+
+class RateLimitedLLM(DelegatingLLM):
+    """Waits for the provider limiter before each call and backs off on 429 responses."""
+    def __init__(self, llm, limiter):
+        super().__init__(llm)
+        self.limiter = limiter
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None, response_model=None):
+        prompt_tokens = len(json.dumps(messages, default=str)) // CHARS_PER_TOKEN
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            self.limiter.wait(prompt_tokens)
+            completion_tokens = self._token_usage.get('completion_tokens', 0)
+            try:
+                response = super().call(messages, tools, callbacks, available_functions, from_task, from_agent, response_model)
+            except Exception as e:
+                rate_limit_error = _is_rate_limit_error(e)
+                if rate_limit_error is None or attempt == LLM_MAX_RETRIES:
+                    raise
+                delay = retry_after_seconds(rate_limit_error)
+                if delay is None:
+                    delay = min(60.0, 2 ** attempt) + random.uniform(0, 1)
+                print(f"Rate limited by {self.model}, retrying in {delay:.1f}s")
+                self.limiter.block_for(delay)
+                continue
+            self.limiter.record_completion(self._token_usage.get('completion_tokens', 0) - completion_tokens)
+            return response
@@ -0,0 +1,74 @@
+"""
+Forwarding of streamed LLM output to the run that made the call.
+
+crewAI emits a LLMStreamChunkEvent for every streamed token chunk and runs its
+handlers synchronously in the thread making the call. FallbackLLM sets current_run
+around each call, so the handler knows which kickoff the chunk belongs to without a
+global agent-to-run mapping.
+
+crewAI's native OpenAI client doesn't ask for the usage of streamed responses, so
+track_openai_stream_usage requests the final usage chunk and counts it like the usage
+of a non-streamed response.
+"""
+import contextvars
+import os
+import threading
+
+LLM_STREAMING = str(os.getenv('LLM_STREAMING', 'True')).lower() in ['true', '1']
+
+current_run = contextvars.ContextVar('current_run', default=None)
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def _on_stream_chunk(source, event):
+    run_context = current_run.get()
+    if run_context is not None and event.chunk:
+        run_context.append_stream(event.chunk)
+
+
+def install():
+    """Register the stream chunk handler on the crewAI event bus (once per process)."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        from crewai.events import crewai_event_bus
+        from crewai.events.types.llm_events import LLMStreamChunkEvent
+        crewai_event_bus.register_handler(LLMStreamChunkEvent, _on_stream_chunk)
+        _installed = True
+
+
+class _Proxy:
+    """Forwards attribute access to target, except for the overridden attributes."""
+
+    def __init__(self, target, **overrides):
+        self._target = target
+        self.__dict__.update(overrides)
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+
+def track_openai_stream_usage(llm):
+    """Count the token usage of streamed responses of a native OpenAI LLM."""
+    client = getattr(llm, 'client', None)
+    if not getattr(llm, 'stream', False) or client is None or not hasattr(llm, '_extract_openai_token_usage'):
+        return llm
+    completions = client.chat.completions
+
+    def track(chunks):
+        for chunk in chunks:
+            # the usage chunk comes last and has no choices, crewAI skips it
+            if getattr(chunk, 'usage', None):
+                llm._track_token_usage_internal(llm._extract_openai_token_usage(chunk))
+            yield chunk
+
+    def create(**params):
+        response = completions.create(**params)
+        return track(response) if params.get('stream') else response
+
+    llm.additional_params["stream_options"] = {"include_usage": True}
+    llm.client = _Proxy(client, chat=_Proxy(client.chat, completions=_Proxy(completions, create=create)))
+    return llm
@@ -0,0 +1,81 @@
+"""
+Token usage and cost accounting of LLM calls.
+
+Every call made during a kickoff is recorded on the run context and stored with the
+result. Costs are estimated at display time from LLM_PRICES, so updating a price
+re-prices the stored runs too.
+"""
+
+# USD per 1M tokens: (input, cached input, output). Matched on the model name
+# without the provider prefix, the longest matching prefix wins.
+LLM_PRICES = {
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-5-mini": (0.25, 0.025, 2.00),
+    "gpt-5-nano": (0.05, 0.005, 0.40),
+    "gpt-5": (1.25, 0.125, 10.00),
+    "claude-3-5-sonnet": (3.00, 0.30, 15.00),
+    "claude-3-7-sonnet": (3.00, 0.30, 15.00),
+    "claude-3-5-haiku": (0.80, 0.08, 4.00),
+    "llama3-8b-8192": (0.05, 0.05, 0.08),
+    "llama3-70b-8192": (0.59, 0.59, 0.79),
+    "mixtral-8x7b-32768": (0.24, 0.24, 0.24),
+    "grok-2": (2.00, 2.00, 10.00),
+    "grok-beta": (5.00, 5.00, 15.00),
+}
+
+
+def model_price(model):
+    """Price tuple of a "Provider: model" name, None for unknown (e.g. local) models."""
+    name = model.split(": ", 1)[-1].split("/")[-1]
+    matches = [prefix for prefix in LLM_PRICES if name.startswith(prefix)]
+    if not matches:
+        return None
+    return LLM_PRICES[max(matches, key=len)]
+
+
+def call_cost(call):
+    price = model_price(call['model'])
+    if price is None or call.get('cached'):
+        return 0.0
+    input_price, cached_price, output_price = price
+    cached_tokens = call.get('cached_prompt_tokens', 0)
+    uncached_tokens = max(0, call.get('prompt_tokens', 0) - cached_tokens)
+    return (uncached_tokens * input_price + cached_tokens * cached_price + call.get('completion_tokens', 0) * output_price) / 1_000_000
+
+
+def _empty_totals():
+    return {
+        'calls': 0,
+        'cached_calls': 0,
+        'estimated_calls': 0,
+        'prompt_tokens': 0,
+        'completion_tokens': 0,
+        'cached_prompt_tokens': 0,
+        'latency': 0.0,
+        'cost': 0.0,
+    }
+
+
+def _add(totals, call):
+    totals['calls'] += 1
+    totals['cached_calls'] += 1 if call.get('cached') else 0
+    totals['estimated_calls'] += 1 if call.get('estimated') else 0
+    totals['prompt_tokens'] += call.get('prompt_tokens', 0)
+    totals['completion_tokens'] += call.get('completion_tokens', 0)
+    totals['cached_prompt_tokens'] += call.get('cached_prompt_tokens', 0)
+    totals['latency'] += call.get('latency', 0.0)
+    totals['cost'] += call_cost(call)
+
+
+def aggregate_usage(calls):
+    """Totals of the recorded calls for the whole run and per agent, task and model."""
+    summary = {'total': _empty_totals(), 'by_agent': {}, 'by_task': {}, 'by_model': {}}
+    for call in calls:
+        _add(summary['total'], call)
+        for group, key in (('by_agent', call.get('agent')), ('by_task', call.get('task')), ('by_model', call['model'])):
+            _add(summary[group].setdefault(key or "(none)", _empty_totals()), call)
+    return summary
@@ -0,0 +1,59 @@
+from crewai.llms.base_llm import BaseLLM
+
+
+class DelegatingLLM(BaseLLM):
+    """crewAI LLM that forwards everything to the wrapped LLM.
+
+    Subclasses override call() to add behaviour around the actual request. Stop words
+    and token usage live on the wrapped LLM, so crewAI sees the same values through
+    any number of wrappers.
+    """
+    def __init__(self, llm):
+        self.llm = llm
+        super().__init__(model=llm.model, temperature=llm.temperature, provider=getattr(llm, 'provider', None))
+
+    @property
+    def stop(self):
+        return self.llm.stop
+
+    @stop.setter
+    def stop(self, value):
+        self.llm.stop = value
+
+    @property
+    def _token_usage(self):
+        return self.llm._token_usage
+
+    @_token_usage.setter
+    def _token_usage(self, value):
+        # BaseLLM.__init__ resets the counters, they belong to the wrapped LLM
+        pass
+
+    def __getattr__(self, name):
+        llm = self.__dict__.get('llm')
+        if llm is None:
+            raise AttributeError(name)
+        return getattr(llm, name)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None, response_model=None):
+        return self.llm.call(
+            messages,
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+            response_model=response_model,
+        )
+
+    def supports_function_calling(self):
+        return self.llm.supports_function_calling()
+
+    def supports_stop_words(self):
+        return self.llm.supports_stop_words()
+
+    def get_context_window_size(self):
+        return self.llm.get_context_window_size()
+
+    def get_token_usage_summary(self):
+        return self.llm.get_token_usage_summary()
@@ -1,163 +1,333 @@
+import copy
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import requests
 from dotenv import load_dotenv
-import streamlit as st
-from langchain_openai import ChatOpenAI
-from langchain_groq import ChatGroq
-from langchain_anthropic import ChatAnthropic
 from crewai import LLM
-from langchain_openai.chat_models.base import BaseChatOpenAI
-from litellm import completion
+from llm_rate_limit import RateLimitedLLM, get_limiter
+from llm_fallback import FallbackLLM, LLM_CALL_TIMEOUT
+import llm_streaming
+from llm_prompt_cache import enable_anthropic_prompt_cache, enable_openai_prompt_cache
+from llm_streaming import LLM_STREAMING
+from llm_mock import MockLLM, MOCK_LLM_ENABLED, MOCK_MODELS
+
+# Snapshot of the provider secrets. Clients get their credentials and base URLs
+# passed explicitly, nothing is written to os.environ while building them, so crews
+# can be constructed from several threads at once.
+_secrets = {}
+_secrets_lock = threading.Lock()
+
+# Built clients are kept in a bounded LRU pool. Every create_llm call gets a shallow
+# copy of the pooled client: it shares the underlying SDK client (and its keep-alive
+# HTTP connections) but keeps its own stop words and token usage counters.
+LLM_POOL_SIZE = int(os.getenv('LLM_POOL_SIZE', 32))
+_llm_pool = OrderedDict()
+_llm_pool_lock = threading.Lock()
+
+# Model lists are discovered from the provider APIs and memoized as one flat list.
+# When a provider can't be reached its last discovered (or configured) list is used.
+LLM_MODELS_TTL = int(os.getenv('LLM_MODELS_TTL', 3600))
+MODEL_DISCOVERY_TIMEOUT = 3
+_models_lock = threading.Lock()
+_models_memo = None
+_models_fetched_at = 0.0
+_discovered_models = {}
+
+# An agent LLM may name an ordered fallback route of "Provider: Model" entries
+ROUTE_SEPARATOR = " → "
 
 def load_secrets_fron_env():
     load_dotenv(override=True)
-    if "env_vars" not in st.session_state:
-        st.session_state.env_vars = {
-            "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY"),
-            "OPENAI_API_BASE": os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1/"),
-            "GROQ_API_KEY": os.getenv("GROQ_API_KEY"),
-            "LMSTUDIO_API_BASE": os.getenv("LMSTUDIO_API_BASE"),
-            "ANTHROPIC_API_KEY": os.getenv("ANTHROPIC_API_KEY"),
-            "OLLAMA_HOST": os.getenv("OLLAMA_HOST"),
-            "XAI_API_KEY": os.getenv("XAI_API_KEY"),
-        }
-    else:
-        st.session_state.env_vars = st.session_state.env_vars
+    secrets = {
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY"),
+        "OPENAI_API_BASE": os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1/"),
+        "GROQ_API_KEY": os.getenv("GROQ_API_KEY"),
+        "LMSTUDIO_API_BASE": os.getenv("LMSTUDIO_API_BASE"),
+        "ANTHROPIC_API_KEY": os.getenv("ANTHROPIC_API_KEY"),
+        "OLLAMA_HOST": os.getenv("OLLAMA_HOST"),
+        "XAI_API_KEY": os.getenv("XAI_API_KEY"),
+    }
+    with _secrets_lock:
+        changed = secrets != _secrets
+        _secrets.clear()
+        _secrets.update(secrets)
+    if changed:
+        clear_llm_pool()
+        refresh_models()
+
+def get_secret(key):
+    if not _secrets:
+        # not loaded yet (e.g. used outside of the Streamlit app)
+        load_secrets_fron_env()
+    with _secrets_lock:
+        return _secrets.get(key)
 
-def switch_environment(new_env_vars):
-    for key, value in new_env_vars.items():
-        if value is not None:
-            os.environ[key] = value
-            st.session_state.env_vars[key] = value
+def _env_limit(name):
+    value = os.getenv(name)
+    return int(value) if value else None
 
-def restore_environment():
-    for key, value in st.session_state.env_vars.items():
-        if value is not None:
-            os.environ[key] = value
-        elif key in os.environ:
-            del os.environ[key]
+def clear_llm_pool():
+    with _llm_pool_lock:
+        _llm_pool.clear()
 
-def safe_pop_env_var(key):
-    os.environ.pop(key, None)
+def _pool_key(provider, model, temperature):
+    config = LLM_CONFIG[provider]
+    base_url = get_secret(config["base_url"]) if config.get("base_url") else None
+    api_key = get_secret(config["api_key"]) if config.get("api_key") else None
+    key_fingerprint = hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else None
+    return (provider, model, temperature, base_url, key_fingerprint)
+
+def _checkout(llm):
+    llm = copy.copy(llm)
+    llm.stop = list(llm.stop or [])
+    llm.additional_params = dict(getattr(llm, 'additional_params', None) or {})
+    llm._token_usage = {key: 0 for key in llm._token_usage}
+    return llm
 
 def create_openai_llm(model, temperature):
-    switch_environment({
-        "OPENAI_API_KEY": st.session_state.env_vars["OPENAI_API_KEY"],
-        "OPENAI_API_BASE": st.session_state.env_vars["OPENAI_API_BASE"],
-    })
-    api_key = os.getenv("OPENAI_API_KEY")
-    api_base = os.getenv("OPENAI_API_BASE")
+    api_key = get_secret("OPENAI_API_KEY")
+    api_base = get_secret("OPENAI_API_BASE")
 
     if api_key:
-        return LLM(model=model, temperature=temperature, base_url=api_base)
+        return LLM(model=model, temperature=temperature, api_key=api_key, base_url=api_base, stream=LLM_STREAMING, timeout=LLM_CALL_TIMEOUT)
     else:
         raise ValueError("OpenAI API key not set in .env file")
 
 def create_anthropic_llm(model, temperature):
-    switch_environment({
-        "ANTHROPIC_API_KEY": st.session_state.env_vars["ANTHROPIC_API_KEY"],
-    })
-    api_key = os.getenv("ANTHROPIC_API_KEY")
+    api_key = get_secret("ANTHROPIC_API_KEY")
 
     if api_key:
-        return ChatAnthropic(
-            anthropic_api_key=api_key,
-            model_name=model,
+        return LLM(
+            model=f"anthropic/{model}",
+            api_key=api_key,
             temperature=temperature,
             max_tokens=4095,
+            stream=LLM_STREAMING,
+            timeout=LLM_CALL_TIMEOUT,
         )
     else:
         raise ValueError("Anthropic API key not set in .env file")
 
 def create_groq_llm(model, temperature):
-    switch_environment({
-        "GROQ_API_KEY": st.session_state.env_vars["GROQ_API_KEY"],
-    })
-    api_key = os.getenv("GROQ_API_KEY")
+    api_key = get_secret("GROQ_API_KEY")
 
     if api_key:
-        return ChatGroq(groq_api_key=api_key, model_name=model, temperature=temperature, max_tokens=4095)
+        return LLM(model=model, api_key=api_key, temperature=temperature, max_tokens=4095, stream=LLM_STREAMING, timeout=LLM_CALL_TIMEOUT)
     else:
         raise ValueError("Groq API key not set in .env file")
 
 def create_ollama_llm(model, temperature):
-    host = st.session_state.env_vars["OLLAMA_HOST"]
+    host = get_secret("OLLAMA_HOST")
     if host:
-        switch_environment({
-            "OPENAI_API_KEY": "ollama",  # Nastaví OpenAI API klíč na "ollama"
-            "OPENAI_API_BASE": host,    # Nastaví OpenAI API Base na hodnotu OLLAMA_HOST
-        })
-        return LLM(model=model, temperature=temperature, base_url=host)
+        return LLM(model=model, temperature=temperature, api_key="ollama", base_url=host, stream=LLM_STREAMING, timeout=LLM_CALL_TIMEOUT)
     else:
         raise ValueError("Ollama Host is not set in .env file")
 
 
 def create_xai_llm(model, temperature):
     host = "https://api.x.ai/v1"
-    api_key = st.session_state.env_vars.get("XAI_API_KEY")
+    api_key = get_secret("XAI_API_KEY")
 
     if not api_key:
         raise ValueError("XAI_API_KEY must be set in .env file")
 
-    switch_environment({
-        "OPENAI_API_KEY": api_key,
-        "OPENAI_API_BASE": host,
-    })
-
     return LLM(
         model=model,
         temperature=temperature,
         api_key=api_key,
-        base_url=host
+        base_url=host,
+        stream=LLM_STREAMING,
+        timeout=LLM_CALL_TIMEOUT,
     )
 
 def create_lmstudio_llm(model, temperature):
-    switch_environment({
-        "OPENAI_API_KEY": "lm-studio",
-        "OPENAI_API_BASE": st.session_state.env_vars["LMSTUDIO_API_BASE"],
-    })
-    api_base = os.getenv("OPENAI_API_BASE")
+    api_base = get_secret("LMSTUDIO_API_BASE")
 
     if api_base:
-        return ChatOpenAI(
-            openai_api_key="lm-studio",
-            openai_api_base=api_base,
+        # LM Studio serves an OpenAI compatible API for whatever model is loaded
+        return LLM(
+            model=f"openai/{model}",
+            api_key="lm-studio",
+            base_url=api_base,
             temperature=temperature,
             max_tokens=4095,
+            stream=LLM_STREAMING,
+            timeout=LLM_CALL_TIMEOUT,
         )
     else:
         raise ValueError("LM Studio API base not set in .env file")
 
+def create_mock_llm(model, temperature):
+    return MockLLM(model=model, temperature=temperature)
+
+def _get_json(url, headers=None):
+    response = requests.get(url, headers=headers, timeout=MODEL_DISCOVERY_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+def list_openai_models():
+    api_key = get_secret("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    api_base = get_secret("OPENAI_API_BASE").rstrip("/")
+    ids = [model["id"] for model in _get_json(f"{api_base}/models", {"Authorization": f"Bearer {api_key}"})["data"]]
+    if "api.openai.com" in api_base:
+        # the official endpoint also lists embedding, audio and image models
+        ids = [model_id for model_id in ids
+               if model_id.startswith(("gpt-", "o1", "o3", "o4", "chatgpt-"))
+               and not any(part in model_id for part in ("audio", "realtime", "tts", "transcribe", "image", "search"))]
+    return sorted(ids)
+
+def list_groq_models():
+    api_key = get_secret("GROQ_API_KEY")
+    if not api_key:
+        return None
+    data = _get_json("https://api.groq.com/openai/v1/models", {"Authorization": f"Bearer {api_key}"})["data"]
+    return sorted(f"groq/{model['id']}" for model in data if not any(part in model["id"] for part in ("whisper", "tts", "guard")))
+
+def list_ollama_models():
+    host = get_secret("OLLAMA_HOST")
+    if not host:
+        return None
+    return sorted(f"ollama/{model['name']}" for model in _get_json(f"{host.rstrip('/')}/api/tags")["models"])
+
+def list_anthropic_models():
+    api_key = get_secret("ANTHROPIC_API_KEY")
+    if not api_key:
+        return None
+    data = _get_json("https://api.anthropic.com/v1/models", {"x-api-key": api_key, "anthropic-version": "2023-06-01"})["data"]
+    return [model["id"] for model in data]
+
+def list_lmstudio_models():
+    api_base = get_secret("LMSTUDIO_API_BASE")
+    if not api_base:
+        return None
+    return sorted(model["id"] for model in _get_json(f"{api_base.rstrip('/')}/models")["data"])
+
+def list_xai_models():
+    api_key = get_secret("XAI_API_KEY")
+    if not api_key:
+        return None
+    data = _get_json("https://api.x.ai/v1/models", {"Authorization": f"Bearer {api_key}"})["data"]
+    return sorted(f"xai/{model['id']}" for model in data)
+
 LLM_CONFIG = {
     "OpenAI": {
         "models": os.getenv("OPENAI_PROXY_MODELS", "").split(",") if os.getenv("OPENAI_PROXY_MODELS") else ["gpt-4.1-mini","gpt-4o-mini", "gpt-4o", "gpt-5-mini", "gpt-5-nano"],
         "create_llm": create_openai_llm,
+        "list_models": None if os.getenv("OPENAI_PROXY_MODELS") else list_openai_models,
+        "api_key": "OPENAI_API_KEY",
+        "base_url": "OPENAI_API_BASE",
+        "rpm": _env_limit("OPENAI_RPM"),
+        "tpm": _env_limit("OPENAI_TPM"),
     },
     "Groq": {
         "models": ["groq/llama3-8b-8192", "groq/llama3-70b-8192", "groq/mixtral-8x7b-32768"],
         "create_llm": create_groq_llm,
+        "list_models": list_groq_models,
+        "api_key": "GROQ_API_KEY",
+        "rpm": _env_limit("GROQ_RPM"),
+        "tpm": _env_limit("GROQ_TPM"),
     },
     "Ollama": {
         "models": os.getenv("OLLAMA_MODELS", "").split(",") if os.getenv("OLLAMA_MODELS") else [],
         "create_llm": create_ollama_llm,
+        "list_models": None if os.getenv("OLLAMA_MODELS") else list_ollama_models,
+        "base_url": "OLLAMA_HOST",
+        "rpm": _env_limit("OLLAMA_RPM"),
+        "tpm": _env_limit("OLLAMA_TPM"),
     },
     "Anthropic": {
         "models": ["claude-3-5-sonnet-20240620","claude-3-7-sonnet-20250219"],
         "create_llm": create_anthropic_llm,
+        "list_models": list_anthropic_models,
+        "api_key": "ANTHROPIC_API_KEY",
+        "rpm": _env_limit("ANTHROPIC_RPM"),
+        "tpm": _env_limit("ANTHROPIC_TPM"),
     },
     "LM Studio": {
         "models": ["lms-default"],
         "create_llm": create_lmstudio_llm,
+        "list_models": list_lmstudio_models,
+        "base_url": "LMSTUDIO_API_BASE",
+        "rpm": _env_limit("LMSTUDIO_RPM"),
+        "tpm": _env_limit("LMSTUDIO_TPM"),
     },
      "Xai": {
         "models": ["xai/grok-2-1212", "xai/grok-beta"],
         "create_llm": create_xai_llm,
+        "list_models": list_xai_models,
+        "api_key": "XAI_API_KEY",
+        "rpm": _env_limit("XAI_RPM"),
+        "tpm": _env_limit("XAI_TPM"),
+    },
+    "Mock": {
+        "models": MOCK_MODELS if MOCK_LLM_ENABLED else [],
+        "create_llm": create_mock_llm,
     },
 }
 
+def _discover(provider):
+    list_models = LLM_CONFIG[provider].get("list_models")
+    if not list_models:
+        return None
+    try:
+        return list_models()
+    except Exception as e:
+        print(f"Error listing {provider} models: {str(e)}")
+        return None
+
+def refresh_models():
+    """Forget the memoized model list, the next call discovers the models again."""
+    global _models_memo
+    with _models_lock:
+        _models_memo = None
+
+def provider_models(provider):
+    configured = LLM_CONFIG[provider]["models"]
+    with _models_lock:
+        discovered = _discovered_models.get(provider)
+    if not discovered:
+        return configured
+    # configured models stay listed (defaults first) even when discovery doesn't return them
+    return configured + [model for model in discovered if model not in configured]
+
 def llm_providers_and_models():
-    return [f"{provider}: {model}" for provider in LLM_CONFIG.keys() for model in LLM_CONFIG[provider]["models"]]
+    global _models_memo, _models_fetched_at
+    with _models_lock:
+        if _models_memo is not None and time.monotonic() - _models_fetched_at < LLM_MODELS_TTL:
+            return _models_memo
+    providers = list(LLM_CONFIG.keys())
+    with ThreadPoolExecutor(max_workers=len(providers)) as executor:
+        results = dict(zip(providers, executor.map(_discover, providers)))
+    with _models_lock:
+        for provider, models in results.items():
+            if models:
+                _discovered_models[provider] = models
+    models = [f"{provider}: {model}" for provider in providers for model in provider_models(provider)]
+    with _models_lock:
+        _models_memo = models
+        _models_fetched_at = time.monotonic()
+    return models
+
+def model_options(*selected):
+    """Models to offer in a select box, the selected ones included even when they are not listed (anymore)."""
+    models = llm_providers_and_models()
+    return models + [model for model in dict.fromkeys(selected) if model and model not in models]
+
+def parse_llm_route(provider_and_model):
+    """Split "OpenAI: gpt-4o-mini → Groq: llama3-70b" into the ordered provider/model list."""
+    parts = provider_and_model.replace("->", "→").split("→")
+    return [part.strip() for part in parts if part.strip()]
+
+def format_llm_route(providers_and_models):
+    return ROUTE_SEPARATOR.join(providers_and_models)
 
-def create_llm(provider_and_model, temperature=0.15):
+def _create_single_llm(provider_and_model, temperature, prompt_cache_key=None):
     # Rozdělit pouze na první výskyt ': ', aby model mohl obsahovat dvojtečku
     if ": " not in provider_and_model:
         raise ValueError("Input string must be in format 'Provider: Model'")
@@ -165,8 +335,45 @@ def create_llm(provider_and_model, temperature=0.15):
     create_llm_func = LLM_CONFIG.get(provider, {}).get("create_llm")
 
     if create_llm_func:
-        llm = create_llm_func(model, temperature)
-        restore_environment()  # Obnoví původní prostředí po vytvoření LLM
-        return llm
+        key = _pool_key(provider, model, temperature)
+        with _llm_pool_lock:
+            llm = _llm_pool.get(key)
+            if llm is not None:
+                _llm_pool.move_to_end(key)
+        if llm is None:
+            llm = create_llm_func(model, temperature)
+            with _llm_pool_lock:
+                _llm_pool[key] = llm
+                while len(_llm_pool) > LLM_POOL_SIZE:
+                    _llm_pool.popitem(last=False)
+        llm = _checkout(llm)
+        if provider == "OpenAI":
+            # looks up _extract_openai_token_usage per chunk, so the prompt cache patch below applies too
+            llm_streaming.track_openai_stream_usage(llm)
+        if prompt_cache_key is not None:
+            if provider == "Anthropic":
+                enable_anthropic_prompt_cache(llm)
+            elif provider == "OpenAI":
+                enable_openai_prompt_cache(llm, prompt_cache_key)
+        config = LLM_CONFIG[provider]
+        _, _, _, base_url, key_fingerprint = key
+        limiter = get_limiter((provider, base_url, key_fingerprint), rpm=config.get("rpm"), tpm=config.get("tpm"))
+        return RateLimitedLLM(llm, limiter)
     else:
         raise ValueError(f"LLM provider {provider} is not recognized or not supported")
+
+def create_llm(provider_and_model, temperature=0.15, run_context=None, prompt_cache_key=None):
+    """Build the crewAI LLM for a "Provider: Model" route.
+
+    prompt_cache_key enables provider prompt caching (Anthropic/OpenAI) for calls sharing it.
+    """
+    routes = parse_llm_route(provider_and_model)
+    if not routes:
+        raise ValueError("Input string must be in format 'Provider: Model'")
+    if LLM_STREAMING:
+        llm_streaming.install()
+    llm = FallbackLLM([(route, _create_single_llm(route, temperature, prompt_cache_key)) for route in routes], run_context=run_context)
+    if run_context is not None and run_context.response_cache:
+        from llm_cache import CachedLLM
+        llm = CachedLLM(llm, provider_and_model, run_context)
+    return llm
@@ -3,11 +3,11 @@ import streamlit as st
 from utils import rnd_id, fix_columns_width
 from streamlit import session_state as ss
 from db_utils import save_agent, delete_agent
-from llms import llm_providers_and_models, create_llm
+from llms import llm_providers_and_models, model_options, create_llm, parse_llm_route, format_llm_route
 from datetime import datetime
 
 class MyAgent:
-    def __init__(self, id=None, role=None, backstory=None, goal=None, temperature=None, allow_delegation=False, verbose=False, cache= None, llm_provider_model=None, max_iter=None, created_at=None, tools=None, knowledge_source_ids=None):
+    def __init__(self, id=None, role=None, backstory=None, goal=None, temperature=None, allow_delegation=False, verbose=False, cache= None, llm_provider_model=None, max_iter=None, created_at=None, tools=None, knowledge_source_ids=None, prompt_caching=None):
         self.id = id or "A_" + rnd_id()
         self.role = role or "Senior Researcher"
         self.backstory = backstory or "Driven by curiosity, you're at the forefront of innovation, eager to explore and share knowledge that could change the world."
@@ -20,6 +20,7 @@ class MyAgent:
         self.tools = tools or []
         self.max_iter = max_iter or 25
         self.cache = cache if cache is not None else True
+        self.prompt_caching = prompt_caching if prompt_caching is not None else False
         self.knowledge_source_ids = knowledge_source_ids or []
         self.edit_key = f'edit_{self.id}'
         if self.edit_key not in ss:
@@ -33,9 +34,14 @@ class MyAgent:
     def edit(self, value):
         ss[self.edit_key] = value
 
-    def get_crewai_agent(self) -> Agent:
-        llm = create_llm(self.llm_provider_model, temperature=self.temperature)
-        tools = [tool.create_tool() for tool in self.tools]
+    def get_crewai_agent(self, run_context=None) -> Agent:
+        llm = create_llm(
+            self.llm_provider_model,
+            temperature=self.temperature,
+            run_context=run_context,
+            prompt_cache_key=self.id if self.prompt_caching else None,
+        )
+        tools = [tool.get_crewai_tool() for tool in self.tools]
         
         # Add knowledge sources if they exist
         knowledge_sources = []
@@ -83,14 +89,22 @@ class MyAgent:
                 return False
         return True
 
+    @property
+    def primary_llm(self):
+        return parse_llm_route(self.llm_provider_model)[0]
+
+    @property
+    def fallback_llms(self):
+        return parse_llm_route(self.llm_provider_model)[1:]
+
     def validate_llm_provider_model(self):
-        available_models = llm_providers_and_models()
-        if self.llm_provider_model not in available_models:
-            self.llm_provider_model = available_models[0]
+        # a saved model is kept even when discovery doesn't list it, the provider may just be unreachable
+        if not parse_llm_route(self.llm_provider_model or ""):
+            self.llm_provider_model = llm_providers_and_models()[0]
 
     def draw(self, key=None):
         self.validate_llm_provider_model()
-        expander_title = f"{self.role[:60]} -{self.llm_provider_model.split(':')[1]}" if self.is_valid() else f"❗ {self.role[:20]} -{self.llm_provider_model.split(':')[1]}"
+        expander_title = f"{self.role[:60]} -{self.primary_llm.split(':')[1]}" if self.is_valid() else f"❗ {self.role[:20]} -{self.primary_llm.split(':')[1]}"
         form_key = f'form_{self.id}_{key}' if key else f'form_{self.id}'        
         if self.edit:
             with st.expander(f"Agent: {self.role}", expanded=True):
@@ -101,7 +115,11 @@ class MyAgent:
                     self.allow_delegation = st.checkbox("Allow delegation", value=self.allow_delegation)
                     self.verbose = st.checkbox("Verbose", value=self.verbose)
                     self.cache = st.checkbox("Cache", value=self.cache)
-                    self.llm_provider_model = st.selectbox("LLM Provider and Model", options=llm_providers_and_models(), index=llm_providers_and_models().index(self.llm_provider_model))
+                    self.prompt_caching = st.checkbox("Prompt caching", value=self.prompt_caching, help="Let Anthropic/OpenAI cache the stable prompt prefix (role, backstory, goal, tools, task and knowledge context) across steps")
+                    llm_options = model_options(*parse_llm_route(self.llm_provider_model))
+                    primary_llm = st.selectbox("LLM Provider and Model", options=llm_options, index=llm_options.index(self.primary_llm))
+                    fallback_llms = st.multiselect("Fallback LLMs", options=llm_options, default=self.fallback_llms, help="Tried in this order when the main LLM fails or times out")
+                    self.llm_provider_model = format_llm_route([primary_llm] + [model for model in fallback_llms if model != primary_llm])
                     self.temperature = st.slider("Temperature", value=self.temperature, min_value=0.0, max_value=1.0)
                     self.max_iter = st.number_input("Max Iterations", value=self.max_iter, min_value=1, max_value=100)                    
                     enabled_tools = [tool for tool in ss.tools]
@@ -150,6 +168,7 @@ class MyAgent:
                 st.markdown(f"**Allow delegation:** {self.allow_delegation}")
                 st.markdown(f"**Verbose:** {self.verbose}")
                 st.markdown(f"**Cache:** {self.cache}")
+                st.markdown(f"**Prompt caching:** {self.prompt_caching}")
                 st.markdown(f"**LLM Provider and Model:** {self.llm_provider_model}")
                 st.markdown(f"**Temperature:** {self.temperature}")
                 st.markdown(f"**Max Iterations:** {self.max_iter}")
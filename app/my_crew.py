@@ -3,11 +3,11 @@ import streamlit as st
 from utils import rnd_id, fix_columns_width
 from streamlit import session_state as ss
 from datetime import datetime
-from llms import llm_providers_and_models, create_llm
+from llms import model_options, create_llm
 import db_utils
 
 class MyCrew:
-    def __init__(self, id=None, name=None, agents=None, tasks=None, process=None, cache=None, max_rpm=None, verbose=None, manager_llm=None, manager_agent=None, created_at=None, memory=None, planning=None, planning_llm=None, knowledge_source_ids=None):
+    def __init__(self, id=None, name=None, agents=None, tasks=None, process=None, cache=None, max_rpm=None, verbose=None, manager_llm=None, manager_agent=None, created_at=None, memory=None, planning=None, planning_llm=None, knowledge_source_ids=None, response_cache=None):
         self.id = id or "C_" + rnd_id()
         self.name = name or "Crew 1"
         self.agents = agents or []
@@ -18,6 +18,7 @@ class MyCrew:
         self.manager_agent = manager_agent
         self.memory = memory if memory is not None else False
         self.cache = cache if cache is not None else True
+        self.response_cache = response_cache if response_cache is not None else False
         self.max_rpm = max_rpm or 1000
         self.planning = planning if planning is not None else False
         self.planning_llm = planning_llm
@@ -38,8 +39,8 @@ class MyCrew:
     def edit(self, value):
         ss[self.edit_key] = value
 
-    def get_crewai_crew(self, *args, **kwargs) -> Crew:
-        crewai_agents = [agent.get_crewai_agent() for agent in self.agents]
+    def get_crewai_crew(self, *args, run_context=None, **kwargs) -> Crew:
+        crewai_agents = [agent.get_crewai_agent(run_context=run_context) for agent in self.agents]
 
         # Create a dictionary to hold the Task objects
         task_objects = {}
@@ -62,9 +63,9 @@ class MyCrew:
 
             # Only pass context if it's an async task or if specific context is defined
             if task.async_execution or context_tasks:
-                crewai_task = task.get_crewai_task(context_from_async_tasks=context_tasks)
+                crewai_task = task.get_crewai_task(context_from_async_tasks=context_tasks, run_context=run_context)
             else:
-                crewai_task = task.get_crewai_task()
+                crewai_task = task.get_crewai_task(run_context=run_context)
 
             task_objects[task.id] = crewai_task
             return crewai_task
@@ -104,13 +105,13 @@ class MyCrew:
                 'process': self.process,
                 'max_rpm': self.max_rpm,
                 'verbose': self.verbose,
-                'manager_llm': create_llm(self.manager_llm),
+                'manager_llm': create_llm(self.manager_llm, run_context=run_context),
                 'memory': self.memory,
                 'planning': self.planning,
                 'knowledge_sources': knowledge_sources if knowledge_sources else None,
             }
             if self.planning and self.planning_llm:
-                crew_params['planning_llm'] = create_llm(self.planning_llm)
+                crew_params['planning_llm'] = create_llm(self.planning_llm, run_context=run_context)
             crew_params.update(kwargs)
             return Crew(*args, **crew_params)
         elif self.manager_agent:
@@ -121,13 +122,13 @@ class MyCrew:
                 'process': self.process,
                 'max_rpm': self.max_rpm,
                 'verbose': self.verbose,
-                'manager_agent': self.manager_agent.get_crewai_agent(),
+                'manager_agent': self.manager_agent.get_crewai_agent(run_context=run_context),
                 'memory': self.memory,
                 'planning': self.planning,
                 'knowledge_sources': knowledge_sources if knowledge_sources else None,
             }
             if self.planning and self.planning_llm:
-                crew_params['planning_llm'] = create_llm(self.planning_llm)
+                crew_params['planning_llm'] = create_llm(self.planning_llm, run_context=run_context)
             crew_params.update(kwargs)
             return Crew(*args, **crew_params)
         
@@ -143,7 +144,7 @@ class MyCrew:
             'knowledge_sources': knowledge_sources if knowledge_sources else None,
         }
         if self.planning and self.planning_llm:
-            crew_params['planning_llm'] = create_llm(self.planning_llm)
+            crew_params['planning_llm'] = create_llm(self.planning_llm, run_context=run_context)
         crew_params.update(kwargs)
         return Crew(*args, **crew_params)
     
@@ -205,6 +206,10 @@ class MyCrew:
         self.cache = ss[f'cache_{self.id}']
         db_utils.save_crew(self)
 
+    def update_response_cache(self):
+        self.response_cache = ss[f'response_cache_{self.id}']
+        db_utils.save_crew(self)
+
     def update_planning(self):
         self.planning = ss[f'planning_{self.id}']
         db_utils.save_crew(self)
@@ -237,19 +242,7 @@ class MyCrew:
             return False
         return True
 
-    def validate_manager_llm(self):
-        available_models = llm_providers_and_models()
-        if self.manager_llm and self.manager_llm not in available_models:
-            self.manager_llm = None
-
-    def validate_planning_llm(self):
-        available_models = llm_providers_and_models()
-        if self.planning_llm and self.planning_llm not in available_models:
-            self.planning_llm = None
-
     def draw(self,expanded=False, buttons=True):
-        self.validate_manager_llm()
-        self.validate_planning_llm()
         name_key = f"name_{self.id}"
         process_key = f"process_{self.id}"
         verbose_key = f"verbose_{self.id}"
@@ -261,6 +254,7 @@ class MyCrew:
         planning_key = f"planning_{self.id}"
         planning_llm_key = f"planning_llm_{self.id}"
         cache_key = f"cache_{self.id}"
+        response_cache_key = f"response_cache_{self.id}"
         max_rpm_key = f"max_rpm_{self.id}"
         
         if self.edit:
@@ -273,13 +267,14 @@ class MyCrew:
                 available_task_ids = [task.id for task in available_tasks]
                 default_task_ids = [task.id for task in self.tasks if task.id in available_task_ids]             
                 st.multiselect("Tasks", options=available_task_ids, default=default_task_ids, format_func=lambda x: next(task.description for task in ss.tasks if task.id == x), key=tasks_key, on_change=self.update_tasks)                
-                st.selectbox("Manager LLM", options=["None"] + llm_providers_and_models(), index=0 if self.manager_llm is None else llm_providers_and_models().index(self.manager_llm) + 1, key=manager_llm_key, on_change=self.update_manager_llm, disabled=(self.process != Process.hierarchical))
+                st.selectbox("Manager LLM", options=["None"] + model_options(self.manager_llm), index=0 if self.manager_llm is None else model_options(self.manager_llm).index(self.manager_llm) + 1, key=manager_llm_key, on_change=self.update_manager_llm, disabled=(self.process != Process.hierarchical))
                 st.selectbox("Manager Agent", options=["None"] + [agent.role for agent in ss.agents], index=0 if self.manager_agent is None else [agent.role for agent in ss.agents].index(self.manager_agent.role) + 1, key=manager_agent_key, on_change=self.update_manager_agent, disabled=(self.process != Process.hierarchical))
                 st.checkbox("Verbose", value=self.verbose, key=verbose_key, on_change=self.update_verbose)
                 st.checkbox("Memory", value=self.memory, key=memory_key, on_change=self.update_memory)
                 st.checkbox("Cache", value=self.cache, key=cache_key, on_change=self.update_cache)
+                st.checkbox("Cache LLM responses", value=self.response_cache, key=response_cache_key, on_change=self.update_response_cache, help="Reuse stored LLM responses for identical calls, useful while iterating on a crew with the same inputs")
                 st.checkbox("Planning", value=self.planning, key=planning_key, on_change=self.update_planning)
-                st.selectbox("Planning LLM", options=["None"] + llm_providers_and_models(), index=0 if self.planning_llm is None else llm_providers_and_models().index(self.planning_llm) + 1, key=planning_llm_key, on_change=self.update_planning_llm, disabled=not self.planning)
+                st.selectbox("Planning LLM", options=["None"] + model_options(self.planning_llm), index=0 if self.planning_llm is None else model_options(self.planning_llm).index(self.planning_llm) + 1, key=planning_llm_key, on_change=self.update_planning_llm, disabled=not self.planning)
                 st.number_input("Max req/min", value=self.max_rpm, key=max_rpm_key, on_change=self.update_max_rpm)  
                 # for some reason knowledge sources for crews are not working, use the knowledge sources in the agents instead
                 # if 'knowledge_sources' in ss and len(ss.knowledge_sources) > 0:
@@ -312,6 +307,7 @@ class MyCrew:
                 st.markdown(f"**Verbose:** {self.verbose}")
                 st.markdown(f"**Memory:** {self.memory}")
                 st.markdown(f"**Cache:** {self.cache}")
+                st.markdown(f"**Cache LLM responses:** {self.response_cache}")
                 st.markdown(f"**Planning:** {self.planning}")
                 if self.planning and self.planning_llm:
                     st.markdown(f"**Planning LLM:** {self.planning_llm}")
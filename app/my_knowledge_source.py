@@ -4,6 +4,8 @@ from streamlit import session_state as ss
 import streamlit as st
 import os
 import db_utils
+import knowledge_cache
+import knowledge_ingest
 from pathlib import Path  # Using Path for cross-platform path handling
 
 class MyKnowledgeSource:
@@ -36,81 +38,15 @@ class MyKnowledgeSource:
         Tries to find the file at various possible locations.
         Returns the correct path if found, or None if not found.
         """
-        if not file_path:
-            return None
-        else: #simply check if the file exists in the folder knowledge
-            if Path("knowledge", file_path).exists():
-                return file_path
-            else:
-                return None
+        return knowledge_cache.find_knowledge_file(file_path)
 
     def get_crewai_knowledge_source(self):
-        # Import knowledge source classes based on type
-        if self.source_type == "string":
-            from crewai.knowledge.source.string_knowledge_source import StringKnowledgeSource
-            return StringKnowledgeSource(
-                content=self.content,
-                metadata=self.metadata,
-                chunk_size=self.chunk_size,
-                chunk_overlap=self.chunk_overlap
-            )
-        elif self.source_type == "docling":
-            from crewai.knowledge.source.crew_docling_source import CrewDoclingSource
-            return CrewDoclingSource(
-                file_paths=[self.source_path],
-                metadata=self.metadata,
-                chunk_size=self.chunk_size,
-                chunk_overlap=self.chunk_overlap
-            )
-        else:
-            # For file-based sources, find the actual file path
-            actual_path = self.find_file(self.source_path)
-            if not actual_path:
-                raise FileNotFoundError(f"File not found: {self.source_path}")
-                
-            # Import the appropriate class based on source type
-            if self.source_type == "text_file":
-                from crewai.knowledge.source.text_file_knowledge_source import TextFileKnowledgeSource
-                return TextFileKnowledgeSource(
-                    file_paths=[actual_path],
-                    metadata=self.metadata,
-                    chunk_size=self.chunk_size,
-                    chunk_overlap=self.chunk_overlap
-                )
-            elif self.source_type == "pdf":
-                from crewai.knowledge.source.pdf_knowledge_source import PDFKnowledgeSource               
-                return PDFKnowledgeSource(
-                    file_paths=[actual_path],
-                    metadata=self.metadata,
-                    chunk_size=self.chunk_size,
-                    chunk_overlap=self.chunk_overlap
-                )
-            elif self.source_type == "csv":
-                from crewai.knowledge.source.csv_knowledge_source import CSVKnowledgeSource
-                return CSVKnowledgeSource(
-                    file_paths=[actual_path],
-                    metadata=self.metadata,
-                    chunk_size=self.chunk_size,
-                    chunk_overlap=self.chunk_overlap
-                )
-            elif self.source_type == "excel":
-                from crewai.knowledge.source.excel_knowledge_source import ExcelKnowledgeSource
-                return ExcelKnowledgeSource(
-                    file_paths=[actual_path],
-                    metadata=self.metadata,
-                    chunk_size=self.chunk_size,
-                    chunk_overlap=self.chunk_overlap
-                )
-            elif self.source_type == "json":
-                from crewai.knowledge.source.json_knowledge_source import JSONKnowledgeSource
-                return JSONKnowledgeSource(
-                    file_paths=[actual_path],
-                    metadata=self.metadata,
-                    chunk_size=self.chunk_size,
-                    chunk_overlap=self.chunk_overlap
-                )
-            else:
-                raise ValueError(f"Unsupported knowledge source type: {self.source_type}")
+        # Chunks and embeddings are materialized once and reused while the source is unchanged
+        knowledge_ingest.wait_for(self.id)
+        return knowledge_cache.get_cached_source(self)
+
+    def build_crewai_source(self):
+        return knowledge_cache.build_crewai_source(self)
 
     def is_valid(self, show_warning=False):
         # Validate the knowledge source based on its type
@@ -138,6 +74,7 @@ class MyKnowledgeSource:
     def delete(self):
         ss.knowledge_sources = [ks for ks in ss.knowledge_sources if ks.id != self.id]
         db_utils.delete_knowledge_source(self.id)
+        knowledge_cache.remove_source(self.id)
 
     def draw(self, key=None):
         source_types = {
@@ -195,7 +132,7 @@ class MyKnowledgeSource:
                                 "pdf": "pdf", 
                                 "csv": "csv", 
                                 "excel": ["xlsx", "xls"], 
-                                "json": "json"
+                                "json": ["json", "jsonl"]
                             }
                             
                             file_type = upload_types.get(self.source_type)
@@ -273,6 +210,8 @@ class MyKnowledgeSource:
                     submitted = st.form_submit_button("Save Knowledge Source")
                     if submitted:
                         db_utils.save_knowledge_source(self)
+                        if self.is_valid():
+                            knowledge_ingest.submit(self)
                         self.set_editable(False)
         else:
             fix_columns_width()
@@ -289,6 +228,10 @@ class MyKnowledgeSource:
                 
                 st.markdown(f"**Chunk Size:** {self.chunk_size}")
                 st.markdown(f"**Chunk Overlap:** {self.chunk_overlap}")
+                ingest_status = knowledge_ingest.status(self.id)
+                if ingest_status:
+                    st.markdown(f"**Indexing:** {ingest_status}")
+                self.draw_stats()
                 
                 if self.metadata:
                     st.markdown("**Metadata:**")
@@ -303,6 +246,19 @@ class MyKnowledgeSource:
                 
                 self.is_valid(show_warning=True)
 
+    def draw_stats(self):
+        stats = knowledge_cache.get_stats(self.id)
+        if not stats:
+            return
+        if stats.get('size_bytes') is not None:
+            st.markdown(f"**Size:** {stats['size_bytes'] / 1024:,.1f} KB")
+        if stats.get('unit_count') is not None:
+            st.markdown(f"**{stats['unit'].capitalize()}:** {stats['unit_count']:,}")
+        st.markdown(f"**Chunks:** {stats['chunk_count']:,}")
+        st.markdown(f"**Estimated Embedding Tokens:** {stats['estimated_tokens']:,}")
+        if stats.get('last_indexed'):
+            st.markdown(f"**Last Indexed:** {stats['last_indexed'][:19].replace('T', ' ')}")
+
     def set_editable(self, edit):
         self.edit = edit
         db_utils.save_knowledge_source(self)
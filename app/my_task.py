@@ -27,7 +27,7 @@ class MyTask:
     def edit(self, value):
         ss[self.edit_key] = value
 
-    def get_crewai_task(self, context_from_async_tasks=None, context_from_sync_tasks=None) -> Task:
+    def get_crewai_task(self, context_from_async_tasks=None, context_from_sync_tasks=None, run_context=None) -> Task:
         context = []
         if context_from_async_tasks:
             context.extend(context_from_async_tasks)
@@ -35,9 +35,9 @@ class MyTask:
             context.extend(context_from_sync_tasks)
         
         if context:
-            return Task(description=self.description, expected_output=self.expected_output, async_execution=self.async_execution, agent=self.agent.get_crewai_agent(), context=context)
+            return Task(description=self.description, expected_output=self.expected_output, async_execution=self.async_execution, agent=self.agent.get_crewai_agent(run_context=run_context), context=context)
         else:
-            return Task(description=self.description, expected_output=self.expected_output, async_execution=self.async_execution, agent=self.agent.get_crewai_agent())
+            return Task(description=self.description, expected_output=self.expected_output, async_execution=self.async_execution, agent=self.agent.get_crewai_agent(run_context=run_context))
 
     def delete(self):
         ss.tasks = [task for task in ss.tasks if task.id != self.id]
@@ -1,34 +1,114 @@
-import streamlit as st
+from __future__ import annotations
+import importlib
+import json
 import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING
 from utils import rnd_id
-from crewai_tools import CodeInterpreterTool,ScrapeElementFromWebsiteTool,TXTSearchTool,SeleniumScrapingTool,PDFSearchTool,MDXSearchTool,JSONSearchTool,GithubSearchTool,EXASearchTool,DOCXSearchTool,CSVSearchTool,ScrapeWebsiteTool, FileReadTool, DirectorySearchTool, DirectoryReadTool, CodeDocsSearchTool, YoutubeVideoSearchTool,SerperDevTool,YoutubeChannelSearchTool,WebsiteSearchTool
-from tools.CSVSearchToolEnhanced import CSVSearchToolEnhanced
-from tools.CustomApiTool import CustomApiTool
-from tools.CustomCodeInterpreterTool import CustomCodeInterpreterTool
-from tools.CustomFileWriteTool import CustomFileWriteTool
-from tools.ScrapeWebsiteToolEnhanced import ScrapeWebsiteToolEnhanced
-from tools.ScrapflyScrapeWebsiteTool import ScrapflyScrapeWebsiteTool
-
-from tools.DuckDuckGoSearchTool import DuckDuckGoSearchTool
-
-from langchain_community.tools import YahooFinanceNewsTool
+from tool_cache import TOOL_CACHE_ENABLED, enable_result_cache
+
+if TYPE_CHECKING:
+    from crewai_tools import CodeInterpreterTool,ScrapeElementFromWebsiteTool,TXTSearchTool,SeleniumScrapingTool,PDFSearchTool,MDXSearchTool,JSONSearchTool,GithubSearchTool,EXASearchTool,DOCXSearchTool,CSVSearchTool,ScrapeWebsiteTool, FileReadTool, DirectorySearchTool, DirectoryReadTool, CodeDocsSearchTool, YoutubeVideoSearchTool,SerperDevTool,YoutubeChannelSearchTool,WebsiteSearchTool
+    from tools.CSVSearchToolEnhanced import CSVSearchToolEnhanced
+    from tools.CustomApiTool import CustomApiTool
+    from tools.CustomCodeInterpreterTool import CustomCodeInterpreterTool
+    from tools.CustomFileWriteTool import CustomFileWriteTool
+    from tools.ScrapeWebsiteToolEnhanced import ScrapeWebsiteToolEnhanced
+    from tools.BatchScrapeWebsiteTool import BatchScrapeWebsiteTool
+    from tools.CrawlWebsiteTool import CrawlWebsiteTool
+    from tools.ScrapflyScrapeWebsiteTool import ScrapflyScrapeWebsiteTool
+    from tools.DuckDuckGoSearchTool import DuckDuckGoSearchTool
+    from langchain_community.tools import YahooFinanceNewsTool
+
+# Created crewAI tools are pooled per class and parameters and handed out as copies,
+# so RAG tools build their embeddings and add their sources once per process.
+TOOL_POOL_SIZE = int(os.getenv('TOOL_POOL_SIZE', 64))
+_tool_pool = OrderedDict()
+_tool_pool_lock = threading.Lock()
+_tool_create_locks = {}
+
+def clear_tool_pool():
+    with _tool_pool_lock:
+        _tool_pool.clear()
+        _tool_create_locks.clear()
+
+@lru_cache(maxsize=None)
+def import_tool_class(module_path, class_name):
+    """Import a crewAI tool class on first use, the tool libraries are slow to import."""
+    return getattr(importlib.import_module(module_path), class_name)
 
 class MyTool:
-    def __init__(self, tool_id, name, description, parameters, **kwargs):
+    # Module and class of the crewAI tool, imported only when the tool is created
+    tool_module = None
+    tool_class_name = None
+    # Static metadata, the tool catalog and the parameter forms are drawn from it
+    # without creating instances. Parameter types: text (default), secret, bool, int
+    name = None
+    description = None
+    parameters_metadata = {}
+    # Seconds the results are kept in the persistent tool cache, None for tools whose
+    # results depend on local files or have side effects
+    cache_ttl = None
+
+    def __init__(self, tool_id, **kwargs):
         self.tool_id = tool_id or rnd_id()
-        self.name = name
-        self.description = description
         self.parameters = kwargs
-        self.parameters_metadata = parameters
+        self._crewai_tool = None
 
     def create_tool(self):
         pass
 
+    def load_tool_class(self):
+        return import_tool_class(self.tool_module, self.tool_class_name)
+
+    def pool_key(self):
+        return (type(self).__name__, json.dumps(self.parameters, sort_keys=True, default=str))
+
+    def get_crewai_tool(self):
+        """A crewAI tool for the current parameters.
+
+        The pooled tool is created once, every caller gets its own shallow copy: usage
+        counts and attributes set by _run stay per agent, the expensive parts (RAG
+        adapters, embeddings, clients) are shared.
+        """
+        tool = self._crewai_tool
+        if tool is None:
+            tool = self._pooled_tool()
+            self._crewai_tool = tool
+        tool = tool.model_copy()
+        if TOOL_CACHE_ENABLED and self.cache_ttl:
+            enable_result_cache(tool, self.name, self.parameters, self.cache_ttl)
+        return tool
+
+    def _pooled_tool(self):
+        key = self.pool_key()
+        with _tool_pool_lock:
+            tool = _tool_pool.get(key)
+            if tool is not None:
+                _tool_pool.move_to_end(key)
+            create_lock = _tool_create_locks.setdefault(key, threading.Lock())
+        if tool is None:
+            # one thread creates the tool, the others wait and take it from the pool
+            with create_lock:
+                with _tool_pool_lock:
+                    tool = _tool_pool.get(key)
+                if tool is None:
+                    tool = self.create_tool()
+                    with _tool_pool_lock:
+                        _tool_pool[key] = tool
+                        while len(_tool_pool) > TOOL_POOL_SIZE:
+                            evicted, _ = _tool_pool.popitem(last=False)
+                            _tool_create_locks.pop(evicted, None)
+        return tool
+
     def get_parameters(self):
         return self.parameters
 
     def set_parameters(self, **kwargs):
         self.parameters.update(kwargs)
+        self._crewai_tool = None
 
     def get_parameter_names(self):
         return list(self.parameters_metadata.keys())
@@ -36,7 +116,11 @@ class MyTool:
     def is_parameter_mandatory(self, param_name):
         return self.parameters_metadata.get(param_name, {}).get('mandatory', False)
 
+    def get_parameter_type(self, param_name):
+        return self.parameters_metadata.get(param_name, {}).get('type', 'text')
+
     def is_valid(self,show_warning=False):
+        import streamlit as st
         for param_name, metadata in self.parameters_metadata.items():
             if metadata['mandatory'] and not self.parameters.get(param_name):
                 if show_warning:
@@ -45,196 +129,297 @@ class MyTool:
         return True
 
 class MyScrapeWebsiteTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "ScrapeWebsiteTool"
+
+    name = 'ScrapeWebsiteTool'
+    description = "A tool that can be used to read website content."
+    parameters_metadata = {
+        'website_url': {'mandatory': False}
+    }
+    cache_ttl = 24 * 3600
+
     def __init__(self, tool_id=None, website_url=None):
-        parameters = {
-            'website_url': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'ScrapeWebsiteTool', "A tool that can be used to read website content.", parameters, website_url=website_url)
+        super().__init__(tool_id, website_url=website_url)
 
     def create_tool(self) -> ScrapeWebsiteTool:
-        return ScrapeWebsiteTool(self.parameters.get('website_url') if self.parameters.get('website_url') else None)
+        return self.load_tool_class()(self.parameters.get('website_url') if self.parameters.get('website_url') else None)
 
 class MyFileReadTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "FileReadTool"
+
+    name = 'FileReadTool'
+    description = "A tool that can be used to read a file's content."
+    parameters_metadata = {
+        'file_path': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None, file_path=None):
-        parameters = {
-            'file_path': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'FileReadTool', "A tool that can be used to read a file's content.", parameters, file_path=file_path)
+        super().__init__(tool_id, file_path=file_path)
 
     def create_tool(self) -> FileReadTool:
-        return FileReadTool(self.parameters.get('file_path') if self.parameters.get('file_path') else None)
+        return self.load_tool_class()(self.parameters.get('file_path') if self.parameters.get('file_path') else None)
 
 class MyDirectorySearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "DirectorySearchTool"
+
+    name = 'DirectorySearchTool'
+    description = "A tool that can be used to semantic search a query from a directory's content."
+    parameters_metadata = {
+        'directory': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None, directory=None):
-        parameters = {
-            'directory': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'DirectorySearchTool', "A tool that can be used to semantic search a query from a directory's content.", parameters, directory_path=directory)
+        super().__init__(tool_id, directory_path=directory)
 
     def create_tool(self) -> DirectorySearchTool:
-        return DirectorySearchTool(self.parameters.get('directory') if self.parameters.get('directory') else None)
+        return self.load_tool_class()(self.parameters.get('directory') if self.parameters.get('directory') else None)
 
 class MyDirectoryReadTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "DirectoryReadTool"
+
+    name = 'DirectoryReadTool'
+    description = "Use the tool to list the contents of the specified directory"
+    parameters_metadata = {
+        'directory_contents': {'mandatory': True}
+    }
+
     def __init__(self, tool_id=None, directory_contents=None):
-        parameters = {
-            'directory_contents': {'mandatory': True}
-        }
-        super().__init__(tool_id, 'DirectoryReadTool', "Use the tool to list the contents of the specified directory", parameters, directory_contents=directory_contents)
+        super().__init__(tool_id, directory_contents=directory_contents)
 
     def create_tool(self) -> DirectoryReadTool:
-        return DirectoryReadTool(self.parameters.get('directory_contents'))
+        return self.load_tool_class()(self.parameters.get('directory_contents'))
 
 class MyCodeDocsSearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "CodeDocsSearchTool"
+
+    name = 'CodeDocsSearchTool'
+    description = "A tool that can be used to search through code documentation."
+    parameters_metadata = {
+        'code_docs': {'mandatory': False}
+    }
+    cache_ttl = 24 * 3600
+
     def __init__(self, tool_id=None, code_docs=None):
-        parameters = {
-            'code_docs': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'CodeDocsSearchTool', "A tool that can be used to search through code documentation.", parameters, code_docs=code_docs)
+        super().__init__(tool_id, code_docs=code_docs)
 
     def create_tool(self) -> CodeDocsSearchTool:
-        return CodeDocsSearchTool(self.parameters.get('code_docs') if self.parameters.get('code_docs') else None)
+        return self.load_tool_class()(self.parameters.get('code_docs') if self.parameters.get('code_docs') else None)
 
 class MyYoutubeVideoSearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "YoutubeVideoSearchTool"
+
+    name = 'YoutubeVideoSearchTool'
+    description = "A tool that can be used to semantic search a query from a Youtube Video content."
+    parameters_metadata = {
+        'youtube_video_url': {'mandatory': False}
+    }
+    cache_ttl = 24 * 3600
+
     def __init__(self, tool_id=None, youtube_video_url=None):
-        parameters = {
-            'youtube_video_url': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'YoutubeVideoSearchTool', "A tool that can be used to semantic search a query from a Youtube Video content.", parameters, youtube_video_url=youtube_video_url)
+        super().__init__(tool_id, youtube_video_url=youtube_video_url)
 
     def create_tool(self) -> YoutubeVideoSearchTool:
-        return YoutubeVideoSearchTool(self.parameters.get('youtube_video_url') if self.parameters.get('youtube_video_url') else None)
+        return self.load_tool_class()(self.parameters.get('youtube_video_url') if self.parameters.get('youtube_video_url') else None)
 
 class MySerperDevTool(MyTool):
-    def __init__(self, tool_id=None, SERPER_API_KEY=None):
-        parameters = {
-            'SERPER_API_KEY': {'mandatory': True}
-        }
+    tool_module = "crewai_tools"
+    tool_class_name = "SerperDevTool"
+
+    name = 'SerperDevTool'
+    description = "A tool that can be used to search the internet with a search_query"
+    parameters_metadata = {
+        'SERPER_API_KEY': {'mandatory': True, 'type': 'secret'}
+    }
+    cache_ttl = 3600
 
-        super().__init__(tool_id, 'SerperDevTool', "A tool that can be used to search the internet with a search_query", parameters)
+    def __init__(self, tool_id=None, SERPER_API_KEY=None):
+        super().__init__(tool_id)
 
     def create_tool(self) -> SerperDevTool:
         os.environ['SERPER_API_KEY'] = self.parameters.get('SERPER_API_KEY')
-        return SerperDevTool()
+        return self.load_tool_class()()
     
 class MyYoutubeChannelSearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "YoutubeChannelSearchTool"
+
+    name = 'YoutubeChannelSearchTool'
+    description = "A tool that can be used to semantic search a query from a Youtube Channels content. Channel can be added as @channel"
+    parameters_metadata = {
+        'youtube_channel_handle': {'mandatory': False}
+    }
+    cache_ttl = 24 * 3600
+
     def __init__(self, tool_id=None, youtube_channel_handle=None):
-        parameters = {
-            'youtube_channel_handle': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'YoutubeChannelSearchTool', "A tool that can be used to semantic search a query from a Youtube Channels content. Channel can be added as @channel", parameters, youtube_channel_handle=youtube_channel_handle)
+        super().__init__(tool_id, youtube_channel_handle=youtube_channel_handle)
 
     def create_tool(self) -> YoutubeChannelSearchTool:
-        return YoutubeChannelSearchTool(self.parameters.get('youtube_channel_handle') if self.parameters.get('youtube_channel_handle') else None)
+        return self.load_tool_class()(self.parameters.get('youtube_channel_handle') if self.parameters.get('youtube_channel_handle') else None)
 
 class MyWebsiteSearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "WebsiteSearchTool"
+
+    name = 'WebsiteSearchTool'
+    description = "A tool that can be used to semantic search a query from a specific URL content."
+    parameters_metadata = {
+        'website': {'mandatory': False}
+    }
+    cache_ttl = 24 * 3600
+
     def __init__(self, tool_id=None, website=None):
-        parameters = {
-            'website': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'WebsiteSearchTool', "A tool that can be used to semantic search a query from a specific URL content.", parameters, website=website)
+        super().__init__(tool_id, website=website)
 
     def create_tool(self) -> WebsiteSearchTool:
-        return WebsiteSearchTool(self.parameters.get('website') if self.parameters.get('website') else None)
+        return self.load_tool_class()(self.parameters.get('website') if self.parameters.get('website') else None)
    
 class MyCSVSearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "CSVSearchTool"
+
+    name = 'CSVSearchTool'
+    description = "A tool that can be used to semantic search a query from a CSV's content."
+    parameters_metadata = {
+        'csv': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None, csv=None):
-        parameters = {
-            'csv': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'CSVSearchTool', "A tool that can be used to semantic search a query from a CSV's content.", parameters, csv=csv)
+        super().__init__(tool_id, csv=csv)
 
     def create_tool(self) -> CSVSearchTool:
-        return CSVSearchTool(csv=self.parameters.get('csv') if self.parameters.get('csv') else None)
+        return self.load_tool_class()(csv=self.parameters.get('csv') if self.parameters.get('csv') else None)
 
 class MyDocxSearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "DOCXSearchTool"
+
+    name = 'DOCXSearchTool'
+    description = "A tool that can be used to semantic search a query from a DOCX's content."
+    parameters_metadata = {
+        'docx': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None, docx=None):
-        parameters = {
-            'docx': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'DOCXSearchTool', "A tool that can be used to semantic search a query from a DOCX's content.", parameters, docx=docx)
+        super().__init__(tool_id, docx=docx)
 
     def create_tool(self) -> DOCXSearchTool:
-        return DOCXSearchTool(docx=self.parameters.get('docx') if self.parameters.get('docx') else None)
+        return self.load_tool_class()(docx=self.parameters.get('docx') if self.parameters.get('docx') else None)
 
 class MyEXASearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "EXASearchTool"
+
+    name = 'EXASearchTool'
+    description = "A tool that can be used to search the internet from a search_query"
+    parameters_metadata = {
+        'EXA_API_KEY': {'mandatory': True, 'type': 'secret'}
+    }
+    cache_ttl = 3600
+
     def __init__(self, tool_id=None, EXA_API_KEY=None):
-        parameters = {
-            'EXA_API_KEY': {'mandatory': True}
-        }
-        super().__init__(tool_id, 'EXASearchTool', "A tool that can be used to search the internet from a search_query", parameters, EXA_API_KEY=EXA_API_KEY)
+        super().__init__(tool_id, EXA_API_KEY=EXA_API_KEY)
 
     def create_tool(self) -> EXASearchTool:
         os.environ['EXA_API_KEY'] = self.parameters.get('EXA_API_KEY')
-        return EXASearchTool()
+        return self.load_tool_class()()
 
 class MyGithubSearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "GithubSearchTool"
+
+    name = 'GithubSearchTool'
+    description = "A tool that can be used to semantic search a query from a Github repository's content. Valid content_types: code,repo,pr,issue (comma sepparated)"
+    parameters_metadata = {
+        'github_repo': {'mandatory': False},
+        'gh_token': {'mandatory': True, 'type': 'secret'},
+        'content_types': {'mandatory': False}
+    }
+    cache_ttl = 24 * 3600
+
     def __init__(self, tool_id=None, github_repo=None, gh_token=None, content_types=None):
-        parameters = {
-            'github_repo': {'mandatory': False},
-            'gh_token': {'mandatory': True},
-            'content_types': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'GithubSearchTool', "A tool that can be used to semantic search a query from a Github repository's content. Valid content_types: code,repo,pr,issue (comma sepparated)", parameters, github_repo=github_repo, gh_token=gh_token, content_types=content_types)
+        super().__init__(tool_id, github_repo=github_repo, gh_token=gh_token, content_types=content_types)
 
     def create_tool(self) -> GithubSearchTool:
-        return GithubSearchTool(
+        return self.load_tool_class()(
             github_repo=self.parameters.get('github_repo') if self.parameters.get('github_repo') else None,
             gh_token=self.parameters.get('gh_token'),
             content_types=self.parameters.get('search_query').split(",") if self.parameters.get('search_query') else ["code", "repo", "pr", "issue"]
         )
 
 class MyJSONSearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "JSONSearchTool"
+
+    name = 'JSONSearchTool'
+    description = "A tool that can be used to semantic search a query from a JSON's content."
+    parameters_metadata = {
+        'json_path': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None, json_path=None):
-        parameters = {
-            'json_path': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'JSONSearchTool', "A tool that can be used to semantic search a query from a JSON's content.", parameters, json_path=json_path)
+        super().__init__(tool_id, json_path=json_path)
 
     def create_tool(self) -> JSONSearchTool:
-        return JSONSearchTool(json_path=self.parameters.get('json_path') if self.parameters.get('json_path') else None)
+        return self.load_tool_class()(json_path=self.parameters.get('json_path') if self.parameters.get('json_path') else None)
 
 class MyMDXSearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "MDXSearchTool"
+
+    name = 'MDXSearchTool'
+    description = "A tool that can be used to semantic search a query from a MDX's content."
+    parameters_metadata = {
+        'mdx': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None, mdx=None):
-        parameters = {
-            'mdx': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'MDXSearchTool', "A tool that can be used to semantic search a query from a MDX's content.", parameters, mdx=mdx)
+        super().__init__(tool_id, mdx=mdx)
 
     def create_tool(self) -> MDXSearchTool:
-        return MDXSearchTool(mdx=self.parameters.get('mdx') if self.parameters.get('mdx') else None)
+        return self.load_tool_class()(mdx=self.parameters.get('mdx') if self.parameters.get('mdx') else None)
     
 class MyPDFSearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "PDFSearchTool"
+
+    name = 'PDFSearchTool'
+    description = "A tool that can be used to semantic search a query from a PDF's content."
+    parameters_metadata = {
+        'pdf': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None, pdf=None):
-        parameters = {
-            'pdf': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'PDFSearchTool', "A tool that can be used to semantic search a query from a PDF's content.", parameters, pdf=pdf)
+        super().__init__(tool_id, pdf=pdf)
 
     def create_tool(self) -> PDFSearchTool:
-        return PDFSearchTool(self.parameters.get('pdf') if self.parameters.get('pdf') else None)
+        return self.load_tool_class()(self.parameters.get('pdf') if self.parameters.get('pdf') else None)
 
 class MySeleniumScrapingTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "SeleniumScrapingTool"
+
+    name = 'SeleniumScrapingTool'
+    description = r"A tool that can be used to read a specific part of website content. CSS elements are separated by comma, cookies are in format {key1\:value1},{key2\:value2}"
+    parameters_metadata = {
+        'website_url': {'mandatory': False},
+        'css_element': {'mandatory': False},
+        'cookie': {'mandatory': False},
+        'wait_time': {'mandatory': False, 'type': 'int'}
+    }
+    cache_ttl = 24 * 3600
+
     def __init__(self, tool_id=None, website_url=None, css_element=None, cookie=None, wait_time=None):
-        parameters = {
-            'website_url': {'mandatory': False},
-            'css_element': {'mandatory': False},
-            'cookie': {'mandatory': False},
-            'wait_time': {'mandatory': False}
-        }
-        super().__init__(
-            tool_id, 
-            'SeleniumScrapingTool', 
-            r"A tool that can be used to read a specific part of website content. CSS elements are separated by comma, cookies are in format {key1\:value1},{key2\:value2}", 
-            parameters, 
-            website_url=website_url, 
-            css_element=css_element, 
-            cookie=cookie, 
-            wait_time=wait_time
-)
+        super().__init__(tool_id, website_url=website_url, css_element=css_element, cookie=cookie, wait_time=wait_time)
     def create_tool(self) -> SeleniumScrapingTool:
         cookie_arrayofdicts = [{k: v} for k, v in (item.strip('{}').split(':') for item in self.parameters.get('cookie', '').split(','))] if self.parameters.get('cookie') else None
 
-        return SeleniumScrapingTool(
+        return self.load_tool_class()(
             website_url=self.parameters.get('website_url') if self.parameters.get('website_url') else None,
             css_element=self.parameters.get('css_element').split(',') if self.parameters.get('css_element') else None,
             cookie=cookie_arrayofdicts,
@@ -242,147 +427,274 @@ class MySeleniumScrapingTool(MyTool):
         )
 
 class MyTXTSearchTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "TXTSearchTool"
+
+    name = 'TXTSearchTool'
+    description = "A tool that can be used to semantic search a query from a TXT's content."
+    parameters_metadata = {
+        'txt': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None, txt=None):
-        parameters = {
-            'txt': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'TXTSearchTool', "A tool that can be used to semantic search a query from a TXT's content.", parameters, txt=txt)
+        super().__init__(tool_id, txt=txt)
 
     def create_tool(self) -> TXTSearchTool:
-        return TXTSearchTool(self.parameters.get('txt'))
+        return self.load_tool_class()(self.parameters.get('txt'))
 
 class MyScrapeElementFromWebsiteTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "ScrapeElementFromWebsiteTool"
+
+    name = 'ScrapeElementFromWebsiteTool'
+    description = r"A tool that can be used to read a specific part of website content. CSS elements are separated by comma, cookies are in format {key1\:value1},{key2\:value2}"
+    parameters_metadata = {
+        'website_url': {'mandatory': False},
+        'css_element': {'mandatory': False},
+        'cookie': {'mandatory': False}
+    }
+    cache_ttl = 24 * 3600
+
     def __init__(self, tool_id=None, website_url=None, css_element=None, cookie=None):
-        parameters = {
-            'website_url': {'mandatory': False},
-            'css_element': {'mandatory': False},
-            'cookie': {'mandatory': False}
-        }
-        super().__init__(
-            tool_id, 
-            'ScrapeElementFromWebsiteTool', 
-            r"A tool that can be used to read a specific part of website content. CSS elements are separated by comma, cookies are in format {key1\:value1},{key2\:value2}", 
-            parameters, 
-            website_url=website_url, 
-            css_element=css_element, 
-            cookie=cookie
-        )
+        super().__init__(tool_id, website_url=website_url, css_element=css_element, cookie=cookie)
 
     def create_tool(self) -> ScrapeElementFromWebsiteTool:
         cookie_arrayofdicts = [{k: v} for k, v in (item.strip('{}').split(':') for item in self.parameters.get('cookie', '').split(','))] if self.parameters.get('cookie') else None
-        return ScrapeElementFromWebsiteTool(
+        return self.load_tool_class()(
             website_url=self.parameters.get('website_url') if self.parameters.get('website_url') else None,
             css_element=self.parameters.get('css_element').split(",") if self.parameters.get('css_element') else None,
             cookie=cookie_arrayofdicts
         )
     
 class MyYahooFinanceNewsTool(MyTool):
+    tool_module = "langchain_community.tools"
+    tool_class_name = "YahooFinanceNewsTool"
+
+    name = 'YahooFinanceNewsTool'
+    description = "A tool that can be used to search Yahoo Finance News."
+    parameters_metadata = {}
+    cache_ttl = 15 * 60
+
     def __init__(self, tool_id=None):
-        parameters = {}
-        super().__init__(tool_id, 'YahooFinanceNewsTool', "A tool that can be used to search Yahoo Finance News.", parameters)
+        super().__init__(tool_id)
 
     def create_tool(self) -> YahooFinanceNewsTool:
-        return YahooFinanceNewsTool()
+        return self.load_tool_class()()
     
 class MyCustomApiTool(MyTool):
+    tool_module = "tools.CustomApiTool"
+    tool_class_name = "CustomApiTool"
+
+    name = 'CustomApiTool'
+    description = "A tool that can be used to make API calls with customizable parameters."
+    parameters_metadata = {
+        'base_url': {'mandatory': False},
+        'headers': {'mandatory': False},
+        'query_params': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None, base_url=None, headers=None, query_params=None):
-        parameters = {
-            'base_url': {'mandatory': False},
-            'headers': {'mandatory': False},
-            'query_params': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'CustomApiTool', "A tool that can be used to make API calls with customizable parameters.", parameters, base_url=base_url, headers=headers, query_params=query_params)
+        super().__init__(tool_id, base_url=base_url, headers=headers, query_params=query_params)
 
     def create_tool(self) -> CustomApiTool:
-        return CustomApiTool(
+        return self.load_tool_class()(
             base_url=self.parameters.get('base_url') if self.parameters.get('base_url') else None,
             headers=eval(self.parameters.get('headers')) if self.parameters.get('headers') else None,
             query_params=self.parameters.get('query_params') if self.parameters.get('query_params') else None
         )
 
 class MyCustomFileWriteTool(MyTool):
+    tool_module = "tools.CustomFileWriteTool"
+    tool_class_name = "CustomFileWriteTool"
+
+    name = 'CustomFileWriteTool'
+    description = "A tool that can be used to write a file to a specific folder."
+    parameters_metadata = {
+        'base_folder': {'mandatory': True},
+        'filename': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None, base_folder=None, filename=None):
-        parameters = {
-            'base_folder': {'mandatory': True},
-            'filename': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'CustomFileWriteTool', "A tool that can be used to write a file to a specific folder.", parameters,base_folder=base_folder, filename=filename)
+        super().__init__(tool_id, base_folder=base_folder, filename=filename)
 
     def create_tool(self) -> CustomFileWriteTool:
-        return CustomFileWriteTool(
+        return self.load_tool_class()(
             base_folder=self.parameters.get('base_folder') if self.parameters.get('base_folder') else "workspace",
             filename=self.parameters.get('filename') if self.parameters.get('filename') else None
         )
 
 
 class MyDuckDuckGoSearchTool(MyTool):
+    tool_module = "tools.DuckDuckGoSearchTool"
+    tool_class_name = "DuckDuckGoSearchTool"
+
+    name = 'DuckDuckGoSearchTool'
+    description = "A tool to search the web using DuckDuckGo engine."
+    parameters_metadata = {}
+    cache_ttl = 3600
+
     def __init__(self, tool_id=None):
-        parameters = {}
-        super().__init__(tool_id, 'DuckDuckGoSearchTool', "A tool to search the web using DuckDuckGo engine.", parameters)
+        super().__init__(tool_id)
 
     def create_tool(self) -> DuckDuckGoSearchTool:
-        return DuckDuckGoSearchTool()
+        return self.load_tool_class()()
 
 
 class MyCodeInterpreterTool(MyTool):
+    tool_module = "crewai_tools"
+    tool_class_name = "CodeInterpreterTool"
+
+    name = 'CodeInterpreterTool'
+    description = "This tool is used to give the Agent the ability to run code (Python3) from the code generated by the Agent itself. The code is executed in a sandboxed environment, so it is safe to run any code. Docker required."
+    parameters_metadata = {}
+
     def __init__(self, tool_id=None):
-        parameters = {}
-        super().__init__(tool_id, 'CodeInterpreterTool', "This tool is used to give the Agent the ability to run code (Python3) from the code generated by the Agent itself. The code is executed in a sandboxed environment, so it is safe to run any code. Docker required.", parameters)
+        super().__init__(tool_id)
 
     def create_tool(self) -> CodeInterpreterTool:
-        return CodeInterpreterTool()
+        return self.load_tool_class()()
     
 
 class MyCustomCodeInterpreterTool(MyTool):
+    tool_module = "tools.CustomCodeInterpreterTool"
+    tool_class_name = "CustomCodeInterpreterTool"
+
+    name = 'CustomCodeInterpreterTool'
+    description = "This tool is used to give the Agent the ability to run code (Python3) from the code generated by the Agent itself. The code is executed in a sandboxed environment, so it is safe to run any code. Worskpace folder is shared. Docker required."
+    parameters_metadata = {
+        'workspace_dir': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None,workspace_dir=None):
-        parameters = {
-            'workspace_dir': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'CustomCodeInterpreterTool', "This tool is used to give the Agent the ability to run code (Python3) from the code generated by the Agent itself. The code is executed in a sandboxed environment, so it is safe to run any code. Worskpace folder is shared. Docker required.", parameters, workspace_dir=workspace_dir)
+        super().__init__(tool_id, workspace_dir=workspace_dir)
 
     def create_tool(self) -> CustomCodeInterpreterTool:
-        return CustomCodeInterpreterTool(workspace_dir=self.parameters.get('workspace_dir') if self.parameters.get('workspace_dir') else "workspace")
+        return self.load_tool_class()(workspace_dir=self.parameters.get('workspace_dir') if self.parameters.get('workspace_dir') else "workspace")
 
 class MyCSVSearchToolEnhanced(MyTool):
+    tool_module = "tools.CSVSearchToolEnhanced"
+    tool_class_name = "CSVSearchToolEnhanced"
+
+    name = 'CSVSearchToolEnhanced'
+    description = "A tool that can be used to semantic search a query from a CSV's content."
+    parameters_metadata = {
+        'csv': {'mandatory': False}
+    }
+
     def __init__(self, tool_id=None, csv=None):
-        parameters = {
-            'csv': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'CSVSearchToolEnhanced', "A tool that can be used to semantic search a query from a CSV's content.", parameters, csv=csv)
+        super().__init__(tool_id, csv=csv)
 
     def create_tool(self) -> CSVSearchToolEnhanced:
-        return CSVSearchToolEnhanced(csv=self.parameters.get('csv') if self.parameters.get('csv') else None)
+        return self.load_tool_class()(csv=self.parameters.get('csv') if self.parameters.get('csv') else None)
     
 class MyScrapeWebsiteToolEnhanced(MyTool):
-    def __init__(self, tool_id=None, website_url=None, cookies=None, show_urls=None, css_selector=None):
-        parameters = {
-            'website_url': {'mandatory': False},
-            'cookies': {'mandatory': False},
-            'show_urls': {'mandatory': False},
-            'css_selector': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'ScrapeWebsiteToolEnhanced', "An enhanced tool that can be used to read website content.", parameters, website_url=website_url, cookies=cookies, show_urls=show_urls, css_selector=css_selector)
+    tool_module = "tools.ScrapeWebsiteToolEnhanced"
+    tool_class_name = "ScrapeWebsiteToolEnhanced"
+
+    name = 'ScrapeWebsiteToolEnhanced'
+    description = "An enhanced tool that can be used to read website content."
+    parameters_metadata = {
+        'website_url': {'mandatory': False},
+        'cookies': {'mandatory': False},
+        'show_urls': {'mandatory': False, 'type': 'bool'},
+        'css_selector': {'mandatory': False},
+        'main_content': {'mandatory': False, 'type': 'bool'},
+        'max_tokens': {'mandatory': False, 'type': 'int'}
+    }
+    cache_ttl = 24 * 3600
+
+    def __init__(self, tool_id=None, website_url=None, cookies=None, show_urls=None, css_selector=None, main_content=None, max_tokens=None):
+        super().__init__(tool_id, website_url=website_url, cookies=cookies, show_urls=show_urls, css_selector=css_selector, main_content=main_content, max_tokens=max_tokens)
 
     def create_tool(self) -> ScrapeWebsiteToolEnhanced:
-        return ScrapeWebsiteToolEnhanced(
+        return self.load_tool_class()(
             website_url=self.parameters.get('website_url') if self.parameters.get('website_url') else None,
             cookies=self.parameters.get('cookies') if self.parameters.get('cookies') else None,
             show_urls=self.parameters.get('show_urls') if self.parameters.get('show_urls') else False,
-            css_selector=self.parameters.get('css_selector') if self.parameters.get('css_selector') else None
+            css_selector=self.parameters.get('css_selector') if self.parameters.get('css_selector') else None,
+            main_content=self.parameters.get('main_content') if self.parameters.get('main_content') else False,
+            **({'max_tokens': int(self.parameters['max_tokens'])} if self.parameters.get('max_tokens') else {})
+        )
+
+class MyBatchScrapeWebsiteTool(MyTool):
+    tool_module = "tools.BatchScrapeWebsiteTool"
+    tool_class_name = "BatchScrapeWebsiteTool"
+
+    name = 'BatchScrapeWebsiteTool'
+    description = "A tool that reads several websites concurrently in one call and returns their combined, size-limited content."
+    parameters_metadata = {
+        'cookies': {'mandatory': False},
+        'show_urls': {'mandatory': False, 'type': 'bool'},
+        'css_selector': {'mandatory': False},
+        'main_content': {'mandatory': False, 'type': 'bool'},
+        'max_tokens': {'mandatory': False, 'type': 'int'}
+    }
+    cache_ttl = 24 * 3600
+
+    def __init__(self, tool_id=None, cookies=None, show_urls=None, css_selector=None, main_content=None, max_tokens=None):
+        super().__init__(tool_id, cookies=cookies, show_urls=show_urls, css_selector=css_selector, main_content=main_content, max_tokens=max_tokens)
+
+    def create_tool(self) -> BatchScrapeWebsiteTool:
+        return self.load_tool_class()(
+            cookies=self.parameters.get('cookies') if self.parameters.get('cookies') else None,
+            show_urls=self.parameters.get('show_urls') if self.parameters.get('show_urls') else False,
+            css_selector=self.parameters.get('css_selector') if self.parameters.get('css_selector') else None,
+            main_content=self.parameters.get('main_content') if self.parameters.get('main_content') else False,
+            **({'max_tokens': int(self.parameters['max_tokens'])} if self.parameters.get('max_tokens') else {})
+        )
+
+class MyCrawlWebsiteTool(MyTool):
+    tool_module = "tools.CrawlWebsiteTool"
+    tool_class_name = "CrawlWebsiteTool"
+
+    name = 'CrawlWebsiteTool'
+    description = "A tool that crawls a website breadth first from a start URL and returns the deduplicated page texts, or writes them to a knowledge file."
+    parameters_metadata = {
+        'start_url': {'mandatory': False},
+        'url_prefix': {'mandatory': False},
+        'max_pages': {'mandatory': False, 'type': 'int'},
+        'max_depth': {'mandatory': False, 'type': 'int'},
+        'knowledge_file': {'mandatory': False},
+        'cookies': {'mandatory': False},
+        'css_selector': {'mandatory': False},
+        'main_content': {'mandatory': False, 'type': 'bool'}
+    }
+    cache_ttl = 24 * 3600
+
+    def __init__(self, tool_id=None, start_url=None, url_prefix=None, max_pages=None, max_depth=None, knowledge_file=None, cookies=None, css_selector=None, main_content=None):
+        super().__init__(tool_id, start_url=start_url, url_prefix=url_prefix, max_pages=max_pages, max_depth=max_depth, knowledge_file=knowledge_file, cookies=cookies, css_selector=css_selector, main_content=main_content)
+
+    def create_tool(self) -> CrawlWebsiteTool:
+        return self.load_tool_class()(
+            start_url=self.parameters.get('start_url') if self.parameters.get('start_url') else None,
+            url_prefix=self.parameters.get('url_prefix') if self.parameters.get('url_prefix') else None,
+            knowledge_file=self.parameters.get('knowledge_file') if self.parameters.get('knowledge_file') else None,
+            cookies=self.parameters.get('cookies') if self.parameters.get('cookies') else None,
+            css_selector=self.parameters.get('css_selector') if self.parameters.get('css_selector') else None,
+            main_content=self.parameters.get('main_content') if self.parameters.get('main_content') else False,
+            **({'max_pages': int(self.parameters['max_pages'])} if self.parameters.get('max_pages') else {}),
+            **({'max_depth': int(self.parameters['max_depth'])} if self.parameters.get('max_depth') not in (None, '') else {})
         )
 
 class MyScrapflyScrapeWebsiteTool(MyTool):
+    tool_module = "tools.ScrapflyScrapeWebsiteTool"
+    tool_class_name = "ScrapflyScrapeWebsiteTool"
+
+    name = 'ScrapflyScrapeWebsiteTool'
+    description = "A tool that uses Scrapfly API to scrape websites with advanced features like headless browser support, proxies, and anti-bot bypass."
+    parameters_metadata = {
+        'api_key': {'mandatory': False, 'type': 'secret'}
+    }
+    cache_ttl = 24 * 3600
+
     def __init__(self, tool_id=None, api_key=None):
-        parameters = {
-            'api_key': {'mandatory': False}
-        }
-        super().__init__(tool_id, 'ScrapflyScrapeWebsiteTool', "A tool that uses Scrapfly API to scrape websites with advanced features like headless browser support, proxies, and anti-bot bypass.", parameters, api_key=api_key)
+        super().__init__(tool_id, api_key=api_key)
 
     def create_tool(self) -> ScrapflyScrapeWebsiteTool:
         api_key = self.parameters.get('api_key') or os.getenv('SCRAPFLY_API_KEY')
         if not api_key:
             raise ValueError("Scrapfly API key not provided and not set in .env file (SCRAPFLY_API_KEY)")
-        return ScrapflyScrapeWebsiteTool(
+        return self.load_tool_class()(
             api_key=api_key
         )
 
@@ -393,6 +705,8 @@ TOOL_CLASSES = {
     'WebsiteSearchTool': MyWebsiteSearchTool,
     'ScrapeWebsiteTool': MyScrapeWebsiteTool,
     'ScrapeWebsiteToolEnhanced': MyScrapeWebsiteToolEnhanced,
+    'BatchScrapeWebsiteTool': MyBatchScrapeWebsiteTool,
+    'CrawlWebsiteTool': MyCrawlWebsiteTool,
     'ScrapflyScrapeWebsiteTool': MyScrapflyScrapeWebsiteTool,
     
     'SeleniumScrapingTool': MySeleniumScrapingTool,
@@ -9,6 +9,8 @@ import time
 import traceback
 import os
 from console_capture import ConsoleCapture
+from run_context import RunContext
+from llm_fallback import latency_stats
 from db_utils import load_results, save_result
 from utils import format_result, generate_printable_view, rnd_id, get_tasks_outputs_str
 
@@ -144,8 +146,9 @@ class PageCrewRun:
             inputs = {key.split('_')[1]: value for key, value in ss.placeholders.items()}
             ss.result = None
             
+            ss.run_context = RunContext(response_cache=selected_crew.response_cache)
             try:
-                crew = selected_crew.get_crewai_crew(full_output=True)
+                crew = selected_crew.get_crewai_crew(full_output=True, run_context=ss.run_context)
             except Exception as e:
                 st.exception(e)
                 traceback.print_exc()
@@ -193,6 +196,10 @@ class PageCrewRun:
                         'type': 'CrewOutput'
                     }
 
+                    token_usage = getattr(value, 'token_usage', None)
+                    if token_usage is not None and hasattr(token_usage, 'model_dump'):
+                        serialized['token_usage'] = token_usage.model_dump()
+
                     tasks_output_key = 'tasks_output'
                     if hasattr(value, tasks_output_key):
                         serialized[tasks_output_key] = self.get_tasks_output(
@@ -259,7 +266,8 @@ class PageCrewRun:
                         crew_id=ss.selected_crew_name,
                         crew_name=ss.selected_crew_name,
                         inputs={key.split('_')[1]: value for key, value in relevant_placeholders.items()},
-                        result=self.serialize_result(ss.result, curr_crew)  # Serialize the result before saving
+                        result=self.serialize_result(ss.result, curr_crew),  # Serialize the result before saving
+                        usage={'calls': list(ss.run_context.llm_calls)} if ss.get('run_context') else None
                     )
                     
                     # Save to database and update session state
@@ -275,6 +283,14 @@ class PageCrewRun:
                 formatted_result = format_result(ss.result)
                 st.expander("Final output", expanded=True).write(formatted_result)
                 st.expander("Full output", expanded=False).write(ss.result)
+                run_context = ss.get('run_context')
+                if run_context and run_context.response_cache:
+                    st.caption(f"LLM response cache: {run_context.cache_hits} hits, {run_context.cache_misses} misses")
+                latencies = latency_stats.summary()
+                if latencies:
+                    with st.expander("LLM latency", expanded=False):
+                        for model, stats in latencies.items():
+                            st.markdown(f"**{model}:** {stats['calls']} calls, p50 {stats['p50']:.1f}s, p95 {stats['p95']:.1f}s")
 
                 # Always define curr_crew before use
                 curr_crew = self.get_mycrew_by_name(ss.selected_crew_name)
@@ -331,6 +347,7 @@ class PageCrewRun:
             else:
                 st.error(ss.result)
         elif ss.running and ss.crew_thread is not None:
+            self.draw_live_output()
             with st.spinner("Running crew..."):
                 if hasattr(ss, 'console_capture'):
                     new_output = ss.console_capture.get_output()
@@ -348,6 +365,19 @@ class PageCrewRun:
                     time.sleep(1)
                     st.rerun()
 
+    def draw_live_output(self):
+        run_context = ss.get('run_context')
+        if run_context is None:
+            return
+        agent, task, text = run_context.live_output()
+        if not text:
+            return
+        with st.container(border=True):
+            st.markdown(f"**Current agent output** ({agent or 'unknown agent'})")
+            if task:
+                st.caption(task[:200])
+            st.markdown(text)
+
     @staticmethod
     def force_stop_thread(thread):
         if thread:
@@ -33,7 +33,7 @@ class PageExportCrew:
         tasks = crew.tasks
 
         # Check if any custom tools are used
-        custom_tools_used = any(tool.name in ["CustomApiTool", "CustomFileWriteTool", "CustomCodeInterpreterTool", "ScrapeWebsiteToolEnhanced", "CSVSearchToolEnhanced"] 
+        custom_tools_used = any(tool.name in ["CustomApiTool", "CustomFileWriteTool", "CustomCodeInterpreterTool", "ScrapeWebsiteToolEnhanced", "BatchScrapeWebsiteTool", "CrawlWebsiteTool", "CSVSearchToolEnhanced"] 
                                 for agent in agents for tool in agent.tools)
 
         def json_dumps_python(obj):
@@ -57,7 +57,7 @@ Agent(
     allow_delegation={json_dumps_python(agent.allow_delegation)},
     verbose={json_dumps_python(agent.verbose)},
     tools=[{', '.join([format_tool_instance(tool) for tool in agent.tools])}],
-    llm=create_llm({json_dumps_python(agent.llm_provider_model)}, {json_dumps_python(agent.temperature)})
+    llm=create_llm({json_dumps_python(agent.primary_llm)}, {json_dumps_python(agent.temperature)})
 )
             """
             for agent in agents
@@ -105,6 +105,8 @@ from crewai_tools import *
 {'''from tools.CustomFileWriteTool import CustomFileWriteTool''' if custom_tools_used else ''}
 {'''from tools.CustomCodeInterpreterTool import CustomCodeInterpreterTool''' if custom_tools_used else ''}
 {'''from tools.ScrapeWebsiteToolEnhanced import ScrapeWebsiteToolEnhanced''' if custom_tools_used else ''}
+{'''from tools.BatchScrapeWebsiteTool import BatchScrapeWebsiteTool''' if custom_tools_used else ''}
+{'''from tools.CrawlWebsiteTool import CrawlWebsiteTool''' if custom_tools_used else ''}
 {'''from tools.CSVSearchToolEnhanced import CSVSearchToolEnhanced''' if custom_tools_used else ''}
 load_dotenv()
 
@@ -374,6 +376,7 @@ streamlit run app.py --server.headless true
                 'allow_delegation': agent.allow_delegation,
                 'verbose': agent.verbose,
                 'cache': agent.cache,
+                'prompt_caching': agent.prompt_caching,
                 'llm_provider_model': agent.llm_provider_model,
                 'temperature': agent.temperature,
                 'max_iter': agent.max_iter,
@@ -429,6 +432,7 @@ streamlit run app.py --server.headless true
                 allow_delegation=agent_data['allow_delegation'],
                 verbose=agent_data['verbose'],
                 cache=agent_data.get('cache', True),
+                prompt_caching=agent_data.get('prompt_caching', False),
                 llm_provider_model=agent_data['llm_provider_model'],
                 temperature=agent_data['temperature'],
                 max_iter=agent_data['max_iter'],
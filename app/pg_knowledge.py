@@ -2,6 +2,7 @@ import streamlit as st
 from streamlit import session_state as ss
 from my_knowledge_source import MyKnowledgeSource
 import db_utils
+import knowledge_cache
 import os
 import shutil
 from pathlib import Path
@@ -27,6 +28,7 @@ class PageKnowledge:
         
         # Remove knowledge folder
         knowledge_dir = crewai_dir / "knowledge"
+        knowledge_cache.clear_cache()
         if knowledge_dir.exists():
             shutil.rmtree(knowledge_dir)
             st.success("Knowledge stores cleared successfully!")
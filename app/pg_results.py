@@ -3,11 +3,46 @@ from streamlit import session_state as ss
 from db_utils import delete_result, load_results
 from datetime import datetime
 from utils import rnd_id, format_result, generate_printable_view, get_tasks_outputs_str
+from llm_usage import aggregate_usage
+from llm_fallback import CHARS_PER_TOKEN
 
 class PageResults:
     def __init__(self):
         self.name = "Results"
 
+    def draw_usage(self, result):
+        if not result.usage or not result.usage.get('calls'):
+            st.write("No LLM usage recorded for this run.")
+            return
+        summary = aggregate_usage(result.usage['calls'])
+        total = summary['total']
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("LLM calls", f"{total['calls']} ({total['cached_calls']} cached)")
+        col2.metric("Prompt tokens", f"{total['prompt_tokens']:,} ({total['cached_prompt_tokens']:,} cached)")
+        col3.metric("Completion tokens", f"{total['completion_tokens']:,}")
+        col4.metric("Estimated cost", f"${total['cost']:.4f}")
+        if total.get('estimated_calls'):
+            st.caption(f"{total['estimated_calls']} calls reported no token usage, their tokens are estimated from the text length (about {CHARS_PER_TOKEN} characters per token).")
+        for title, group in (("By agent", 'by_agent'), ("By task", 'by_task'), ("By model", 'by_model')):
+            st.markdown(f"**{title}**")
+            st.dataframe(
+                [
+                    {
+                        'name': name,
+                        'calls': totals['calls'],
+                        'estimated calls': totals.get('estimated_calls', 0),
+                        'prompt tokens': totals['prompt_tokens'],
+                        'completion tokens': totals['completion_tokens'],
+                        'cached prompt tokens': totals['cached_prompt_tokens'],
+                        'latency (s)': round(totals['latency'], 1),
+                        'cost ($)': round(totals['cost'], 4),
+                    }
+                    for name, totals in sorted(summary[group].items(), key=lambda item: item[1]['cost'], reverse=True)
+                ],
+                use_container_width=True,
+                hide_index=True,
+            )
+
     def draw(self):
         st.subheader(self.name)
 
@@ -97,13 +132,15 @@ class PageResults:
                     formatted_tasks_result = ""
 
                 # Show both rendered and raw versions using tabs
-                tab1, tab2, tab3 = st.tabs(["Rendered", "Raw", "Rendered Complete"])
+                tab1, tab2, tab3, tab4 = st.tabs(["Rendered", "Raw", "Rendered Complete", "Usage"])
                 with tab1:
                     st.markdown(formatted_result)
                 with tab2:
                     st.code(formatted_result)
                 with tab3:
                     st.markdown(formatted_tasks_result)
+                with tab4:
+                    self.draw_usage(result)
 
                 col1, col2 = st.columns([1, 1])
                 with col1:
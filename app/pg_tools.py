@@ -1,6 +1,7 @@
 import streamlit as st
 from utils import rnd_id
 from my_tools import TOOL_CLASSES
+from tool_cache import TOOL_CACHE_ENABLED, get_stats
 from streamlit import session_state as ss
 import db_utils
 
@@ -36,15 +37,38 @@ class PageTools:
         first_param_value = tool.parameters.get(first_param_name, '') if first_param_name else ''
         return f"{tool.name} ({first_param_value if first_param_value else tool.tool_id})"
 
+    def draw_parameter_input(self, tool, param_name):
+        param_value = tool.parameters.get(param_name)
+        param_type = tool.get_parameter_type(param_name)
+        key = f"{tool.tool_id}_{param_name}"
+        if param_type == 'bool':
+            # older tools stored the flag as text
+            param_value = param_value in (True, 'True', 'true', '1')
+            new_value = st.checkbox(param_name, value=param_value, key=key)
+        elif param_type == 'int':
+            param_value = int(param_value) if param_value not in (None, '') else None
+            new_value = st.number_input(param_name, value=param_value, step=1, key=key, placeholder="Optional")
+        else:
+            param_value = param_value or ""
+            placeholder = "Required" if tool.is_parameter_mandatory(param_name) else "Optional"
+            new_value = st.text_input(param_name, value=param_value, key=key, placeholder=placeholder, type="password" if param_type == 'secret' else "default")
+        if new_value != param_value:
+            self.set_tool_parameter(tool.tool_id, param_name, new_value)
+
+    def draw_cache_stats(self, tool):
+        stats = get_stats(tool.name)
+        if stats['hit_rate'] is None:
+            st.caption(f"Result cache: no calls yet, results are kept for {tool.cache_ttl // 60} min")
+        else:
+            st.caption(f"Result cache: {stats['hits']} hits / {stats['hits'] + stats['misses']} calls ({stats['hit_rate']:.0%}) for all {tool.name} tools")
+
     def draw_tools(self):
         c1,c2 = st.columns([1, 3])
         #st.write("Available Tools:")
         with c1:
             for tool_name in self.available_tools.keys():
                 tool_class = self.available_tools[tool_name]
-                tool_instance = tool_class()
-                tool_description = tool_instance.description
-                if st.button(f"{tool_name}", key=f"enable_{tool_name}", help=tool_description):
+                if st.button(f"{tool_name}", key=f"enable_{tool_name}", help=tool_class.description):
                     self.create_tool(tool_name)
         with c2:
             if 'tools' in ss:
@@ -55,12 +79,10 @@ class PageTools:
                     expander_title = display_name if is_complete else f"❗ {display_name}"
                     with st.expander(expander_title):
                         st.write(tool.description)
+                        if tool.cache_ttl and TOOL_CACHE_ENABLED:
+                            self.draw_cache_stats(tool)
                         for param_name in tool.get_parameter_names():
-                            param_value = tool.parameters.get(param_name, "")
-                            placeholder = "Required" if tool.is_parameter_mandatory(param_name) else "Optional"
-                            new_value = st.text_input(f"{param_name}", value=param_value, key=f"{tool.tool_id}_{param_name}", placeholder=placeholder)
-                            if new_value != param_value:
-                                self.set_tool_parameter(tool.tool_id, param_name, new_value)
+                            self.draw_parameter_input(tool, param_name)
                         if st.button(f"Remove", key=f"remove_{tool.tool_id}"):
                             self.remove_tool(tool.tool_id)
 
@@ -8,10 +8,12 @@ class Result:
                  crew_name: str,
                  inputs: Dict[str, str],
                  result: Any,
-                 created_at: Optional[str] = None):
+                 created_at: Optional[str] = None,
+                 usage: Optional[Dict[str, Any]] = None):
         self.id = id
         self.crew_id = crew_id
         self.crew_name = crew_name
         self.inputs = inputs
         self.result = result
-        self.created_at = created_at or datetime.now().isoformat()
\ No newline at end of file
+        self.created_at = created_at or datetime.now().isoformat()
+        self.usage = usage  # {'calls': [...]} recorded LLM calls of the run
\ No newline at end of file
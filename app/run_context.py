@@ -0,0 +1,53 @@
+import threading
+
+# Only the tail of the streamed output is kept for the live panel
+LIVE_OUTPUT_CHARS = 20000
+
+
+class RunContext:
+    """State of a single crew kickoff, shared by the agents and LLMs built for it."""
+    def __init__(self, response_cache=False):
+        self.response_cache = response_cache
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.llm_calls = []
+        self.stream_agent = None
+        self.stream_task = None
+        self.stream_text = ""
+        self._lock = threading.Lock()
+
+    def record_cache_lookup(self, hit):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def start_stream(self, agent=None, task=None):
+        with self._lock:
+            self.stream_agent = getattr(agent, 'role', None)
+            self.stream_task = getattr(task, 'description', None)
+            self.stream_text = ""
+
+    def append_stream(self, chunk):
+        with self._lock:
+            self.stream_text = (self.stream_text + chunk)[-LIVE_OUTPUT_CHARS:]
+
+    def live_output(self):
+        with self._lock:
+            return self.stream_agent, self.stream_task, self.stream_text
+
+    def record_llm_call(self, model, agent=None, task=None, prompt_tokens=0, completion_tokens=0, cached_prompt_tokens=0, latency=0.0, cached=False, estimated=False):
+        call = {
+            'model': model,
+            'agent': getattr(agent, 'role', None),
+            'task': (getattr(task, 'name', None) or getattr(task, 'description', '') or '')[:80] or None,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'cached_prompt_tokens': cached_prompt_tokens,
+            'latency': round(latency, 3),
+            'cached': cached,
+            'estimated': estimated,
+        }
+        with self._lock:
+            self.llm_calls.append(call)
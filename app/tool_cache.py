@@ -0,0 +1,104 @@
+"""
+Persistent cache of tool results shared by all crews and runs.
+
+crewAI's own tool cache lives in memory for one crew object, which is rebuilt on every
+kickoff. Tools with a cache_ttl (web pages, searches) get their results stored in a
+diskcache store keyed by the tool name, the normalized call arguments and the tool
+parameters, so the same page or query is not fetched again until the TTL expires.
+"""
+import hashlib
+import json
+import os
+import threading
+
+TOOL_CACHE_ENABLED = os.getenv('TOOL_CACHE_ENABLED', 'True').lower() == 'true'
+TOOL_CACHE_DIR = os.getenv('TOOL_CACHE_DIR', 'tool_cache')
+TOOL_CACHE_SIZE_MB = int(os.getenv('TOOL_CACHE_SIZE_MB', 256))
+
+# crewAI adds the agent fingerprint to the arguments, it must not split the cache
+IGNORED_ARGUMENTS = ('security_context',)
+
+_lock = threading.Lock()
+_store = None
+
+
+def get_store():
+    global _store
+    with _lock:
+        if _store is None:
+            from diskcache import Cache
+            _store = Cache(TOOL_CACHE_DIR, size_limit=TOOL_CACHE_SIZE_MB * 1024 * 1024)
+        return _store
+
+
+def clear_cache():
+    get_store().clear()
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def cache_key(tool_name, args, kwargs, parameters):
+    key_data = {
+        'tool': tool_name,
+        'args': _normalize(list(args)),
+        'kwargs': _normalize({key: value for key, value in kwargs.items() if key not in IGNORED_ARGUMENTS and value is not None}),
+        'parameters': {key: value for key, value in parameters.items() if value is not None},
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _record(store, tool_name, hit):
+    try:
+        store.incr(('stats', tool_name, 'hits' if hit else 'misses'))
+    except Exception as e:
+        print(f"Error updating tool cache stats: {str(e)}")
+
+
+def get_stats(tool_name):
+    """Hits and misses of a tool over all runs, with the hit rate (None before the first call)."""
+    store = get_store()
+    hits = store.get(('stats', tool_name, 'hits'), 0)
+    misses = store.get(('stats', tool_name, 'misses'), 0)
+    calls = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / calls if calls else None}
+
+
+def _cacheable(tool, kwargs, result):
+    if result is None or (isinstance(result, str) and result.startswith("Error")):
+        return False
+    cache_function = getattr(tool, 'cache_function', None)
+    return not cache_function or cache_function(kwargs, result)
+
+
+def enable_result_cache(tool, tool_name, parameters, ttl):
+    """Serve the tool's results from the persistent cache for ttl seconds."""
+    run = tool._run
+    parameters = dict(parameters)
+
+    def _run(*args, **kwargs):
+        key = cache_key(tool_name, args, kwargs, parameters)
+        store = get_store()
+        result = store.get(key)
+        if result is not None:
+            _record(store, tool_name, True)
+            return result
+        _record(store, tool_name, False)
+        result = run(*args, **kwargs)
+        if _cacheable(tool, kwargs, result):
+            try:
+                store.set(key, result, expire=ttl)
+            except Exception as e:
+                print(f"Error caching {tool_name} result: {str(e)}")
+        return result
+
+    # crewAI builds the structured tool from tool._run, pydantic must not see the override
+    object.__setattr__(tool, '_run', _run)
+    return tool
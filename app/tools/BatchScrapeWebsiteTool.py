@@ -0,0 +1,138 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Type
+from pydantic import BaseModel, Field
+from tools.ScrapeWebsiteToolEnhanced import ScrapeWebsiteToolEnhanced
+from tools.http_session import READ_CHUNK_SIZE
+from tools.text_limits import truncate_to_tokens
+
+SCRAPE_BATCH_MAX_URLS = int(os.getenv('SCRAPE_BATCH_MAX_URLS', 30))
+SCRAPE_BATCH_CONCURRENCY = int(os.getenv('SCRAPE_BATCH_CONCURRENCY', 10))
+SCRAPE_BATCH_PER_HOST = int(os.getenv('SCRAPE_BATCH_PER_HOST', 2))
+
+
+class BatchScrapeWebsiteToolSchema(BaseModel):
+    """Input for BatchScrapeWebsiteTool."""
+    website_urls: List[str] = Field(..., description="List of website URLs to read, e.g. the links of a search result")
+
+
+class BatchScrapeWebsiteTool(ScrapeWebsiteToolEnhanced):
+    """Reads several pages in one tool call, fetched concurrently with aiohttp.
+
+    Uses the extraction of ScrapeWebsiteToolEnhanced. The token budget is split between
+    the pages, so the combined output stays within max_tokens.
+    """
+    name: str = "Read multiple websites content"
+    description: str = "A tool that can be used to read the content of several websites at once. Pass all URLs in one call."
+    args_schema: Type[BaseModel] = BatchScrapeWebsiteToolSchema
+
+    max_urls: int = SCRAPE_BATCH_MAX_URLS
+    max_concurrency: int = SCRAPE_BATCH_CONCURRENCY
+    max_per_host: int = SCRAPE_BATCH_PER_HOST
+
+    def __init__(
+        self,
+        cookies: Optional[dict] = None,
+        show_urls: Optional[bool] = False,
+        css_selector: Optional[str] = None,
+        main_content: Optional[bool] = False,
+        **kwargs,
+    ):
+        super().__init__(website_url=None, cookies=cookies, show_urls=show_urls, css_selector=css_selector, main_content=main_content, **kwargs)
+
+    async def _read_body(self, response, max_bytes: int, head: bytes = b""):
+        body = bytearray(head)
+        async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+            if len(body) + len(chunk) > max_bytes:
+                body += chunk[:max_bytes - len(body)]
+                return bytes(body), True
+            body += chunk
+        return bytes(body), False
+
+    async def _fetch(self, session, website_url: str, links: list = None) -> str:
+        import aiohttp
+
+        try:
+            # per request, the session's jar ignores cookies, also those set by the pages
+            async with session.get(website_url, cookies=self.cookies or None, allow_redirects=True) as response:
+                final_url = str(response.url)
+                was_redirected = len(response.history) > 0
+                original_url = str(response.history[0].url) if was_redirected else website_url
+                metadata = self.page_metadata(website_url, final_url, response.status, was_redirected, original_url)
+
+                content_type = response.headers.get("Content-Type", "").lower()
+                content_length = response.content_length or 0
+                head = await response.content.read(READ_CHUNK_SIZE) if self.needs_sniffing(content_type) else b""
+                kind = self.content_kind(content_type, head)
+
+                if kind == "binary":
+                    return self.binary_to_text(website_url, metadata)
+                if kind == "pdf":
+                    pdf_metadata = self.extract_pdf_metadata(final_url, response)
+                    if content_length > self.max_pdf_bytes:
+                        return pdf_metadata + f"\n\nError: PDF is larger than {self.max_pdf_bytes} bytes ({content_length} bytes)"
+                    data, truncated = await self._read_body(response, self.max_pdf_bytes, head)
+                    if truncated:
+                        return pdf_metadata + f"\n\nError: PDF is larger than {self.max_pdf_bytes} bytes"
+                else:
+                    data, truncated = await self._read_body(response, self.max_bytes, head)
+        except asyncio.TimeoutError:
+            return f"Error: Website request timed out: {website_url}"
+        except aiohttp.ClientError as e:
+            return f"Error: Failed to fetch website content from {website_url}: {str(e)}"
+
+        # parsing is CPU bound, keep the event loop free for the other downloads
+        if kind == "pdf":
+            return pdf_metadata + "\n\n### PDF Content ###\n" + await asyncio.to_thread(self.pdf_to_text, data)
+        return await asyncio.to_thread(self.html_to_text, website_url, final_url, response, data, truncated, metadata, links)
+
+    def _client_session(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.max_per_host)
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            # like the shared requests session, cookies set by one page are not sent to the others
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=aiohttp.ClientTimeout(total=30, sock_connect=15, sock_read=15),
+        )
+
+    def _run_async(self, coroutine):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # called from inside an event loop, run the coroutine on its own loop
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    async def _fetch_all(self, website_urls: list) -> list:
+        async with self._client_session() as session:
+            return await asyncio.gather(*(self._fetch(session, url) for url in website_urls))
+
+    def _run(
+        self,
+        **kwargs: Any,
+    ) -> Any:
+        website_urls = kwargs.get("website_urls") or []
+        if isinstance(website_urls, str):
+            website_urls = [url.strip() for url in website_urls.split(",")]
+        # keep the order, drop duplicates
+        website_urls = list(dict.fromkeys(url for url in website_urls if url))
+        if not website_urls:
+            return "Error: No website URLs provided"
+        skipped = website_urls[self.max_urls:]
+        website_urls = website_urls[:self.max_urls]
+
+        pages = self._run_async(self._fetch_all(website_urls))
+
+        page_tokens = self.max_tokens // len(website_urls) if self.max_tokens else None
+        sections = [
+            f"=== Page {index} of {len(website_urls)}: {url} ===\n" + truncate_to_tokens(page, page_tokens)
+            for index, (url, page) in enumerate(zip(website_urls, pages), 1)
+        ]
+        if skipped:
+            sections.append(f"Not read, over the limit of {self.max_urls} URLs per call: " + ", ".join(skipped))
+        return "\n\n".join(sections)
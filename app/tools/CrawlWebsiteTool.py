@@ -0,0 +1,218 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Type
+from urllib.parse import urlsplit
+from pydantic import BaseModel, Field
+from tools.BatchScrapeWebsiteTool import BatchScrapeWebsiteTool
+from tools.ScrapeWebsiteToolEnhanced import all_pages_read
+from tools.robots import get_rules
+from tools.text_limits import truncate_to_tokens
+
+SCRAPE_CRAWL_MAX_PAGES = int(os.getenv('SCRAPE_CRAWL_MAX_PAGES', 100))
+SCRAPE_CRAWL_MAX_DEPTH = int(os.getenv('SCRAPE_CRAWL_MAX_DEPTH', 3))
+SCRAPE_CRAWL_DELAY = float(os.getenv('SCRAPE_CRAWL_DELAY', 0.5))
+# not worth a request, the tool would only report them as binary files
+SKIPPED_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico", ".css", ".js", ".zip", ".gz", ".tar",
+    ".exe", ".dmg", ".mp3", ".mp4", ".avi", ".mov", ".woff", ".woff2", ".ttf",
+)
+
+
+class FixedCrawlWebsiteToolSchema(BaseModel):
+    """Fixed input schema - when start_url is provided in constructor."""
+    pass
+
+
+class CrawlWebsiteToolSchema(FixedCrawlWebsiteToolSchema):
+    """Dynamic input schema - what the agent sees and can set."""
+    start_url: str = Field(..., description="Mandatory URL of the first page, the crawl follows its links on the same site")
+
+
+def _host(url: str) -> str:
+    host = urlsplit(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _page_body(text: str) -> str:
+    # the metadata holds the URL and the time, it differs even for identical pages
+    return text.split("\n---\n", 1)[-1].strip()
+
+
+class CrawlWebsiteTool(BatchScrapeWebsiteTool):
+    """Reads a whole site breadth first, with the extraction of ScrapeWebsiteToolEnhanced.
+
+    Follows the links of every page up to max_depth and max_pages, on the start URL's
+    site (or under url_prefix), as allowed by robots.txt and at most one request per
+    delay seconds and host. Pages with the same text are kept once. With knowledge_file
+    the pages that were read are written to that file in the knowledge folder, where a
+    Text File knowledge source can index them, and only a summary is returned.
+    """
+    name: str = "Crawl website"
+    description: str = "A tool that reads all pages of a website (e.g. documentation) by following its links, starting from one URL."
+    args_schema: Type[BaseModel] = CrawlWebsiteToolSchema
+
+    start_url: Optional[str] = None
+    url_prefix: Optional[str] = None
+    max_pages: int = SCRAPE_CRAWL_MAX_PAGES
+    max_depth: int = SCRAPE_CRAWL_MAX_DEPTH
+    delay: float = SCRAPE_CRAWL_DELAY
+    knowledge_file: Optional[str] = None
+
+    def __init__(
+        self,
+        start_url: Optional[str] = None,
+        url_prefix: Optional[str] = None,
+        knowledge_file: Optional[str] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+
+        self.start_url = start_url
+        self.url_prefix = url_prefix
+        self.knowledge_file = knowledge_file
+
+        if knowledge_file:
+            # the file is written by the run, a cached result would skip it
+            self.cache_function = lambda _args=None, _result=None: False
+
+        if start_url is not None and "description" not in kwargs:
+            self.description = (
+                f"A tool that can be used to read all pages of {start_url}."
+            )
+            self.args_schema = FixedCrawlWebsiteToolSchema
+            self._generate_description()
+
+    def in_scope(self, url: str, start_url: str) -> bool:
+        if urlsplit(url).path.lower().endswith(SKIPPED_EXTENSIONS):
+            return False
+        if self.url_prefix:
+            return url.startswith(self.url_prefix)
+        return _host(url) == _host(start_url)
+
+    async def _wait_turn(self, url: str, delay: float, next_request: dict):
+        # every request books the next free slot of its host, so requests start delay apart
+        loop = asyncio.get_running_loop()
+        host = urlsplit(url).netloc
+        slot = max(loop.time(), next_request.get(host, 0))
+        next_request[host] = slot + delay
+        await asyncio.sleep(slot - loop.time())
+
+    async def _crawl(self, start_url: str) -> list:
+        user_agent = self.headers.get("User-Agent", "*")
+        queue = asyncio.Queue()
+        queue.put_nowait((0, 0, start_url))
+        seen = {start_url}
+        next_request = {}
+        pages = []
+
+        async with self._client_session() as session:
+            async def allowed(url):
+                return (await get_rules(session, url)).can_fetch(user_agent, url)
+
+            async def worker():
+                while True:
+                    depth, order, url = await queue.get()
+                    try:
+                        rules = await get_rules(session, url)
+                        await self._wait_turn(url, max(self.delay, rules.crawl_delay(user_agent) or 0), next_request)
+                        links = []
+                        pages.append((depth, order, url, await self._fetch(session, url, links)))
+                        if depth >= self.max_depth:
+                            continue
+                        for link in links:
+                            if len(seen) >= self.max_pages:
+                                break
+                            if link in seen or not self.in_scope(link, start_url) or not await allowed(link):
+                                continue
+                            seen.add(link)
+                            queue.put_nowait((depth + 1, len(seen), link))
+                    except Exception as e:
+                        pages.append((depth, order, url, f"Error: Failed to crawl {url}: {str(e)}"))
+                    finally:
+                        queue.task_done()
+
+            if not await allowed(start_url):
+                return [(start_url, f"Error: {start_url} is disallowed by robots.txt, or its robots.txt can't be read")]
+            workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+            await queue.join()
+            for task in workers:
+                task.cancel()
+
+        # breadth first order, whatever order the downloads finished in
+        return [(url, text) for _, _, url, text in sorted(pages)]
+
+    def knowledge_path(self) -> Path:
+        base = Path("knowledge").resolve()
+        path = (base / self.knowledge_file).resolve()
+        if base not in path.parents:
+            raise ValueError(f"{self.knowledge_file} is outside the knowledge folder")
+        return path
+
+    def write_knowledge_file(self, path: Path, pages: list):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # a knowledge source indexing the file never sees it half written, and
+        # concurrent crawls into the same file don't move each other's temporary file
+        f = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent, prefix=path.name + '.', suffix='.tmp', delete=False)
+        try:
+            with f:
+                for url, text in pages:
+                    f.write(f"=== {url} ===\n{text}\n\n")
+            os.replace(f.name, path)
+        except BaseException:
+            try:
+                os.unlink(f.name)
+            except OSError:
+                pass
+            raise
+
+    def _run(
+        self,
+        **kwargs: Any,
+    ) -> Any:
+        start_url = kwargs.get("start_url", self.start_url)
+        if not start_url:
+            return "Error: No start URL provided"
+        if self.knowledge_file:
+            try:
+                path = self.knowledge_path()
+            except ValueError as e:
+                return f"Error: {str(e)}"
+
+        crawled = self._run_async(self._crawl(start_url.strip()))
+
+        pages = []
+        duplicates = []
+        bodies = set()
+        for url, text in crawled:
+            digest = hashlib.sha256(_page_body(text).encode()).hexdigest()
+            if digest in bodies:
+                duplicates.append(url)
+                continue
+            bodies.add(digest)
+            pages.append((url, text))
+
+        summary = f"Crawled {len(crawled)} pages from {start_url} (max depth {self.max_depth}, max pages {self.max_pages})"
+        if duplicates:
+            summary += f", left out {len(duplicates)} with the same content as another page"
+
+        if self.knowledge_file:
+            # error pages and pages with an error status would only pollute the knowledge
+            failed = [url for url, text in pages if not all_pages_read(result=text)]
+            pages = [(url, text) for url, text in pages if url not in failed]
+            if failed:
+                summary += f", left out {len(failed)} that failed: " + ", ".join(failed)
+            try:
+                self.write_knowledge_file(path, pages)
+            except OSError as e:
+                return f"Error: Failed to write {self.knowledge_file}: {str(e)}"
+            return (
+                f"{summary}.\nThe text of {len(pages)} pages ({path.stat().st_size} bytes) was written to {path}, "
+                f"use it as a Text File knowledge source with the source path {self.knowledge_file}.\n\nPages:\n"
+                + "\n".join(url for url, _ in pages)
+            )
+
+        sections = [f"=== {url} ===\n{text}" for url, text in pages]
+        return truncate_to_tokens(summary + ".\n\n" + "\n\n".join(sections), self.max_tokens)
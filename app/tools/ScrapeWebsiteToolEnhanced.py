@@ -1,11 +1,26 @@
-from urllib.parse import urljoin
+import os
 import re
-from typing import Any, Optional, Type
+from typing import Any, Callable, Optional, Type
 from datetime import datetime
 import requests
-from bs4 import BeautifulSoup, Tag
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
+from tools.html_extract import detect_encoding, elements_to_text, extract_links, extract_metadata, parse_html, select
+from tools.main_content import main_content
+from tools.http_session import READ_CHUNK_SIZE, get_session, read_limited
+from tools.text_limits import CHARS_PER_TOKEN, SCRAPE_MAX_TOKENS, truncate_to_tokens
+
+SCRAPE_MAX_BYTES = int(os.getenv('SCRAPE_MAX_BYTES', 5 * 1024 * 1024))
+SCRAPE_MAX_PDF_BYTES = int(os.getenv('SCRAPE_MAX_PDF_BYTES', 25 * 1024 * 1024))
+SCRAPE_MAX_PDF_PAGES = int(os.getenv('SCRAPE_MAX_PDF_PAGES', 50))
+BINARY_CONTENT_TYPES = ["image", "octet-stream", "audio", "video", "zip", "font"]
+# a page that failed or came back with a non-2xx status (e.g. a transient 429 or 503)
+_FAILED_PAGE = re.compile(r"^(?:Status: (?!2\d\d$)\d{3}$|Error: |Error processing PDF)", re.MULTILINE)
+
+
+def all_pages_read(_args=None, result=None) -> bool:
+    """cache_function of the scrape tools: don't cache results with a failed page."""
+    return not (isinstance(result, str) and _FAILED_PAGE.search(result))
 
 
 class FixedScrapeWebsiteToolEnhancedSchema(BaseModel):
@@ -27,6 +42,12 @@ class ScrapeWebsiteToolEnhanced(BaseTool):
     cookies: Optional[dict] = None
     show_urls: Optional[bool] = False
     css_selector: Optional[str] = None
+    main_content: Optional[bool] = False
+    max_bytes: int = SCRAPE_MAX_BYTES
+    max_pdf_bytes: int = SCRAPE_MAX_PDF_BYTES
+    max_pdf_pages: int = SCRAPE_MAX_PDF_PAGES
+    max_tokens: Optional[int] = SCRAPE_MAX_TOKENS
+    cache_function: Callable = all_pages_read
         
     headers: Optional[dict] = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
@@ -43,6 +64,7 @@ class ScrapeWebsiteToolEnhanced(BaseTool):
         cookies: Optional[dict] = None,
         show_urls: Optional[bool] = False,
         css_selector: Optional[str] = None,
+        main_content: Optional[bool] = False,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -51,6 +73,7 @@ class ScrapeWebsiteToolEnhanced(BaseTool):
         self.cookies = cookies
         self.show_urls = show_urls
         self.css_selector = css_selector
+        self.main_content = main_content
 
         if website_url is not None and "description" not in kwargs:
             self.description = (
@@ -59,165 +82,6 @@ class ScrapeWebsiteToolEnhanced(BaseTool):
             self.args_schema = FixedScrapeWebsiteToolEnhancedSchema
             self._generate_description()
         
-    def clean_text(self, text: str) -> str:
-        """Clean and normalize text content."""
-        if not text:
-            return ""
-
-        # Remove HTML tags while preserving line breaks
-        text = text.replace('<br>', '\n').replace('<br/>', '\n').replace('<br />', '\n')
-        text = text.replace('<hr/>', '').replace('<hr />', '').replace('<hr>', '')
-        
-        # Remove all remaining HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Convert various whitespace to spaces
-        text = re.sub(r'[\t\f\r\x0b]', ' ', text)
-        
-        # Clean up spaces and empty lines
-        text = re.sub(r' {2,}', ' ', text)
-        text = text.strip()
-        text = re.sub(r'^\s+', '', text, flags=re.MULTILINE)
-        
-        # Remove wicket attributes and other technical artifacts
-        text = re.sub(r'wicket:[^\s>]+', '', text)
-        text = re.sub(r'\s*style="[^"]*"', '', text)
-        text = re.sub(r'\s*class="[^"]*"', '', text)
-        text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
-        
-        # Remove empty lines while preserving intentional line breaks
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        
-        return text.strip()
-
-    def extract_text_with_structure(self, element: Tag, depth: int = 0) -> list:
-        """Extract text while preserving structure."""
-        results = []
-        
-        # Skip script and style
-        if element.name in ['script', 'style']:
-            return results
-
-        # Handle direct text content
-        if isinstance(element, str):
-            text = self.clean_text(element)
-            if text:
-                results.append(("    " * depth) + text)
-            return results
-
-        # Handle link elements
-        if element.name == 'a' and element.get('href'):
-            href = element['href']
-            if not href.startswith('javascript:'):
-                text = self.clean_text(element.get_text())
-                if text:
-                    if self.show_urls:
-                        full_url = urljoin(self.website_url, href)
-                        results.append(("    " * depth) + f"<{text}: {full_url}>")
-                    else:
-                        results.append(("    " * depth) + text)
-            return results
-
-        # For tables, preserve structure
-        if element.name == 'table':
-            rows = []
-            # Process headers
-            header_row = element.find(['tr', 'thead'])
-            headers = []
-            if header_row:
-                for th in header_row.find_all(['th', 'td']):
-                    header_results = self.extract_text_with_structure(th, 0)
-                    if header_results:
-                        headers.append(" ".join(line.strip() for line in header_results))
-            if headers:
-                results.append(("    " * depth) + " | ".join(headers))
-                results.append(("    " * depth) + ("-" * len(" | ".join(headers))))
-
-            # Process data rows
-            for tr in element.find_all('tr'):
-                if tr != header_row:
-                    cols = []
-                    for td in tr.find_all(['td', 'th']):
-                        cell_results = self.extract_text_with_structure(td, 0)
-                        if cell_results:
-                            cols.append(" ".join(line.strip() for line in cell_results))
-                    if cols:
-                        results.append(("    " * depth) + " | ".join(cols))
-            return results
-
-        # For lists, preserve bullets/numbers
-        if element.name in ['ul', 'ol']:
-            for i, li in enumerate(element.find_all('li', recursive=False), 1):
-                prefix = f"{i}. " if element.name == 'ol' else "• "
-                li_results = self.extract_text_with_structure(li, depth)
-                if li_results:
-                    first_line = True
-                    for line in li_results:
-                        if first_line:
-                            results.append(("    " * depth) + prefix + line.lstrip())
-                            first_line = False
-                        else:
-                            results.append(("    " * (depth + 1)) + line.lstrip())
-            return results
-
-        # For headings, add markdown style
-        if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            text = self.clean_text(element.get_text())
-            if text:
-                level = min(int(element.name[1]), 6)
-                results.append('')
-                results.append(("    " * depth) + '#' * level + ' ' + text)
-                results.append('')
-            return results
-
-        # Process all child elements and maintain structure
-        for child in element.children:
-            # Skip empty text nodes
-            if isinstance(child, str) and not child.strip():
-                continue
-                
-            child_results = self.extract_text_with_structure(child, depth)
-            if not child_results:
-                continue
-
-            # Add proper spacing for block elements
-            if isinstance(child, Tag) and child.name in ['div', 'p', 'section', 'article', 'header', 'footer']:
-                if results and results[-1]:
-                    results.append('')
-                results.extend(child_results)
-                if child_results[-1]:
-                    results.append('')
-            else:
-                results.extend(child_results)
-
-        return results
-
-    def extract_metadata(self, soup: BeautifulSoup, url: str) -> str:
-        """Extract and format page metadata."""
-        metadata = [
-            "### Page Metadata ###",
-            f"URL: {url}",
-            f"Scraping Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        ]
-        
-        # Extract title
-        title = soup.find('title')
-        if title and title.string and title.string.strip():
-            metadata.append(f"Title: {title.string.strip()}")
-            
-        # Extract description
-        meta_desc = soup.find('meta', {'name': 'description'}) or soup.find('meta', {'property': 'og:description'})
-        if meta_desc and meta_desc.get('content') and meta_desc['content'].strip():
-            metadata.append(f"Description: {meta_desc['content'].strip()}")
-            
-        # Extract language
-        html_tag = soup.find('html')
-        if html_tag and html_tag.get('lang') and html_tag['lang'].strip():
-            metadata.append(f"Language: {html_tag['lang']}")
-            
-        metadata.append("---")
-        return "\n".join(metadata)
-
     def extract_pdf_metadata(self, url: str, response: requests.Response) -> str:
         """Extract and format metadata for a PDF file, including filename from response headers."""
         # Try to extract filename from Content-Disposition header
@@ -241,10 +105,34 @@ class ScrapeWebsiteToolEnhanced(BaseTool):
         ]
         return "\n".join(metadata)
     
-    def pdf_url_to_text(self, url: str) -> str:
-        from pdfminer.high_level import extract_text
+    def pdf_to_text(self, data: bytes) -> str:
+        """Convert an already downloaded PDF file to text, page by page up to the page and token limits."""
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
         from io import BytesIO
 
+        pages = []
+        length = 0
+        notes = []
+        # one page more than the limit tells whether the PDF really goes on
+        maxpages = self.max_pdf_pages + 1 if self.max_pdf_pages else 0
+        try:
+            for page in extract_pages(BytesIO(data), maxpages=maxpages):
+                if self.max_pdf_pages and len(pages) == self.max_pdf_pages:
+                    notes.append(f"[Stopped after {self.max_pdf_pages} pages]")
+                    break
+                pages.append("".join(element.get_text() for element in page if isinstance(element, LTTextContainer)))
+                length += len(pages[-1])
+                # the rest would be cut by the token limit anyway
+                if self.max_tokens and length > self.max_tokens * CHARS_PER_TOKEN * 2:
+                    break
+        except Exception as e:
+            if not pages:
+                return f"Error processing PDF: {e}"
+            notes.append(f"[Error processing PDF after page {len(pages)}: {e}]")
+        return "\f".join(pages) + "".join(f"\n\n{note}" for note in notes)
+
+    def pdf_url_to_text(self, url: str) -> str:
         """
         Stáhne PDF soubor z URL a převede jeho obsah na text.
 
@@ -255,15 +143,74 @@ class ScrapeWebsiteToolEnhanced(BaseTool):
             str: Text převedený z PDF.
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-            pdf_file = BytesIO(response.content)
-
-            text = extract_text(pdf_file)
-            return text
+            with get_session().get(url, headers=self.headers, timeout=15, stream=True) as response:
+                response.raise_for_status()
+                data, truncated = read_limited(response.iter_content(READ_CHUNK_SIZE), self.max_pdf_bytes)
         except Exception as e:
             return f"Error processing PDF: {e}"
+        if truncated:
+            return f"Error processing PDF: the file is larger than {self.max_pdf_bytes} bytes"
+        return self.pdf_to_text(data)
         
+    def content_kind(self, content_type: str, head: bytes = b"") -> str:
+        """'pdf', 'binary' or 'html', from the Content-Type and the first bytes of the body."""
+        # PDFs are often served as octet-stream or without a type
+        if "pdf" in content_type or head.startswith(b"%PDF-"):
+            return "pdf"
+        if any(binary_type in content_type for binary_type in BINARY_CONTENT_TYPES):
+            return "binary"
+        return "html"
+
+    def needs_sniffing(self, content_type: str) -> bool:
+        return not content_type or "octet-stream" in content_type
+
+    def page_metadata(self, website_url: str, final_url: str, status: int, was_redirected: bool, original_url: str) -> list:
+        metadata = [
+            "### Page Metadata ###",
+            f"URL: {original_url}",
+            f"Status: {status}",
+            f"Scraping Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        ]
+        if was_redirected:
+            metadata.append(f"Redirect: {original_url} -> {final_url}")
+        return metadata
+
+    def binary_to_text(self, website_url: str, metadata: list) -> str:
+        filename = website_url.split("/")[-1] or "unknown"
+        return "\n".join(metadata + ["---\n"]) + f"Binary file detected: {filename}"
+
+    def html_to_text(self, website_url: str, final_url: str, response, data: bytes, truncated: bool, metadata: list, links: list = None) -> str:
+        """Structured text of a downloaded HTML page, before the token limit. The page's links are added to links when given."""
+        try:
+            parsed = parse_html(data, detect_encoding(response, data))
+        except Exception as e:
+            return "\n".join(metadata + ["---\n"]) + f"\nError: Failed to parse HTML content: {str(e)}"
+        if links is not None:
+            # before the main content detection drops the navigation
+            links.extend(extract_links(parsed, final_url))
+
+        notes = [f"Note: Page is larger than {self.max_bytes} bytes, only the beginning was read"] if truncated else []
+        # requests and aiohttp responses, an error page must not pass for the page itself
+        status = getattr(response, "status_code", None) or getattr(response, "status", None)
+        if status and not 200 <= status < 300:
+            notes.insert(0, f"Status: {status}")
+        if self.main_content and not self.css_selector:
+            notes.append("Note: Main content only, navigation and other page boilerplate removed")
+        metadata = extract_metadata(parsed, final_url, notes)
+
+        # Process content based on CSS selector or whole document
+        if self.css_selector:
+            elements_to_process = select(parsed, self.css_selector)
+        elif self.main_content:
+            elements_to_process = main_content(parsed)
+        else:
+            # Process everything in the body, or fall back to whole document
+            body = parsed.find('body')
+            elements_to_process = [body] if body is not None else [parsed]
+
+        text = elements_to_text(elements_to_process, base_url=website_url, show_urls=self.show_urls)
+        return metadata + "\n" + text if text else metadata + "No meaningful content found on the page."
+
     def _run(
         self,
         **kwargs: Any,
@@ -273,82 +220,49 @@ class ScrapeWebsiteToolEnhanced(BaseTool):
             return "Error: No website URL provided"
             
         self.website_url = website_url
-        css_selector = self.css_selector
         
         try:
-            response = requests.get(
+            # stream the body, so the headers can be checked before it is downloaded
+            with get_session().get(
                 website_url,
                 timeout=15,
                 headers=self.headers,
                 cookies=self.cookies if self.cookies else {},
-                allow_redirects=True
-            )
-            
-            # Store original URL if redirected
-            final_url = response.url
-            was_redirected = len(response.history) > 0
-            original_url = response.history[0].url if was_redirected else website_url
-            
-            # Create initial metadata
-            metadata = [
-                "### Page Metadata ###",
-                f"URL: {original_url}",
-                f"Status: {response.status_code}",
-                f"Scraping Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            ]
-            if was_redirected:
-                metadata.append(f"Redirect: {original_url} -> {final_url}")
-            
-            # Handle binary content
-            content_type = response.headers.get("Content-Type", "").lower()
-            if "pdf" in content_type:
-                metadata = self.extract_pdf_metadata(final_url, response)
-                text = self.pdf_url_to_text(final_url)
-                return metadata + "\n\n### PDF Content ###\n" + text
-
-            if any(binary_type in content_type for binary_type in ["image", "octet-stream"]):
-                filename = website_url.split("/")[-1] or "unknown"
-                metadata.append("---\n")
-                return "\n".join(metadata) + f"Binary file detected: {filename}"
-
-            try:
-                response.encoding = response.apparent_encoding or 'utf-8'
-                parsed = BeautifulSoup(response.text, "html.parser")
-            except Exception as e:
-                metadata.append("---\n")
-                return "\n".join(metadata) + f"\nError: Failed to parse HTML content: {str(e)}"
-
-            metadata = self.extract_metadata(parsed, final_url)
-
-            # Remove script and style elements
-            for tag in parsed(['script', 'style']):
-                tag.extract()
-
-            # Process content based on CSS selector or whole document
-            elements_to_process = []
-            if css_selector:
-                elements_to_process = parsed.select(css_selector)
-            else:
-                # Process everything in the body, or fall back to whole document
-                body = parsed.find('body')
-                if body:
-                    elements_to_process = [body]
+                allow_redirects=True,
+                stream=True
+            ) as response:
+                # Store original URL if redirected
+                final_url = response.url
+                was_redirected = len(response.history) > 0
+                original_url = response.history[0].url if was_redirected else website_url
+                metadata = self.page_metadata(website_url, final_url, response.status_code, was_redirected, original_url)
+
+                content_type = response.headers.get("Content-Type", "").lower()
+                content_length = int(response.headers.get("Content-Length") or 0)
+                chunks = response.iter_content(READ_CHUNK_SIZE)
+                head = next(chunks, b"") if self.needs_sniffing(content_type) else b""
+                kind = self.content_kind(content_type, head)
+
+                if kind == "binary":
+                    return self.binary_to_text(website_url, metadata)
+                if kind == "pdf":
+                    pdf_metadata = self.extract_pdf_metadata(final_url, response)
+                    if content_length > self.max_pdf_bytes:
+                        return pdf_metadata + f"\n\nError: PDF is larger than {self.max_pdf_bytes} bytes ({content_length} bytes)"
+                    # the PDF is downloaded once and converted from memory
+                    data, truncated = read_limited(chunks, self.max_pdf_bytes, head)
+                    if truncated:
+                        return pdf_metadata + f"\n\nError: PDF is larger than {self.max_pdf_bytes} bytes"
                 else:
-                    elements_to_process = [parsed]
+                    data, truncated = read_limited(chunks, self.max_bytes, head)
 
-            # Extract text from selected elements
-            results = []
-            for element in elements_to_process:
-                results.extend(self.extract_text_with_structure(element))
-
-            # Join results and clean up
-            text = '\n'.join(line for line in results if line is not None)
-            text = re.sub(r'\n{3,}', '\n\n', text)  # Normalize multiple newlines
-            text = text.strip()
-
-            return metadata + "\n" + text if text else metadata + "No meaningful content found on the page."
+            if kind == "pdf":
+                text = pdf_metadata + "\n\n### PDF Content ###\n" + self.pdf_to_text(data)
+            else:
+                text = self.html_to_text(website_url, final_url, response, data, truncated, metadata)
+            return truncate_to_tokens(text, self.max_tokens)
             
         except requests.Timeout:
             return "Error: Website request timed out"
         except requests.RequestException as e:
-            return f"Error: Failed to fetch website content: {str(e)}"
\ No newline at end of file
+            return f"Error: Failed to fetch website content: {str(e)}"
@@ -0,0 +1,291 @@
+"""
+HTML to structured text extraction used by the scraping tools.
+
+Produces the markdown-ish format of ScrapeWebsiteToolEnhanced (headings as #, lists
+with bullets/numbers, tables as | separated rows, links optionally with their URL)
+from an lxml tree. The tree is walked iteratively, so deeply nested pages can't hit
+the recursion limit. The clean-up regexes are precompiled and only run when the text
+can contain what they remove. Each table only reads its own rows and cells, so
+nested tables are extracted once.
+"""
+import re
+from datetime import datetime
+from urllib.parse import urldefrag, urljoin
+
+import lxml.html
+from lxml import etree
+
+BLOCK_TAGS = frozenset(['div', 'p', 'section', 'article', 'header', 'footer'])
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+SKIPPED_TAGS = ('script', 'style')
+INDENT = "    "
+
+_BR = re.compile(r'<br(?:/| /)?>')
+_TAG = re.compile(r'<[^>]+>')
+_CONTROL_WHITESPACE = str.maketrans('\t\f\r\x0b', '    ')
+_SPACES = re.compile(r' {2,}')
+_LEADING_WHITESPACE = re.compile(r'^\s+', re.MULTILINE)
+_WICKET = re.compile(r'wicket:[^\s>]+')
+_STYLE = re.compile(r'\s*style="[^"]*"')
+_CLASS = re.compile(r'\s*class="[^"]*"')
+_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_BLANK_LINES = re.compile(r'\n\s*\n')
+_MULTIPLE_NEWLINES = re.compile(r'\n{3,}')
+_HEADER_CHARSET = re.compile(r'charset="?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset', re.IGNORECASE)
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+def clean_text(text: str) -> str:
+    """Clean and normalize text content."""
+    if not text:
+        return ""
+    if '<' in text:
+        # Remove HTML tags while preserving line breaks
+        text = _BR.sub('\n', text)
+        text = _TAG.sub('', text)
+    text = _SPACES.sub(' ', text.translate(_CONTROL_WHITESPACE)).strip()
+    if '\n' in text:
+        text = _LEADING_WHITESPACE.sub('', text)
+    # Remove wicket attributes and other technical artifacts
+    if 'wicket:' in text:
+        text = _WICKET.sub('', text)
+    if 'style="' in text:
+        text = _STYLE.sub('', text)
+    if 'class="' in text:
+        text = _CLASS.sub('', text)
+    if '<!--' in text:
+        text = _COMMENT.sub('', text)
+    if '\n' in text:
+        text = _BLANK_LINES.sub('\n\n', text)
+    return text.strip()
+
+
+def parse_html(content: bytes, encoding: str = None):
+    """Parse an HTML document, encoding None lets the parser use the page's meta charset."""
+    if not content or not content.strip():
+        return lxml.html.document_fromstring("<html><body></body></html>")
+    try:
+        parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+        doc = lxml.html.document_fromstring(content, parser=parser)
+    except LookupError:
+        # encoding unknown to libxml2, decode it in Python
+        text = _XML_DECLARATION.sub('', content.decode(encoding, errors='replace'))
+        doc = lxml.html.document_fromstring(text)
+    etree.strip_elements(doc, *SKIPPED_TAGS, with_tail=False)
+    return doc
+
+
+def detect_encoding(response, content: bytes) -> str:
+    """Encoding of a downloaded page (requests or aiohttp response) without running charset detection on the whole body."""
+    charset = _HEADER_CHARSET.search(response.headers.get("Content-Type", ""))
+    if charset:
+        return charset.group(1)
+    if _META_CHARSET.search(content[:4096]):
+        return None
+    try:
+        content.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # a body cut at the size limit can end in the middle of a character
+        if e.start >= len(content) - 3:
+            return 'utf-8'
+    from charset_normalizer import from_bytes
+    best = from_bytes(content[:64 * 1024]).best()
+    return best.encoding if best else 'utf-8'
+
+
+def extract_metadata(doc, url: str, notes: list = None) -> str:
+    """Extract and format page metadata."""
+    metadata = [
+        "### Page Metadata ###",
+        f"URL: {url}",
+        f"Scraping Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    ]
+    title = doc.find('.//title')
+    if title is not None and len(title) == 0 and title.text and title.text.strip():
+        metadata.append(f"Title: {title.text.strip()}")
+    meta_desc = doc.xpath('(.//meta[@name="description"])[1]') or doc.xpath('(.//meta[@property="og:description"])[1]')
+    if meta_desc and meta_desc[0].get('content') and meta_desc[0].get('content').strip():
+        metadata.append(f"Description: {meta_desc[0].get('content').strip()}")
+    html_tag = doc if doc.tag == 'html' else doc.find('.//html')
+    if html_tag is not None and html_tag.get('lang') and html_tag.get('lang').strip():
+        metadata.append(f"Language: {html_tag.get('lang')}")
+    metadata.extend(notes or [])
+    metadata.append("---")
+    return "\n".join(metadata)
+
+
+def extract_links(doc, base_url: str) -> list:
+    """Absolute http(s) URLs of the page's links without fragments, in document order and without duplicates."""
+    links = {}
+    for link in doc.iter('a'):
+        href = (link.get('href') or '').strip()
+        if not href or href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
+            continue
+        url = urldefrag(urljoin(base_url, href))[0]
+        if url.startswith(('http://', 'https://')):
+            links[url] = None
+    return list(links)
+
+
+def select(doc, css_selector: str) -> list:
+    """Elements matching a CSS selector, through soupsieve when cssselect isn't installed."""
+    try:
+        return doc.cssselect(css_selector)
+    except ImportError:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(lxml.html.tostring(doc, encoding='unicode'), "lxml")
+        return [lxml.html.fragment_fromstring(str(element), create_parent=False) for element in soup.select(css_selector)]
+
+
+def _own_elements(table, tags):
+    """Descendants of a table with one of the tags, not looking into nested tables."""
+    stack = list(reversed(table))
+    while stack:
+        element = stack.pop()
+        if not isinstance(element.tag, str):
+            continue
+        if element.tag in tags:
+            yield element
+        if element.tag != 'table':
+            stack.extend(reversed(element))
+
+
+def _nodes(element):
+    """Text and element children in document order, like BeautifulSoup's .children."""
+    if element.text:
+        yield element.text
+    for child in element:
+        yield child
+        if child.tail:
+            yield child.tail
+
+
+class StructuredTextExtractor:
+    def __init__(self, base_url: str = None, show_urls: bool = False):
+        self.base_url = base_url
+        self.show_urls = show_urls
+
+    def extract(self, element, depth: int = 0) -> list:
+        """Lines of text of an element (or text node) while preserving structure."""
+        # every element is handled by a generator that yields the children it needs the
+        # lines of and returns its own lines, the stack replaces recursion
+        stack = [self._handle(element, depth)]
+        value = None
+        while stack:
+            try:
+                child, child_depth = stack[-1].send(value)
+            except StopIteration as stop:
+                stack.pop()
+                value = stop.value
+                continue
+            stack.append(self._handle(child, child_depth))
+            value = None
+        return value
+
+    def _handle(self, element, depth):
+        indent = INDENT * depth
+        results = []
+
+        # Handle direct text content
+        if isinstance(element, str):
+            text = clean_text(element)
+            if text:
+                results.append(indent + text)
+            return results
+
+        tag = element.tag
+        # Comments and processing instructions
+        if not isinstance(tag, str) or tag in SKIPPED_TAGS:
+            return results
+
+        # Handle link elements
+        if tag == 'a' and element.get('href'):
+            href = element.get('href')
+            if not href.startswith('javascript:'):
+                text = clean_text(element.text_content())
+                if text:
+                    if self.show_urls:
+                        results.append(indent + f"<{text}: {urljoin(self.base_url, href)}>")
+                    else:
+                        results.append(indent + text)
+            return results
+
+        # For tables, preserve structure
+        if tag == 'table':
+            header_row = next(_own_elements(element, ('tr', 'thead')), None)
+            headers = []
+            if header_row is not None:
+                for cell in _own_elements(header_row, ('th', 'td')):
+                    cell_results = yield (cell, 0)
+                    if cell_results:
+                        headers.append(" ".join(line.strip() for line in cell_results))
+            if headers:
+                results.append(indent + " | ".join(headers))
+                results.append(indent + ("-" * len(" | ".join(headers))))
+
+            header_rows = {header_row}
+            if header_row is not None and header_row.tag == 'thead':
+                header_rows.update(_own_elements(header_row, ('tr',)))
+            for tr in _own_elements(element, ('tr',)):
+                if tr in header_rows:
+                    continue
+                cols = []
+                for cell in _own_elements(tr, ('td', 'th')):
+                    cell_results = yield (cell, 0)
+                    if cell_results:
+                        cols.append(" ".join(line.strip() for line in cell_results))
+                if cols:
+                    results.append(indent + " | ".join(cols))
+            return results
+
+        # For lists, preserve bullets/numbers
+        if tag in ('ul', 'ol'):
+            items = [child for child in element if child.tag == 'li']
+            for i, li in enumerate(items, 1):
+                prefix = f"{i}. " if tag == 'ol' else "• "
+                li_results = yield (li, depth)
+                if li_results:
+                    results.append(indent + prefix + li_results[0].lstrip())
+                    results.extend(INDENT * (depth + 1) + line.lstrip() for line in li_results[1:])
+            return results
+
+        # For headings, add markdown style
+        if tag in HEADING_TAGS:
+            text = clean_text(element.text_content())
+            if text:
+                results.append('')
+                results.append(indent + '#' * int(tag[1]) + ' ' + text)
+                results.append('')
+            return results
+
+        # Process all child nodes and maintain structure
+        for child in _nodes(element):
+            # Skip empty text nodes
+            if isinstance(child, str) and not child.strip():
+                continue
+            child_results = yield (child, depth)
+            if not child_results:
+                continue
+
+            # Add proper spacing for block elements
+            if not isinstance(child, str) and child.tag in BLOCK_TAGS:
+                if results and results[-1]:
+                    results.append('')
+                results.extend(child_results)
+                if child_results[-1]:
+                    results.append('')
+            else:
+                results.extend(child_results)
+        return results
+
+
+def elements_to_text(elements, base_url: str = None, show_urls: bool = False) -> str:
+    """Structured text of the elements, with the blank lines normalized."""
+    extractor = StructuredTextExtractor(base_url, show_urls)
+    results = []
+    for element in elements:
+        results.extend(extractor.extract(element))
+    text = '\n'.join(line for line in results if line is not None)
+    return _MULTIPLE_NEWLINES.sub('\n\n', text).strip()
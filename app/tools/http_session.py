@@ -0,0 +1,80 @@
+"""
+Shared HTTP session of the scraping tools.
+
+One requests.Session per process keeps TCP/TLS connections alive between scrapes
+(per host pool), retries connection errors and 429/5xx responses with exponential
+backoff (honouring Retry-After up to SCRAPE_MAX_RETRY_AFTER seconds) and asks for compressed responses. Cookies are never
+stored in the session, every request sends only the cookies it is given, so agents
+and crews can't leak cookies into each other's requests.
+"""
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+SCRAPE_POOL_SIZE = int(os.getenv('SCRAPE_POOL_SIZE', 20))
+SCRAPE_MAX_RETRIES = int(os.getenv('SCRAPE_MAX_RETRIES', 3))
+SCRAPE_MAX_RETRY_AFTER = float(os.getenv('SCRAPE_MAX_RETRY_AFTER', 10))
+READ_CHUNK_SIZE = 64 * 1024
+
+_lock = threading.Lock()
+_session = None
+
+
+class _CappedRetry(Retry):
+    """Retry that waits at most SCRAPE_MAX_RETRY_AFTER seconds for a Retry-After header."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        # a server asking for minutes or hours would block the agent on every retry
+        return min(retry_after, SCRAPE_MAX_RETRY_AFTER)
+
+
+def _create_session():
+    session = requests.Session()
+    retry = _CappedRetry(
+        total=SCRAPE_MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True,
+        # hand the last response to the caller instead of raising, the tools report the status
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=SCRAPE_POOL_SIZE, pool_maxsize=SCRAPE_POOL_SIZE, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # gzip and deflate, plus br/zstd when the decoders are installed
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session() -> requests.Session:
+    global _session
+    with _lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
+
+def read_limited(chunks, max_bytes, head=b""):
+    """Read a streamed body (iter_content chunks) up to max_bytes, returns (body, truncated).
+
+    The limit applies to the decompressed body, so a small gzip bomb can't exhaust memory.
+    """
+    body = bytearray(head[:max_bytes])
+    if len(head) > max_bytes:
+        return bytes(body), True
+    for chunk in chunks:
+        if len(body) + len(chunk) > max_bytes:
+            body += chunk[:max_bytes - len(body)]
+            return bytes(body), True
+        body += chunk
+    return bytes(body), False
@@ -0,0 +1,167 @@
+"""
+Main content detection for ScrapeWebsiteToolEnhanced, in the spirit of readability.
+
+Navigation, sidebars, cookie banners, footers and similar blocks are dropped by tag and
+by class/id names. The remaining paragraphs add their score (length and commas) to their
+parent and grandparent, and each of these candidate blocks is weighted by its class/id
+names and by its link density. The best block is kept, together with the siblings that
+scored well too. Pages without enough prose (catalogs, tables) fall back to the cleaned
+body, and when the boilerplate removal itself leaves (almost) nothing, to the untouched
+body, so the mode never returns an empty page for a page with text.
+"""
+import copy
+import re
+
+from tools.html_extract import HEADING_TAGS
+
+BOILERPLATE_TAGS = frozenset(['nav', 'aside', 'footer', 'form', 'button', 'noscript', 'iframe', 'svg', 'dialog'])
+PROTECTED_TAGS = frozenset(['html', 'body', 'main', 'article'])
+SCORED_TAGS = ('p', 'pre', 'td', 'blockquote', 'dd')
+CLEANED_TAGS = ('ul', 'ol', 'div', 'section', 'dl')
+TAG_WEIGHTS = {
+    'article': 10, 'main': 10, 'div': 5, 'section': 3, 'pre': 3, 'td': 3, 'blockquote': 3,
+    'ol': -3, 'ul': -3, 'dl': -3, 'dd': -3, 'li': -3, 'form': -3, 'th': -5,
+    **{tag: -5 for tag in HEADING_TAGS},
+}
+MIN_PARAGRAPH_CHARS = 25
+MIN_CONTENT_CHARS = 200
+# a "boilerplate" element holding this share of the page text wraps the page (ASP.NET forms)
+MAX_BOILERPLATE_SHARE = 0.5
+
+_NEGATIVE = re.compile(
+    r'(?:^|[\s_-])(?:ad|ads|advert\w*|banner|breadcrumbs?|comments?|consent|cookies?|footer|masthead|menu|'
+    r'nav\w*|newsletter|pagination|popup|promo|related|share|sharing|sidebar|social|sponsor\w*|subscribe|widget)'
+    r'(?=$|[\s_-])',
+    re.IGNORECASE,
+)
+_POSITIVE = re.compile(r'article|body|content|entry|main|post|story|text', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _text(element) -> str:
+    return _WHITESPACE.sub(' ', element.text_content()).strip()
+
+
+def _names(element) -> str:
+    return f"{element.get('class', '')} {element.get('id', '')}"
+
+
+def _class_weight(element) -> int:
+    weight = 0
+    for name in (element.get('class'), element.get('id')):
+        if not name:
+            continue
+        if _NEGATIVE.search(name):
+            weight -= 25
+        if _POSITIVE.search(name):
+            weight += 25
+    return weight
+
+
+def link_density(element, text_length: int = None) -> float:
+    """Share of the element's text that is link text."""
+    if text_length is None:
+        text_length = len(_text(element))
+    if not text_length:
+        return 0.0
+    link_length = sum(len(_text(link)) for link in element.iter('a'))
+    return min(1.0, link_length / text_length)
+
+
+def _is_boilerplate(element, page_length: int) -> bool:
+    tag = element.tag
+    if not isinstance(tag, str) or tag in PROTECTED_TAGS:
+        return False
+    names = _names(element)
+    if tag not in BOILERPLATE_TAGS and not (_NEGATIVE.search(names) and not _POSITIVE.search(names)):
+        return False
+    # a wrapper named like navigation can still hold the whole page
+    if element.find('.//main') is not None or element.find('.//article') is not None:
+        return False
+    return len(_text(element)) <= page_length * MAX_BOILERPLATE_SHARE
+
+
+def remove_boilerplate(doc):
+    """Drop navigation, banners, footers and the like from the tree, keeping their tail text."""
+    page_length = len(_text(doc))
+    for element in list(doc.iter()):
+        if element.getparent() is not None and _is_boilerplate(element, page_length):
+            element.drop_tree()
+
+
+def _score_candidates(doc) -> dict:
+    candidates = {}
+
+    def add(element, score):
+        if element is None or not isinstance(element.tag, str):
+            return
+        if element not in candidates:
+            candidates[element] = TAG_WEIGHTS.get(element.tag, 0) + _class_weight(element)
+        candidates[element] += score
+
+    for paragraph in doc.iter(*SCORED_TAGS):
+        text = _text(paragraph)
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        score = 1 + text.count(',') + min(len(text) // 100, 3)
+        parent = paragraph.getparent()
+        add(parent, score)
+        add(parent.getparent() if parent is not None else None, score / 2)
+
+    return {element: score * (1 - link_density(element)) for element, score in candidates.items()}
+
+
+def _clean(element):
+    """Drop link lists (tables of contents, tag clouds) inside the chosen content."""
+    for block in list(element.iter(*CLEANED_TAGS)):
+        if block is element or block.getparent() is None:
+            continue
+        text = _text(block)
+        if len(text) < 300 and link_density(block, len(text)) > 0.5:
+            block.drop_tree()
+
+
+def _with_siblings(top, scores) -> list:
+    parent = top.getparent()
+    if parent is None or parent.tag == 'html':
+        return [top]
+    threshold = max(10, scores[top] * 0.2)
+    kept = []
+    for sibling in parent:
+        if not isinstance(sibling.tag, str):
+            continue
+        if sibling is top or scores.get(sibling, 0) >= threshold:
+            kept.append(sibling)
+        elif sibling.tag == 'p':
+            text = _text(sibling)
+            density = link_density(sibling, len(text))
+            if (len(text) > 80 and density < 0.25) or (density == 0 and text.endswith('.')):
+                kept.append(sibling)
+    # headings right before kept blocks belong to them
+    for heading in [sibling for sibling in parent if sibling.tag in HEADING_TAGS and sibling not in kept]:
+        following = heading.getnext()
+        if following is not None and following in kept:
+            kept.append(heading)
+    return [sibling for sibling in parent if sibling in kept]
+
+
+def main_content(doc) -> list:
+    """Elements holding the main content of a parsed page, the tree is modified."""
+    body = doc.find('body')
+    untouched = copy.deepcopy(body if body is not None else doc)
+    remove_boilerplate(doc)
+    body = doc.find('body')
+    fallback = [body if body is not None else doc]
+    if len(_text(fallback[0])) < min(MIN_CONTENT_CHARS, len(_text(untouched))):
+        fallback = [untouched]
+
+    scores = _score_candidates(doc)
+    if not scores:
+        return fallback
+    top = max(scores, key=scores.get)
+    elements = _with_siblings(top, scores)
+    if sum(len(_text(element)) for element in elements) < MIN_CONTENT_CHARS:
+        return fallback
+    for element in elements:
+        _clean(element)
+    return elements
@@ -0,0 +1,78 @@
+"""
+robots.txt rules of the crawled sites, cached per process for ROBOTS_CACHE_TTL seconds.
+
+As in RFC 9309, 401/403 forbid the whole site and other 4xx allow it. A robots.txt
+that can't be read (5xx, network errors) forbids the whole site too, the server may
+be struggling; these rules are kept for ROBOTS_ERROR_TTL seconds only, so a later
+crawl tries again.
+"""
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+ROBOTS_CACHE_TTL = int(os.getenv('ROBOTS_CACHE_TTL', 3600))
+ROBOTS_ERROR_TTL = 60
+
+_lock = threading.Lock()
+_cache = {}
+# robots.txt being read, per event loop and origin, so concurrent workers read it once
+_pending = {}
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+
+
+async def _read_rules(session, origin: str):
+    """Parsed robots.txt of origin and the seconds to keep it."""
+    import aiohttp
+
+    rules = RobotFileParser(origin + "/robots.txt")
+    try:
+        async with session.get(origin + "/robots.txt", allow_redirects=True) as response:
+            if response.status in (401, 403):
+                rules.disallow_all = True
+            elif response.status >= 500:
+                print(f"Error reading {origin}/robots.txt: status {response.status}, not crawling the site")
+                rules.disallow_all = True
+                return rules, ROBOTS_ERROR_TTL
+            elif response.status >= 400:
+                rules.allow_all = True
+            else:
+                rules.parse((await response.text(errors='replace')).splitlines())
+    except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+        print(f"Error reading {origin}/robots.txt: {str(e)}, not crawling the site")
+        rules.disallow_all = True
+        return rules, ROBOTS_ERROR_TTL
+    return rules, ROBOTS_CACHE_TTL
+
+
+async def get_rules(session, url: str) -> RobotFileParser:
+    """Parsed robots.txt of the site of url, read with the aiohttp session on first use."""
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    with _lock:
+        cached = _cache.get(origin)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    # the future belongs to this event loop, crawls running on other loops read their own
+    key = (asyncio.get_running_loop(), origin)
+    with _lock:
+        pending = _pending.get(key)
+    if pending is not None:
+        return (await asyncio.shield(pending))[0]
+    pending = asyncio.ensure_future(_read_rules(session, origin))
+    with _lock:
+        _pending[key] = pending
+    try:
+        rules, ttl = await asyncio.shield(pending)
+    finally:
+        with _lock:
+            _pending.pop(key, None)
+    with _lock:
+        _cache[origin] = (time.monotonic() + ttl, rules)
+    return rules
@@ -0,0 +1,55 @@
+"""
+Token-aware truncation of tool output before it goes into the LLM context.
+
+Tokens are counted with tiktoken's cl100k_base encoding, which is close enough for the
+other providers too; when tiktoken can't be loaded it falls back to 4 characters per
+token.
+"""
+import os
+from functools import lru_cache
+
+SCRAPE_MAX_TOKENS = int(os.getenv('SCRAPE_MAX_TOKENS', 20000))
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # tiktoken downloads the encoding on first use, which fails offline
+        print(f"Error loading tiktoken, estimating tokens from characters: {str(e)}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int = SCRAPE_MAX_TOKENS) -> str:
+    """Cut text to about max_tokens tokens, preferably at a line break, and say so."""
+    # a token is at least one character, shorter texts can't be over the limit
+    if not max_tokens or len(text) <= max_tokens:
+        return text
+    encoding = _encoding()
+    if encoding is None:
+        total = len(text) // CHARS_PER_TOKEN
+        if total <= max_tokens:
+            return text
+        cut = text[:max_tokens * CHARS_PER_TOKEN]
+    else:
+        # don't tokenize megabytes of text only to learn that it is too long
+        sample_chars = max_tokens * CHARS_PER_TOKEN * 2
+        tokens = encoding.encode(text[:sample_chars], disallowed_special=())
+        if len(tokens) <= max_tokens and len(text) <= sample_chars:
+            return text
+        total = len(tokens) if len(text) <= sample_chars else int(len(tokens) * len(text) / sample_chars)
+        cut = encoding.decode(tokens[:max_tokens])
+    line_break = cut.rfind("\n")
+    if line_break > len(cut) * 0.8:
+        cut = cut[:line_break]
+    return cut.rstrip() + f"\n\n[Truncated: showing about {max_tokens} of {total} tokens]"
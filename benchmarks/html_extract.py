@@ -0,0 +1,220 @@
+"""
+Benchmark of the HTML extraction of ScrapeWebsiteToolEnhanced on saved pages.
+
+Compares the lxml based engine (app/tools/html_extract.py) with the previous
+BeautifulSoup html.parser implementation, kept below as the reference, on every
+fixture in benchmarks/fixtures/html: best time of --repeat runs and how much of the
+output is identical.
+
+    python benchmarks/html_extract.py --repeat 5 --show-diff
+"""
+import argparse
+import difflib
+import glob
+import os
+import re
+import sys
+import time
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, Tag
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+from tools.html_extract import elements_to_text, parse_html  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures", "html")
+BASE_URL = "https://example.com/page"
+
+
+class LegacyExtractor:
+    """The extraction of ScrapeWebsiteToolEnhanced before the lxml engine."""
+    def __init__(self, website_url, show_urls):
+        self.website_url = website_url
+        self.show_urls = show_urls
+
+    def clean_text(self, text: str) -> str:
+        """Clean and normalize text content."""
+        if not text:
+            return ""
+
+        # Remove HTML tags while preserving line breaks
+        text = text.replace('<br>', '\n').replace('<br/>', '\n').replace('<br />', '\n')
+        text = text.replace('<hr/>', '').replace('<hr />', '').replace('<hr>', '')
+        
+        # Remove all remaining HTML tags
+        text = re.sub(r'<[^>]+>', '', text)
+        
+        # Convert various whitespace to spaces
+        text = re.sub(r'[\t\f\r\x0b]', ' ', text)
+        
+        # Clean up spaces and empty lines
+        text = re.sub(r' {2,}', ' ', text)
+        text = text.strip()
+        text = re.sub(r'^\s+', '', text, flags=re.MULTILINE)
+        
+        # Remove wicket attributes and other technical artifacts
+        text = re.sub(r'wicket:[^\s>]+', '', text)
+        text = re.sub(r'\s*style="[^"]*"', '', text)
+        text = re.sub(r'\s*class="[^"]*"', '', text)
+        text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
+        
+        # Remove empty lines while preserving intentional line breaks
+        text = re.sub(r'\n\s*\n', '\n\n', text)
+        
+        return text.strip()
+
+    def extract_text_with_structure(self, element: Tag, depth: int = 0) -> list:
+        """Extract text while preserving structure."""
+        results = []
+        
+        # Skip script and style
+        if element.name in ['script', 'style']:
+            return results
+
+        # Handle direct text content
+        if isinstance(element, str):
+            text = self.clean_text(element)
+            if text:
+                results.append(("    " * depth) + text)
+            return results
+
+        # Handle link elements
+        if element.name == 'a' and element.get('href'):
+            href = element['href']
+            if not href.startswith('javascript:'):
+                text = self.clean_text(element.get_text())
+                if text:
+                    if self.show_urls:
+                        full_url = urljoin(self.website_url, href)
+                        results.append(("    " * depth) + f"<{text}: {full_url}>")
+                    else:
+                        results.append(("    " * depth) + text)
+            return results
+
+        # For tables, preserve structure
+        if element.name == 'table':
+            rows = []
+            # Process headers
+            header_row = element.find(['tr', 'thead'])
+            headers = []
+            if header_row:
+                for th in header_row.find_all(['th', 'td']):
+                    header_results = self.extract_text_with_structure(th, 0)
+                    if header_results:
+                        headers.append(" ".join(line.strip() for line in header_results))
+            if headers:
+                results.append(("    " * depth) + " | ".join(headers))
+                results.append(("    " * depth) + ("-" * len(" | ".join(headers))))
+
+            # Process data rows
+            for tr in element.find_all('tr'):
+                if tr != header_row:
+                    cols = []
+                    for td in tr.find_all(['td', 'th']):
+                        cell_results = self.extract_text_with_structure(td, 0)
+                        if cell_results:
+                            cols.append(" ".join(line.strip() for line in cell_results))
+                    if cols:
+                        results.append(("    " * depth) + " | ".join(cols))
+            return results
+
+        # For lists, preserve bullets/numbers
+        if element.name in ['ul', 'ol']:
+            for i, li in enumerate(element.find_all('li', recursive=False), 1):
+                prefix = f"{i}. " if element.name == 'ol' else "• "
+                li_results = self.extract_text_with_structure(li, depth)
+                if li_results:
+                    first_line = True
+                    for line in li_results:
+                        if first_line:
+                            results.append(("    " * depth) + prefix + line.lstrip())
+                            first_line = False
+                        else:
+                            results.append(("    " * (depth + 1)) + line.lstrip())
+            return results
+
+        # For headings, add markdown style
+        if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+            text = self.clean_text(element.get_text())
+            if text:
+                level = min(int(element.name[1]), 6)
+                results.append('')
+                results.append(("    " * depth) + '#' * level + ' ' + text)
+                results.append('')
+            return results
+
+        # Process all child elements and maintain structure
+        for child in element.children:
+            # Skip empty text nodes
+            if isinstance(child, str) and not child.strip():
+                continue
+                
+            child_results = self.extract_text_with_structure(child, depth)
+            if not child_results:
+                continue
+
+            # Add proper spacing for block elements
+            if isinstance(child, Tag) and child.name in ['div', 'p', 'section', 'article', 'header', 'footer']:
+                if results and results[-1]:
+                    results.append('')
+                results.extend(child_results)
+                if child_results[-1]:
+                    results.append('')
+            else:
+                results.extend(child_results)
+
+        return results
+
+
+def legacy_extract(content, show_urls):
+    parsed = BeautifulSoup(content.decode("utf-8"), "html.parser")
+    for tag in parsed(['script', 'style']):
+        tag.extract()
+    body = parsed.find('body')
+    extractor = LegacyExtractor(BASE_URL, show_urls)
+    results = extractor.extract_text_with_structure(body if body else parsed)
+    text = '\n'.join(line for line in results if line is not None)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def lxml_extract(content, show_urls):
+    doc = parse_html(content, "utf-8")
+    body = doc.find('body')
+    return elements_to_text([body if body is not None else doc], base_url=BASE_URL, show_urls=show_urls)
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML extraction on saved pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--show-urls", action="store_true")
+    parser.add_argument("--show-diff", action="store_true", help="print the output differences")
+    args = parser.parse_args()
+
+    print(f"{'fixture':<24}{'KB':>8}{'legacy ms':>12}{'lxml ms':>10}{'speedup':>9}{'same lines':>12}")
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.html"))):
+        with open(path, 'rb') as f:
+            content = f.read()
+        legacy_seconds, legacy_text = best_time(lambda: legacy_extract(content, args.show_urls), args.repeat)
+        lxml_seconds, lxml_text = best_time(lambda: lxml_extract(content, args.show_urls), args.repeat)
+        matcher = difflib.SequenceMatcher(None, legacy_text.splitlines(), lxml_text.splitlines(), autojunk=False)
+        print(f"{os.path.basename(path):<24}{len(content) / 1024:>8.0f}{legacy_seconds * 1000:>12.1f}"
+              f"{lxml_seconds * 1000:>10.1f}{legacy_seconds / lxml_seconds:>8.1f}x{matcher.ratio():>12.1%}")
+        if args.show_diff and legacy_text != lxml_text:
+            sys.stdout.writelines(difflib.unified_diff(
+                legacy_text.splitlines(True), lxml_text.splitlines(True), "legacy", "lxml", n=1))
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Import time benchmark of the app modules.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for each module
+and reports its import time and the slowest packages it imports directly. With --max-seconds
+it exits with an error when a module takes longer, so a regression (e.g. a heavy tool
+library imported at module level again) fails the check.
+
+    python benchmarks/import_time.py db_utils my_tools --max-seconds 3
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+DEFAULT_MODULES = ["db_utils", "my_tools", "llms", "app"]
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(module):
+    """Return (seconds, {directly imported package: cumulative seconds}) for importing module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.splitlines()[-1] if result.stderr else ''}")
+    children = defaultdict(float)
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        cumulative = int(match.group(2)) / 1e6
+        level = len(match.group(3))
+        name = match.group(4)
+        # nested imports are printed before the module importing them
+        if level == 1:
+            if name == module:
+                return cumulative, dict(children)
+            children.clear()
+        elif level == 3:
+            children[name.split(".")[0]] += cumulative
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import time of the app modules")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest packages to show")
+    parser.add_argument("--max-seconds", type=float, help="fail when a module takes longer to import")
+    args = parser.parse_args()
+
+    failed = []
+    for module in args.modules:
+        total, packages = measure(module)
+        print(f"{module}: {total:.3f}s")
+        for package, seconds in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"  {seconds:7.3f}s  {package}")
+        if args.max_seconds is not None and total > args.max_seconds:
+            failed.append(module)
+    if failed:
+        print(f"Import time over {args.max_seconds}s: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
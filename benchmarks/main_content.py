@@ -0,0 +1,71 @@
+"""
+Token reduction of the main content mode of ScrapeWebsiteToolEnhanced.
+
+Extracts every fixture in benchmarks/fixtures/html twice, the whole body and with
+main_content (app/tools/main_content.py), and reports the tokens of both (tiktoken
+cl100k_base, or characters / 4 without tiktoken), the reduction and the extra time
+the boilerplate removal takes. --show prints the main content text.
+
+    python benchmarks/main_content.py --repeat 5
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+from tools.html_extract import elements_to_text, parse_html  # noqa: E402
+from tools.main_content import main_content  # noqa: E402
+from tools.text_limits import count_tokens  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures", "html")
+BASE_URL = "https://example.com/page"
+
+
+def full_extract(content):
+    doc = parse_html(content, "utf-8")
+    body = doc.find('body')
+    return elements_to_text([body if body is not None else doc], base_url=BASE_URL)
+
+
+def main_extract(content):
+    return elements_to_text(main_content(parse_html(content, "utf-8")), base_url=BASE_URL)
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the token reduction of the main content mode")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--show", action="store_true", help="print the main content text")
+    args = parser.parse_args()
+
+    total_full = total_main = 0
+    print(f"{'fixture':<24}{'full tok':>10}{'main tok':>10}{'saved':>8}{'full ms':>10}{'main ms':>10}")
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.html"))):
+        with open(path, 'rb') as f:
+            content = f.read()
+        full_seconds, full_text = best_time(lambda: full_extract(content), args.repeat)
+        main_seconds, main_text = best_time(lambda: main_extract(content), args.repeat)
+        full_tokens, main_tokens = count_tokens(full_text), count_tokens(main_text)
+        total_full += full_tokens
+        total_main += main_tokens
+        print(f"{os.path.basename(path):<24}{full_tokens:>10}{main_tokens:>10}{1 - main_tokens / full_tokens:>8.0%}"
+              f"{full_seconds * 1000:>10.1f}{main_seconds * 1000:>10.1f}")
+        if args.show:
+            print(main_text + "\n")
+    print(f"{'total':<24}{total_full:>10}{total_main:>10}{1 - total_main / total_full:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()